@@ -1,6 +1,14 @@
 from flask import Flask
 from .extensions import db, migrate, limiter, redis_client
-from .routes import task_routes, user_routes
+from .routes import task_routes, user_routes, metrics_routes, events_routes
+from .utils.compression import init_compression
+from .commands import task_logs_cli, shards_cli, reports_cli, tasks_cli
+from .utils.cache import cache
+from .utils.entity_cache import entity_cache
+from .utils.events import task_events
+from .utils.revocation import token_revocation
+from .utils.task_metrics import task_metrics
+from .repositories.sharding import shard_router
 from sqlalchemy.exc import OperationalError
 import time
 
@@ -9,17 +17,32 @@ def create_app():
     app.config.from_object("app.config.Config")
 
     # Connection Pooling settings (should be BEFORE db.init_app)
-    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
-        "pool_size": 10,
-        "max_overflow": 20,
-        "pool_timeout": 30,
-        "pool_recycle": 1800  # 30 minutes
+    engine_options = {
+        "pool_size": app.config["DB_POOL_SIZE"],
+        "max_overflow": app.config["DB_MAX_OVERFLOW"],
+        "pool_timeout": app.config["DB_POOL_TIMEOUT"],
+        "pool_recycle": app.config["DB_POOL_RECYCLE"]
     }
+    if app.config["DB_PGBOUNCER"]:
+        # PgBouncer owns the server connections; keep one per process and
+        # let bursts use overflow connections that are closed on checkin
+        engine_options["pool_size"] = 1
+        if (app.config["SQLALCHEMY_DATABASE_URI"] or "").startswith("postgresql+psycopg:"):
+            # psycopg 3 prepares repeated statements server-side, which breaks
+            # under transaction pooling (psycopg2 never does)
+            engine_options["connect_args"] = {"prepare_threshold": None}
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options
 
     #  Init extensions
     db.init_app(app)
     migrate.init_app(app, db)
     limiter.init_app(app)
+    cache.init_app(app)
+    entity_cache.init_app(app)
+    task_events.init_app(app)
+    token_revocation.init_app(app)
+    task_metrics.init_app(app)
+    shard_router.init_app(app)
 
     #  Retry mechanism for DB connection
     with app.app_context():
@@ -40,5 +63,16 @@ def create_app():
     #  Register Blueprints
     app.register_blueprint(task_routes.bp)
     app.register_blueprint(user_routes.user_bp)
+    app.register_blueprint(metrics_routes.metrics_bp)
+    app.register_blueprint(events_routes.events_bp)
+
+    #  Negotiated gzip/br/zstd compression for JSON and streamed responses
+    init_compression(app)
+
+    #  CLI commands (flask task-logs archive|restore, flask shards init, flask tasks import)
+    app.cli.add_command(task_logs_cli)
+    app.cli.add_command(shards_cli)
+    app.cli.add_command(reports_cli)
+    app.cli.add_command(tasks_cli)
 
     return app
@@ -0,0 +1,75 @@
+import click
+from datetime import datetime
+from flask.cli import AppGroup
+from app.services.archive_service import archive_task_logs, restore_task_logs
+from app.services.report_service import build_weekly_reports
+from app.services.import_service import import_tasks, import_format, IMPORT_FORMATS
+from app.repositories.sharding import shard_router, SHARDED_TABLES
+
+task_logs_cli = AppGroup("task-logs", help="Retention and archival of task_logger rows.")
+shards_cli = AppGroup("shards", help="Manage SHARD_DATABASE_URLS shards.")
+reports_cli = AppGroup("reports", help="Per-user activity reports.")
+tasks_cli = AppGroup("tasks", help="Bulk task operations.")
+
+@task_logs_cli.command("archive")
+def archive_command():
+    """Archive task_logger rows older than TASK_LOG_RETENTION_DAYS."""
+    result = archive_task_logs()
+    for month, count in result["archived"].items():
+        click.echo(f"{month}: {count} rows archived")
+    click.echo(f"Total: {result['rows']} rows")
+
+@task_logs_cli.command("restore")
+@click.argument("month")
+def restore_command(month):
+    """Restore an archived MONTH (YYYY-MM) back into task_logger."""
+    try:
+        month_start = datetime.strptime(month, "%Y-%m").date()
+    except ValueError:
+        raise click.BadParameter("Use YYYY-MM", param_hint="MONTH")
+    count = restore_task_logs(month_start)
+    click.echo(f"{count} rows restored for {month}")
+
+@shards_cli.command("init")
+def init_shards_command():
+    """Create the task tables on every shard and seed the id counters."""
+    if not shard_router.enabled:
+        raise click.ClickException("SHARD_DATABASE_URLS is not set")
+    shard_router.create_schema()
+    for table in SHARDED_TABLES:
+        shard_router.seed_sequence(table)
+    click.echo(f"Initialized {len(shard_router.binds)} shards: {', '.join(shard_router.binds)}")
+
+@reports_cli.command("weekly")
+@click.option("--week", help="Monday of the week (YYYY-MM-DD), default: last week")
+@click.option("--processes", type=int, help="Worker processes (default: REPORT_PARALLELISM)")
+@click.option("--format", "fmt", type=click.Choice(["parquet", "csv"]), help="Default: REPORT_FORMAT")
+def weekly_report_command(week, processes, fmt):
+    """Build the weekly per-user activity report."""
+    try:
+        week_start = datetime.strptime(week, "%Y-%m-%d").date() if week else None
+    except ValueError:
+        raise click.BadParameter("Use YYYY-MM-DD", param_hint="--week")
+    result = build_weekly_reports(week_start=week_start, parallelism=processes, fmt=fmt)
+    click.echo(
+        f"{result['users']} users, {result['rows']} log rows, {result['shards']} shards "
+        f"on {result['parallelism']} processes in {result['seconds']}s -> {result['path']}"
+    )
+
+@tasks_cli.command("import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "fmt", type=click.Choice(IMPORT_FORMATS), help="Default: from the file extension")
+@click.option("--batch-size", type=int, help="Rows per batch (default: IMPORT_BATCH_SIZE)")
+def import_command(path, fmt, batch_size):
+    """Import tasks from a CSV, NDJSON or Parquet file."""
+    fmt = fmt or import_format(path)
+    if fmt is None:
+        raise click.BadParameter("Unknown extension, pass --format", param_hint="PATH")
+    result = import_tasks(path, fmt, batch_size=batch_size)
+    for error in result["errors"]:
+        click.echo(f"row {error['row']}: {error['error']}", err=True)
+    click.echo(
+        f"{result['imported']} imported, {result['skipped']} duplicates skipped, "
+        f"{result['rejected']} rejected of {result['rows']} rows "
+        f"in {result['seconds']}s ({result['rows_per_second']} rows/s)"
+    )
@@ -6,3 +6,114 @@ load_dotenv()
 class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Per-process connection pools. gunicorn.conf.py derives these from the
+    # worker class and threads; the defaults suit the dev server.
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))  # seconds
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # seconds
+    # Behind PgBouncer (transaction pooling): one persistent connection per
+    # process and no server-side prepared statements
+    DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+
+    # Optional sharding of task_manager/task_logger by user_id: comma-separated
+    # database URLs, one bind per shard. Users stay in DATABASE_URL.
+    SHARD_DATABASE_URLS = [url.strip() for url in os.getenv("SHARD_DATABASE_URLS", "").split(",") if url.strip()]
+    SQLALCHEMY_BINDS = {f"shard{i}": url for i, url in enumerate(SHARD_DATABASE_URLS)}
+
+    # Response compression (gzip always, br/zstd when the libraries are installed)
+    COMPRESS_ENABLED = os.getenv("COMPRESS_ENABLED", "true").lower() == "true"
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", 1024))  # bytes
+    COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", 6))
+
+    # task_logger storage: "rows" (one row per task per day) or "bitmap"
+    # (one row per task per month, see TaskLogBitmap)
+    TASK_LOG_STORAGE = os.getenv("TASK_LOG_STORAGE", "rows")
+
+    # How /tasks computes "total": "exact" (COUNT(*)), "cached" (Redis
+    # counters per date, recomputed after TASKLOG_COUNT_TTL seconds),
+    # "approximate" (Postgres planner statistics) or "none" (no total).
+    # Requests can override it with ?count=.
+    TASKLOG_COUNT_MODE = os.getenv("TASKLOG_COUNT_MODE", "exact")
+    TASKLOG_COUNT_TTL = int(os.getenv("TASKLOG_COUNT_TTL", 86400))
+
+    # JWT revocation (POST /logout): each worker keeps a Bloom filter of
+    # revoked jtis sized for REVOCATION_BLOOM_CAPACITY tokens, rebuilt from
+    # Redis every REVOCATION_REFRESH_INTERVAL seconds
+    REVOCATION_CHANNEL = os.getenv("REVOCATION_CHANNEL", "auth:revoked")
+    REVOCATION_BLOOM_CAPACITY = int(os.getenv("REVOCATION_BLOOM_CAPACITY", 100000))
+    REVOCATION_BLOOM_ERROR_RATE = float(os.getenv("REVOCATION_BLOOM_ERROR_RATE", 0.001))
+    REVOCATION_REFRESH_INTERVAL = float(os.getenv("REVOCATION_REFRESH_INTERVAL", 60))  # seconds
+
+    # Per-entity Redis cache of task logs, tasks and users (see EntityCache),
+    # kept current by the repositories' writes
+    ENTITY_CACHE_ENABLED = os.getenv("ENTITY_CACHE_ENABLED", "true").lower() == "true"
+    ENTITY_CACHE_TTL = int(os.getenv("ENTITY_CACHE_TTL", 604800))  # seconds
+
+    # Recurring tasks: the daily snapshot advances next_due of rule-based
+    # tasks in batches of this many rows
+    RECURRENCE_BATCH_SIZE = int(os.getenv("RECURRENCE_BATCH_SIZE", 10000))
+
+    # Columnar task import (POST /import, flask tasks import): rows per
+    # normalized, bulk-loaded and committed batch
+    IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", 50000))
+
+    # Weekly per-user activity reports (see report_service): output dir,
+    # "parquet" or "csv", worker processes, user id ranges (0 = 4 per
+    # process) and rows per streamed chunk
+    REPORT_DIR = os.getenv("REPORT_DIR", "reports")
+    REPORT_FORMAT = os.getenv("REPORT_FORMAT", "parquet")
+    REPORT_PARALLELISM = int(os.getenv("REPORT_PARALLELISM", os.cpu_count() or 1))
+    REPORT_SHARDS = int(os.getenv("REPORT_SHARDS", 0))
+    REPORT_CHUNK_SIZE = int(os.getenv("REPORT_CHUNK_SIZE", 50000))
+
+    # task_logger retention: rows older than the horizon are rolled up into
+    # task_log_monthly_summary and moved to gzip NDJSON files under the archive dir
+    TASK_LOG_RETENTION_DAYS = int(os.getenv("TASK_LOG_RETENTION_DAYS", 365))
+    TASK_LOG_ARCHIVE_DIR = os.getenv("TASK_LOG_ARCHIVE_DIR", "archive")
+    TASK_LOG_ARCHIVE_BATCH_SIZE = int(os.getenv("TASK_LOG_ARCHIVE_BATCH_SIZE", 5000))
+    TASK_LOG_ARCHIVE_BATCH_PAUSE = float(os.getenv("TASK_LOG_ARCHIVE_BATCH_PAUSE", 0.1))  # seconds
+
+    # Write-behind status logging: PUT /task/<id> appends status changes to a
+    # Redis stream and a Celery beat task flushes them into task_logger
+    TASK_LOG_WRITE_BEHIND = os.getenv("TASK_LOG_WRITE_BEHIND", "false").lower() == "true"
+    TASK_LOG_STREAM = os.getenv("TASK_LOG_STREAM", "tasklog:status-changes")
+    TASK_LOG_STREAM_GROUP = os.getenv("TASK_LOG_STREAM_GROUP", "tasklog-writers")
+    TASK_LOG_FLUSH_BATCH_SIZE = int(os.getenv("TASK_LOG_FLUSH_BATCH_SIZE", 500))
+    TASK_LOG_FLUSH_MAX_BATCHES = int(os.getenv("TASK_LOG_FLUSH_MAX_BATCHES", 20))  # per run
+    TASK_LOG_STREAM_CLAIM_IDLE = int(os.getenv("TASK_LOG_STREAM_CLAIM_IDLE", 60000))  # ms before pending entries are reclaimed
+
+    # Two-tier cache: per-process L1 in front of Redis, evicted via pub/sub.
+    # CACHE_L1_TTL is the upper bound on how stale an L1 entry can get.
+    CACHE_L1_MAXSIZE = int(os.getenv("CACHE_L1_MAXSIZE", 1024))
+    CACHE_L1_TTL = float(os.getenv("CACHE_L1_TTL", 5))  # seconds
+    CACHE_INVALIDATION_CHANNEL = os.getenv("CACHE_INVALIDATION_CHANNEL", "cache:invalidate")
+
+    # Task change feed (GET /events/tasks). The stream keeps roughly the last
+    # TASK_EVENTS_MAXLEN events for Last-Event-ID resume.
+    TASK_EVENTS_STREAM = os.getenv("TASK_EVENTS_STREAM", "events:tasks")
+    TASK_EVENTS_CHANNEL = os.getenv("TASK_EVENTS_CHANNEL", "events:tasks:live")
+    TASK_EVENTS_MAXLEN = int(os.getenv("TASK_EVENTS_MAXLEN", 10000))
+    SSE_HEARTBEAT = float(os.getenv("SSE_HEARTBEAT", 15))  # seconds
+    SSE_CLIENT_QUEUE_SIZE = int(os.getenv("SSE_CLIENT_QUEUE_SIZE", 256))  # events buffered per client
+
+    # Idempotency-Key on POST /task, /upload-csv, /import and /log-tasks:
+    # responses are replayed for IDEMPOTENCY_TTL seconds, an in-progress
+    # claim is renewed while it runs and expires IDEMPOTENCY_LOCK_TIMEOUT
+    # after its worker died, and
+    # concurrent repeats wait up to IDEMPOTENCY_WAIT for the first request
+    IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", 86400))  # seconds
+    IDEMPOTENCY_LOCK_TIMEOUT = int(os.getenv("IDEMPOTENCY_LOCK_TIMEOUT", 300))  # seconds
+    IDEMPOTENCY_WAIT = float(os.getenv("IDEMPOTENCY_WAIT", 10))  # seconds
+
+    # Cache warming after the daily snapshot and bulk imports
+    CACHE_WARM_PAGES = int(os.getenv("CACHE_WARM_PAGES", 5))  # first N pages per date
+    CACHE_WARM_PER_PAGE = int(os.getenv("CACHE_WARM_PER_PAGE", 10))  # /tasks default page size
+    CACHE_WARM_TTL = int(os.getenv("CACHE_WARM_TTL", 300))  # seconds
+    CACHE_WARM_TIME_BUDGET = float(os.getenv("CACHE_WARM_TIME_BUDGET", 10))  # seconds
+    CACHE_WARM_ROW_BUDGET = int(os.getenv("CACHE_WARM_ROW_BUDGET", 10000))
+
+    # Celery task metrics (GET /metrics/celery): runs kept per task for the
+    # duration and queue wait percentiles
+    CELERY_METRICS_WINDOW = int(os.getenv("CELERY_METRICS_WINDOW", 1000))
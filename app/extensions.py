@@ -1,6 +1,6 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
-from redis import Redis
+from redis import Redis, BlockingConnectionPool
 from dotenv import load_dotenv
 from flask_limiter import Limiter 
 from flask_limiter.util import get_remote_address 
@@ -9,7 +9,21 @@ import os
 
 load_dotenv()  # Load environment variables from .env file
 
-redis_client = Redis.from_url(os.getenv("REDIS_URL"))
+if os.getenv("REDIS_MAX_CONNECTIONS"):
+    # Bounded pool (set by gunicorn.conf.py): callers wait for a free
+    # connection instead of opening one per thread/greenlet
+    redis_client = Redis(connection_pool=BlockingConnectionPool.from_url(
+        os.getenv("REDIS_URL"),
+        max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS")),
+        timeout=int(os.getenv("REDIS_POOL_TIMEOUT", 5))
+    ))
+else:
+    redis_client = Redis.from_url(os.getenv("REDIS_URL"))
+# Long-lived pub/sub listeners (cache invalidation, task events, token
+# revocation) hold their
+# connection for the life of the process, so they get their own pool and
+# never take one of the bounded pool's connections from a request
+redis_listener_client = Redis.from_url(os.getenv("REDIS_URL"))
 limiter = Limiter(
     get_remote_address,
     storage_uri="memory://",  # or "redis://localhost:6379" for production
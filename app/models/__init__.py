@@ -3,6 +3,8 @@
 from .user import User
 from .task_manager import TaskManager
 from .task_logger import TaskLogger
+from .task_log_bitmap import TaskLogBitmap
+from .task_log_monthly_summary import TaskLogMonthlySummary
 
 # Explicit exports
-__all__ = ['User', 'TaskManager', 'TaskLogger']
\ No newline at end of file
+__all__ = ['User', 'TaskManager', 'TaskLogger', 'TaskLogBitmap', 'TaskLogMonthlySummary']
\ No newline at end of file
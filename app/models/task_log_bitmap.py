@@ -0,0 +1,21 @@
+from app.extensions import db
+
+class TaskLogBitmap(db.Model):
+    """
+    Compact daily status history: one row per task per month.
+
+    Bit ``day - 1`` of ``present`` is set when the task was logged on that
+    day, and the same bit of ``status`` holds the logged status.
+    """
+    __tablename__ = 'task_log_bitmap'
+    __table_args__ = (
+    db.Index("ix_task_log_bitmap_month", "month"),
+    )
+
+    task_id = db.Column(db.Integer, db.ForeignKey('task_manager.id', ondelete="CASCADE"), primary_key=True)
+    month = db.Column(db.Date, primary_key=True)  # first day of the month
+    present = db.Column(db.Integer, nullable=False, default=0)
+    status = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TaskLogBitmap Task {self.task_id} - {self.month:%Y-%m}>"
@@ -0,0 +1,13 @@
+from app.extensions import db
+
+class TaskLogMonthlySummary(db.Model):
+    """Per-task monthly rollup of task_logger rows that have been archived."""
+    __tablename__ = 'task_log_monthly_summary'
+
+    task_id = db.Column(db.Integer, db.ForeignKey('task_manager.id', ondelete="CASCADE"), primary_key=True)
+    month = db.Column(db.Date, primary_key=True)  # first day of the month
+    days_logged = db.Column(db.Integer, nullable=False, default=0)
+    days_active = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TaskLogMonthlySummary Task {self.task_id} - {self.month:%Y-%m}>"
@@ -5,6 +5,7 @@ class TaskLogger(db.Model):
     __tablename__ = 'task_logger'
     __table_args__ = (
     db.Index("ix_date_logged", "date_logged"),
+    db.Index("ix_task_logger_task_id_date_logged", "task_id", "date_logged"),
     )
 
     id = db.Column(db.Integer, primary_key=True)
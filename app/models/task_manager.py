@@ -7,6 +7,16 @@ class TaskManager(db.Model):
     __table_args__ = (
     db.Index("ix_created_at", "created_at"),
     db.Index("ix_user_id", "user_id"),
+    # Covers GET /users/<id>/tasks: filter + keyset order + listed columns
+    db.Index(
+        "ix_task_manager_user_status_priority_id",
+        "user_id", "status", "priority", "id",
+        postgresql_include=["task_name", "created_at"],
+    ),
+    # Daily snapshot: active tasks with next_due <= today
+    db.Index("ix_task_manager_status_next_due", "status", "next_due"),
+    # Duplicate checks of the CSV upload and the columnar import
+    db.Index("ix_task_manager_user_created_at", "user_id", "created_at"),
     )
 
 
@@ -17,6 +27,10 @@ class TaskManager(db.Model):
     priority = db.Column(db.String(20), nullable=False)
     created_at = db.Column(db.Date, default=datetime)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    # RRULE with DTSTART (see app.utils.recurrence); NULL means every day while active
+    recurrence = db.Column(db.String(255))
+    # The server default covers inserts that bypass the ORM (COPY, raw SQL)
+    next_due = db.Column(db.Date, default=lambda: datetime.utcnow().date(), server_default=db.text("CURRENT_DATE"))
 
     user = relationship("User", back_populates="tasks")
     logs = relationship("TaskLogger", back_populates="task", cascade="all, delete-orphan",lazy="dynamic",passive_deletes=True)
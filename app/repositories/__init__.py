@@ -3,5 +3,6 @@
 from .user_repository import UserRepository
 from .task_repository import TaskRepository
 from .task_logger_repository import TaskLoggerRepository
+from .task_search_repository import TaskSearchRepository
 
-__all__ = ['UserRepository', 'TaskRepository', 'TaskLoggerRepository']
\ No newline at end of file
+__all__ = ['UserRepository', 'TaskRepository', 'TaskLoggerRepository', 'TaskSearchRepository']
\ No newline at end of file
@@ -0,0 +1,8 @@
+from app.extensions import db
+from sqlalchemy.dialects import postgresql, sqlite
+
+def dialect_insert(model):
+    """INSERT construct with ON CONFLICT support for the bound database."""
+    if db.engine.dialect.name == "sqlite":
+        return sqlite.insert(model)
+    return postgresql.insert(model)
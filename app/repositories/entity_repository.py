@@ -0,0 +1,106 @@
+from app.models import TaskLogger, TaskManager, User
+from app.extensions import db
+from app.repositories.sharding import shard_router
+from app.utils.entity_cache import entity_cache
+from datetime import date
+from sqlalchemy import select
+from sqlalchemy.orm.attributes import set_committed_value
+
+# Cached columns per entity. Tasks leave out recurrence/next_due, which the
+# daily snapshot rewrites in bulk and no cached view shows.
+_COLUMNS = {
+    "tasklog": ("id", "task_id", "date_logged", "status"),
+    "task": ("id", "task_name", "description", "status", "priority", "created_at", "user_id"),
+    "user": ("id", "username"),
+}
+_DATE_COLUMNS = {"date_logged", "created_at"}
+
+
+def _document(kind, obj):
+    document = {name: getattr(obj, name) for name in _COLUMNS[kind]}
+    for name in _DATE_COLUMNS.intersection(document):
+        # created_at may still hold the datetime it was created with
+        document[name] = document[name].strftime("%Y-%m-%d") if document[name] else None
+    return document
+
+
+def _from_document(model, document):
+    # Transient objects: never attached to a session, so relationships set
+    # on them below are not cascaded into a flush
+    values = {
+        name: date.fromisoformat(value) if name in _DATE_COLUMNS and value else value
+        for name, value in document.items()
+    }
+    return model(**values)
+
+
+def _load_rows(model, kind, ids, sharded):
+    stmt = select(*[getattr(model, name) for name in _COLUMNS[kind]]).where(model.id.in_(ids))
+    if sharded and shard_router.enabled:
+        rows = [row for shard_rows in shard_router.run(lambda session: session.execute(stmt).all()) for row in shard_rows]
+    else:
+        rows = db.session.execute(stmt).all()
+    return {row.id: _document(kind, row) for row in rows}
+
+
+class EntityRepository:
+    """
+    Task logs, tasks and users by id through the entity cache (see
+    EntityCache), for detail views and for attaching tasks to list pages.
+
+    Objects returned here are transient copies built from the cached
+    documents: read them, don't modify or add them to a session. Writers
+    keep the cache fresh with store_*/evict_*.
+    """
+
+    @staticmethod
+    def logs(ids):
+        documents = entity_cache.get_many("tasklog", ids, lambda missing: _load_rows(TaskLogger, "tasklog", missing, True))
+        return {entity_id: _from_document(TaskLogger, document) for entity_id, document in documents.items()}
+
+    @staticmethod
+    def tasks(ids):
+        documents = entity_cache.get_many("task", ids, lambda missing: _load_rows(TaskManager, "task", missing, True))
+        return {entity_id: _from_document(TaskManager, document) for entity_id, document in documents.items()}
+
+    @staticmethod
+    def users(ids):
+        # Users always live in the default database
+        documents = entity_cache.get_many("user", ids, lambda missing: _load_rows(User, "user", missing, False))
+        return {entity_id: _from_document(User, document) for entity_id, document in documents.items()}
+
+    @staticmethod
+    def log_detail(log_id, with_task=True, with_user=True):
+        """One log with its task (and the task's user), or None; the shape TaskLoggerRepository.get_detail returns."""
+        log = EntityRepository.logs([log_id]).get(log_id)
+        if log is None or not with_task:
+            return log
+        task = EntityRepository.tasks([log.task_id]).get(log.task_id)
+        set_committed_value(log, "task", task)
+        if task is not None and with_user:
+            set_committed_value(task, "user", EntityRepository.users([task.user_id]).get(task.user_id))
+        return log
+
+    @staticmethod
+    def attach_tasks(logs):
+        """Set ``log.task`` on every log from one batched cache read."""
+        tasks = EntityRepository.tasks({log.task_id for log in logs})
+        for log in logs:
+            set_committed_value(log, "task", tasks.get(log.task_id))
+        return logs
+
+    @staticmethod
+    def store_logs(*logs):
+        entity_cache.set_many("tasklog", {log.id: _document("tasklog", log) for log in logs})
+
+    @staticmethod
+    def store_tasks(*tasks):
+        entity_cache.set_many("task", {task.id: _document("task", task) for task in tasks})
+
+    @staticmethod
+    def store_users(*users):
+        entity_cache.set_many("user", {user.id: _document("user", user) for user in users})
+
+    @staticmethod
+    def evict_logs(ids):
+        entity_cache.evict("tasklog", ids)
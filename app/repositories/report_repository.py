@@ -0,0 +1,52 @@
+from app.models import TaskLogger, TaskManager, User
+from app.extensions import db
+from sqlalchemy import select, func
+
+class ReportRepository:
+    """
+    Queries behind the per-user activity reports. The statements are
+    built here and executed by report worker processes on their own
+    engines, so they must not depend on db.session.
+    """
+
+    @staticmethod
+    def user_id_ranges(shards):
+        """
+        Split users into at most ``shards`` contiguous id ranges of about
+        the same number of users, as [(first_id, last_id), ...].
+        """
+        buckets = select(
+            User.id,
+            func.ntile(shards).over(order_by=User.id).label("bucket"),
+        ).subquery()
+        rows = db.session.execute(
+            select(func.min(buckets.c.id), func.max(buckets.c.id))
+            .group_by(buckets.c.bucket)
+            .order_by(buckets.c.bucket)
+        ).all()
+        return [(first, last) for first, last in rows]
+
+    @staticmethod
+    def activity_stmt(first_user_id, last_user_id, start, end):
+        """One row per log in [start, end) of the users' tasks."""
+        return (
+            select(
+                TaskManager.user_id,
+                TaskLogger.task_id,
+                TaskManager.priority,
+                TaskLogger.date_logged,
+                TaskLogger.status,
+            )
+            .join(TaskManager, TaskManager.id == TaskLogger.task_id)
+            .where(
+                TaskManager.user_id.between(first_user_id, last_user_id),
+                TaskLogger.date_logged >= start,
+                TaskLogger.date_logged < end,
+            )
+        )
+
+    @staticmethod
+    def usernames_stmt(first_user_id, last_user_id):
+        return select(User.id.label("user_id"), User.username).where(
+            User.id.between(first_user_id, last_user_id)
+        )
@@ -0,0 +1,62 @@
+from app.models import TaskManager
+from app.utils.recurrence import next_occurrence
+from datetime import timedelta
+from flask import current_app
+from sqlalchemy import select, update
+
+
+class ScheduleRepository:
+    """
+    Maintains task_manager.next_due, the materialized next occurrence of
+    each task's recurrence rule. The daily snapshot reads only the rows
+    due on its day through ix_task_manager_status_next_due and then
+    advances them, so rules are never evaluated for tasks that aren't due.
+    """
+
+    @staticmethod
+    def due(log_date):
+        """WHERE conditions selecting the active tasks due on ``log_date``."""
+        return (TaskManager.status == True, TaskManager.next_due <= log_date)
+
+    @staticmethod
+    def advance(session, log_date, batch_size=None):
+        """
+        Move every task due on ``log_date`` to its next occurrence after
+        that day; the caller commits. Tasks without a rule (logged every day
+        while active) move to the next day in one UPDATE. Rule-based tasks
+        are read in batches and updated with one statement per distinct
+        next date. Rules that have ended (COUNT/UNTIL) get next_due NULL
+        and are never due again.
+
+        Returns the number of tasks advanced.
+        """
+        batch_size = batch_size or current_app.config["RECURRENCE_BATCH_SIZE"]
+        due = ScheduleRepository.due(log_date)
+
+        advanced = session.execute(
+            update(TaskManager)
+            .where(*due, TaskManager.recurrence.is_(None))
+            .values(next_due=log_date + timedelta(days=1))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+
+        while True:
+            # Advanced rows leave the due range, so each batch reads fresh ones
+            rows = session.execute(
+                select(TaskManager.id, TaskManager.recurrence)
+                .where(*due, TaskManager.recurrence.is_not(None))
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                return advanced
+            by_next_due = {}
+            for task_id, rule in rows:
+                by_next_due.setdefault(next_occurrence(rule, log_date), []).append(task_id)
+            for next_due, task_ids in by_next_due.items():
+                session.execute(
+                    update(TaskManager)
+                    .where(TaskManager.id.in_(task_ids))
+                    .values(next_due=next_due)
+                    .execution_options(synchronize_session=False)
+                )
+            advanced += len(rows)
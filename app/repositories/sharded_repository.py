@@ -0,0 +1,184 @@
+from app.models import TaskManager, TaskLogger
+from app.repositories.schedule_repository import ScheduleRepository
+from app.repositories.sharding import shard_router
+from flask_sqlalchemy.pagination import Pagination
+from itertools import islice
+from sqlalchemy import select, insert, delete, func
+from sqlalchemy.orm import load_only
+import heapq
+
+
+def _columns(obj):
+    return {column.key: getattr(obj, column.key) for column in obj.__table__.columns}
+
+
+def _log_filter(stmt, date_filter):
+    return stmt.where(TaskLogger.date_logged == date_filter) if date_filter else stmt
+
+
+class _ShardedLogPagination(Pagination):
+    """
+    Pagination over every shard: each shard returns its first
+    ``page * per_page`` rows in the requested order and the sorted lists
+    are merged, so deep pages cost more per shard than shallow ones.
+    """
+
+    def _query_items(self):
+        date_filter = self._query_args["date_filter"]
+        newest_first = self._query_args["newest_first"]
+        order = (TaskLogger.date_logged.desc() if newest_first else TaskLogger.date_logged, TaskLogger.id)
+        stmt = _log_filter(select(TaskLogger), date_filter).order_by(*order).limit(self.page * self.per_page)
+        stmt = stmt.options(*self._query_args["options"])
+
+        per_shard = shard_router.run(lambda session: session.scalars(stmt).unique().all())
+        if newest_first:
+            key = lambda log: (-log.date_logged.toordinal(), log.id)
+        else:
+            key = lambda log: (log.date_logged, log.id)
+        return list(islice(heapq.merge(*per_shard, key=key), self._query_offset, self.page * self.per_page))
+
+    def _query_count(self):
+        stmt = _log_filter(select(func.count()).select_from(TaskLogger), self._query_args["date_filter"])
+        return sum(shard_router.run(lambda session: session.scalar(stmt)))
+
+
+class ShardedTaskRepository:
+    """TaskRepository backend for SHARD_DATABASE_URLS (see ShardRouter)."""
+
+    @staticmethod
+    def add(task):
+        task.id = shard_router.next_ids("task_manager")[0]
+        with shard_router.session_for_user(task.user_id) as session:
+            session.add(task)
+            session.commit()
+        return task
+
+    @staticmethod
+    def add_many(tasks):
+        ids = iter(shard_router.next_ids("task_manager", len(tasks)))
+        by_bind = {}
+        for task in tasks:
+            task.id = next(ids)
+            by_bind.setdefault(shard_router.bind_for_user(task.user_id), []).append(task)
+        for bind, shard_tasks in by_bind.items():
+            with shard_router.session(bind) as session:
+                session.add_all(shard_tasks)
+                session.commit()
+
+    @staticmethod
+    def get_by_id(task_id):
+        found = shard_router.run(lambda session: session.get(TaskManager, task_id))
+        return next((task for task in found if task is not None), None)
+
+    @staticmethod
+    def get_all_active(columns=None):
+        stmt = select(TaskManager).where(TaskManager.status == True).order_by(TaskManager.id)
+        if columns:
+            stmt = stmt.options(load_only(*[getattr(TaskManager, name) for name in columns]))
+        per_shard = shard_router.run(lambda session: session.scalars(stmt).all())
+        return list(heapq.merge(*per_shard, key=lambda task: task.id))
+
+    @staticmethod
+    def update(task_id, **kwargs):
+        """Returns (task, previous (status, priority, user_id)), or (None, None) when not found."""
+        bind = shard_router.locate_task(task_id)
+        if bind is None:
+            return None, None
+        with shard_router.session(bind) as session:
+            task = session.get(TaskManager, task_id)
+            previous = (task.status, task.priority, task.user_id)
+            for key, value in kwargs.items():
+                setattr(task, key, value)
+            target = shard_router.bind_for_user(task.user_id)
+            if target != bind:
+                ShardedTaskRepository._move(session, task, target)
+            session.commit()
+        return task, previous
+
+    @staticmethod
+    def _move(session, task, target):
+        # Reassigned to a user on another shard: copy the task and its logs
+        # there first, then delete them here when the caller commits.
+        logs = session.scalars(select(TaskLogger).where(TaskLogger.task_id == task.id)).all()
+        with shard_router.session(target) as destination:
+            destination.add(TaskManager(**_columns(task)))
+            destination.flush()
+            if logs:
+                destination.execute(insert(TaskLogger), [_columns(log) for log in logs])
+            destination.commit()
+        session.execute(delete(TaskLogger).where(TaskLogger.task_id == task.id))
+        session.delete(task)
+
+    @staticmethod
+    def soft_delete(task_id):
+        """Returns (task, previous status), or (None, None) when not found."""
+        with shard_router.session_for_task(task_id) as session:
+            task = session.get(TaskManager, task_id)
+            if not task:
+                return None, None
+            previous_status = task.status
+            task.status = False
+            session.commit()
+            return task, previous_status
+
+
+class ShardedTaskLoggerRepository:
+    """TaskLoggerRepository backend for SHARD_DATABASE_URLS (see ShardRouter)."""
+
+    @staticmethod
+    def add(log):
+        log.id = shard_router.next_ids("task_logger")[0]
+        with shard_router.session_for_task(log.task_id) as session:
+            session.add(log)
+            session.commit()
+        return log
+
+    @staticmethod
+    def snapshot_active(log_date):
+        """Run the daily snapshot on every shard in parallel."""
+
+        def snapshot(session):
+            already_logged = select(TaskLogger.id).where(
+                TaskLogger.task_id == TaskManager.id,
+                TaskLogger.date_logged == log_date,
+            ).exists()
+            task_ids = session.scalars(
+                select(TaskManager.id).where(*ScheduleRepository.due(log_date), ~already_logged)
+            ).all()
+            if task_ids:
+                ids = shard_router.next_ids("task_logger", len(task_ids))
+                session.execute(insert(TaskLogger), [
+                    {"id": log_id, "task_id": task_id, "date_logged": log_date, "status": True}
+                    for log_id, task_id in zip(ids, task_ids)
+                ])
+            ScheduleRepository.advance(session, log_date)
+            session.commit()
+            return len(task_ids)
+
+        return sum(shard_router.run(snapshot))
+
+    @staticmethod
+    def get_by_id(log_id, options=()):
+        stmt = select(TaskLogger).where(TaskLogger.id == log_id).options(*options)
+        found = shard_router.run(lambda session: session.scalars(stmt).first())
+        return next((log for log in found if log is not None), None)
+
+    @staticmethod
+    def get_by_date(log_date):
+        per_shard = shard_router.run(lambda session: session.scalars(
+            select(TaskLogger).where(TaskLogger.date_logged == log_date).order_by(TaskLogger.id)
+        ).all())
+        return list(heapq.merge(*per_shard, key=lambda log: log.id))
+
+    @staticmethod
+    def get_paginated(page=1, per_page=10, date_filter=None, newest_first=False, options=(), count=True):
+        return _ShardedLogPagination(
+            page=page,
+            per_page=per_page,
+            max_per_page=None,
+            error_out=False,
+            count=count,
+            date_filter=date_filter,
+            newest_first=newest_first,
+            options=options,
+        )
@@ -0,0 +1,151 @@
+from app.extensions import db, redis_client
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from flask import current_app
+from sqlalchemy import MetaData, select, func
+from sqlalchemy.orm import Session
+import bisect
+import hashlib
+import os
+
+SHARDED_TABLES = ("task_manager", "task_logger")
+
+
+def _hash(value):
+    return int.from_bytes(hashlib.md5(str(value).encode("utf-8")).digest()[:8], "big")
+
+
+class ShardRouter:
+    """
+    Routes task_manager/task_logger rows to one of the SHARD_DATABASE_URLS
+    binds by user_id.
+
+    Users are placed on a consistent-hash ring (``vnodes`` points per
+    shard), so adding a shard moves roughly 1/N of the users instead of
+    reshuffling all of them. A task's logs live on the task's shard. Ids
+    come from Redis counters (``seq:<table>``) so they stay unique across
+    shards. The user table stays in the default database.
+    """
+
+    def __init__(self, vnodes=100):
+        self.vnodes = vnodes
+        self.binds = []
+        self._ring = []
+        self._points = []
+        self._executor = None
+        self._executor_pid = None
+
+    def init_app(self, app):
+        self.binds = sorted(
+            (key for key in app.config.get("SQLALCHEMY_BINDS", {}) if key.startswith("shard")),
+            key=lambda key: int(key[len("shard"):]),
+        )
+        self._ring = sorted(
+            (_hash(f"{bind}#{vnode}"), bind)
+            for bind in self.binds
+            for vnode in range(self.vnodes)
+        )
+        self._points = [point for point, _ in self._ring]
+        if self.binds:
+            unsupported = [
+                name for name, enabled in (
+                    ("TASK_LOG_STORAGE=bitmap", app.config["TASK_LOG_STORAGE"] == "bitmap"),
+                    ("TASK_LOG_WRITE_BEHIND", app.config["TASK_LOG_WRITE_BEHIND"]),
+                ) if enabled
+            ]
+            if unsupported:
+                raise RuntimeError(f"Not supported with SHARD_DATABASE_URLS: {', '.join(unsupported)}")
+
+    @property
+    def enabled(self):
+        return bool(self.binds)
+
+    def bind_for_user(self, user_id):
+        index = bisect.bisect(self._points, _hash(user_id)) % len(self._ring)
+        return self._ring[index][1]
+
+    @contextmanager
+    def session(self, bind):
+        with Session(db.engines[bind], expire_on_commit=False) as session:
+            yield session
+
+    @contextmanager
+    def session_for_user(self, user_id):
+        """The user's shard session, or db.session when sharding is off."""
+        if not self.enabled:
+            yield db.session
+            return
+        with self.session(self.bind_for_user(user_id)) as session:
+            yield session
+
+    @contextmanager
+    def session_for_task(self, task_id):
+        """The session holding ``task_id``, or db.session when sharding is off."""
+        if not self.enabled:
+            yield db.session
+            return
+        # Unknown ids still get a session so callers simply find nothing
+        with self.session(self.locate_task(task_id) or self.binds[0]) as session:
+            yield session
+
+    def locate_task(self, task_id):
+        """Bind key of the shard holding ``task_id`` (a parallel PK lookup)."""
+        from app.models import TaskManager
+
+        found = self.run(lambda session: session.scalar(
+            select(TaskManager.id).where(TaskManager.id == task_id)
+        ))
+        for bind, task in zip(self.binds, found):
+            if task is not None:
+                return bind
+        return None
+
+    def run(self, fn, binds=None):
+        """Call ``fn(session)`` on every shard in parallel; results in bind order."""
+        binds = binds or self.binds
+        app = current_app._get_current_object()
+
+        def call(bind):
+            with app.app_context(), self.session(bind) as session:
+                return fn(session)
+
+        return list(self._pool().map(call, binds))
+
+    def next_ids(self, table, count=1):
+        """Reserve ``count`` consecutive ids for ``table`` across all shards."""
+        key = f"seq:{table}"
+        if not redis_client.exists(key):
+            self.seed_sequence(table)
+        last = redis_client.incrby(key, count)
+        return list(range(last - count + 1, last + 1))
+
+    def seed_sequence(self, table):
+        """Start the id counter above every existing id (default DB included)."""
+        column = db.metadata.tables[table].c.id
+        highest = [db.session.scalar(select(func.max(column)))]
+        highest += self.run(lambda session: session.scalar(select(func.max(column))))
+        redis_client.set(f"seq:{table}", max((h for h in highest if h), default=0), nx=True)
+
+    def create_schema(self):
+        """Create the sharded tables on every shard (without the cross-database user FK)."""
+        metadata = MetaData()
+        for name in SHARDED_TABLES:
+            table = db.metadata.tables[name].to_metadata(metadata)
+            for constraint in list(table.foreign_key_constraints):
+                if constraint.elements[0].target_fullname.split(".")[0] not in SHARDED_TABLES:
+                    table.constraints.discard(constraint)
+                    table.foreign_keys.difference_update(constraint.elements)
+                    for column in constraint.columns:
+                        column.foreign_keys.clear()
+        for bind in self.binds:
+            metadata.create_all(db.engines[bind])
+
+    def _pool(self):
+        pid = os.getpid()
+        if self._executor_pid != pid:
+            self._executor = ThreadPoolExecutor(max_workers=len(self.binds) * 4, thread_name_prefix="shard")
+            self._executor_pid = pid
+        return self._executor
+
+
+shard_router = ShardRouter()
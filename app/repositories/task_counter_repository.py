@@ -0,0 +1,142 @@
+from app.models import TaskManager
+from app.extensions import db, redis_client
+from app.repositories.sharding import shard_router
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import select, func
+
+STATUS_KEY = "summary:status"      # active / inactive
+PRIORITY_KEY = "summary:priority"  # <priority>:active / <priority>:inactive
+USER_KEY = "summary:user"          # <user_id>:active / <user_id>:inactive
+RECONCILED_KEY = "summary:reconciled_at"
+KEYS = (STATUS_KEY, PRIORITY_KEY, USER_KEY)
+
+
+def _activity(status):
+    # NULL status counts as inactive, like the status filters do
+    return "active" if status else "inactive"
+
+
+def _fields(state):
+    status, priority, user_id = state
+    activity = _activity(status)
+    return [
+        (STATUS_KEY, activity),
+        (PRIORITY_KEY, f"{priority}:{activity}"),
+        (USER_KEY, f"{'none' if user_id is None else user_id}:{activity}"),
+    ]
+
+
+def _decode(mapping):
+    return {field.decode("utf-8"): int(value) for field, value in mapping.items()}
+
+
+class TaskCounterRepository:
+    """
+    Live task counts by status, priority and user in three Redis hashes,
+    so GET /summary never scans task_manager.
+
+    Every repository write that creates a task or changes its status,
+    priority or user passes the (status, priority, user_id) state before
+    and after to apply(), which adjusts the hashes in one MULTI. Writes
+    that bypass the repositories, and increments racing a reconcile, are
+    corrected by the periodic reconcile().
+    """
+
+    @staticmethod
+    def state(task):
+        return (task.status, task.priority, task.user_id)
+
+    @staticmethod
+    def apply(changes):
+        """``changes``: (before, after) states; None for a task that didn't / doesn't exist."""
+        deltas = Counter()
+        for before, after in changes:
+            if before == after:
+                continue
+            if before is not None:
+                deltas.subtract(_fields(before))
+            if after is not None:
+                deltas.update(_fields(after))
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        pipe = redis_client.pipeline(transaction=True)
+        for (key, field), delta in deltas.items():
+            pipe.hincrby(key, field, delta)
+        pipe.execute()
+
+    @staticmethod
+    def read(user_id=None):
+        """
+        (by status, by priority, by user, reconciled_at) from one pipelined
+        read; only ``user_id``'s counts when given. reconciled_at is None
+        until the first reconcile.
+        """
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.hgetall(STATUS_KEY)
+        pipe.hgetall(PRIORITY_KEY)
+        if user_id is None:
+            pipe.hgetall(USER_KEY)
+        else:
+            pipe.hmget(USER_KEY, [f"{user_id}:active", f"{user_id}:inactive"])
+        pipe.get(RECONCILED_KEY)
+        by_status, by_priority, by_user, reconciled_at = pipe.execute()
+        if user_id is not None:
+            by_user = {
+                f"{user_id}:active".encode(): by_user[0] or 0,
+                f"{user_id}:inactive".encode(): by_user[1] or 0,
+            }
+        return (
+            _decode(by_status),
+            _decode(by_priority),
+            _decode(by_user),
+            reconciled_at.decode("utf-8") if reconciled_at else None,
+        )
+
+    @staticmethod
+    def count_in_database():
+        """{(hash, field): count} from one GROUP BY over task_manager (per shard when sharded)."""
+        stmt = select(
+            TaskManager.status, TaskManager.priority, TaskManager.user_id, func.count()
+        ).group_by(TaskManager.status, TaskManager.priority, TaskManager.user_id)
+        if shard_router.enabled:
+            rows = [row for shard_rows in shard_router.run(lambda session: session.execute(stmt).all()) for row in shard_rows]
+        else:
+            rows = db.session.execute(stmt).all()
+        counts = Counter()
+        for status, priority, user_id, count in rows:
+            for field in _fields((status, priority, user_id)):
+                counts[field] += count
+        return counts
+
+    @staticmethod
+    def reconcile():
+        """
+        Replace the hashes with counts from the database in one MULTI.
+        Returns the fields that had drifted as {"hash field": (cached, actual)}.
+        """
+        actual = TaskCounterRepository.count_in_database()
+        pipe = redis_client.pipeline(transaction=False)
+        for key in KEYS:
+            pipe.hgetall(key)
+        cached = {
+            (key, field): value
+            for key, mapping in zip(KEYS, pipe.execute())
+            for field, value in _decode(mapping).items()
+        }
+        drift = {
+            f"{key} {field}": (cached.get((key, field), 0), actual.get((key, field), 0))
+            for key, field in set(cached) | set(actual)
+            if cached.get((key, field), 0) != actual.get((key, field), 0)
+        }
+
+        pipe = redis_client.pipeline(transaction=True)
+        pipe.delete(*KEYS)
+        for key in KEYS:
+            mapping = {field: count for (hash_key, field), count in actual.items() if hash_key == key}
+            if mapping:
+                pipe.hset(key, mapping=mapping)
+        pipe.set(RECONCILED_KEY, datetime.utcnow().isoformat(timespec="seconds") + "Z")
+        pipe.execute()
+        return drift
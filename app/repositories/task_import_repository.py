@@ -0,0 +1,122 @@
+from app.models import TaskManager, User
+from app.extensions import db
+from app.repositories.dialects import dialect_insert
+from app.repositories.sharding import shard_router
+from datetime import datetime
+from sqlalchemy import (
+    Table, Column, MetaData, Integer, String, Text, Boolean, Date,
+    select, insert, exists, literal
+)
+import csv
+import io
+
+IMPORT_COLUMNS = ("task_name", "description", "status", "priority", "created_at", "user_id")
+
+# Per-batch staging table: rows are bulk-loaded here (COPY on Postgres) and
+# moved into task_manager with one INSERT ... SELECT that skips duplicates
+_staging = Table(
+    "task_import_staging", MetaData(),
+    Column("id", Integer),
+    Column("task_name", String(255)),
+    Column("description", Text),
+    Column("status", Boolean),
+    Column("priority", String(20)),
+    Column("created_at", Date),
+    Column("user_id", Integer),
+    prefixes=["TEMPORARY"],
+)
+
+
+def _copy(connection, frame, columns):
+    buffer = io.StringIO()
+    # Quoted strings keep '' distinct from NULL (an unquoted empty field)
+    frame[list(columns)].to_csv(buffer, index=False, header=False, quoting=csv.QUOTE_NONNUMERIC)
+    buffer.seek(0)
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {_staging.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+
+
+class TaskImportRepository:
+    """Bulk task loading for the columnar importer (see import_service)."""
+
+    @staticmethod
+    def resolve_users(usernames, chunk_size=1000):
+        """
+        {username: id} for ``usernames``, creating the missing users the way
+        the CSV upload does. Usernames that can't be created (e.g. their
+        generated email is taken) are left out.
+        """
+        usernames = list(usernames)
+
+        def lookup(names):
+            found = {}
+            for start in range(0, len(names), chunk_size):
+                chunk = names[start:start + chunk_size]
+                found.update(db.session.execute(
+                    select(User.username, User.id).where(User.username.in_(chunk))
+                ).all())
+            return found
+
+        ids = lookup(usernames)
+        missing = [name for name in usernames if name not in ids]
+        for start in range(0, len(missing), chunk_size):
+            db.session.execute(dialect_insert(User).values([
+                {"username": name, "email": f"{name}@example.com", "password": "default123", "role": "user"}
+                for name in missing[start:start + chunk_size]
+            ]).on_conflict_do_nothing())
+        if missing:
+            db.session.commit()
+            ids.update(lookup(missing))
+        return ids
+
+    @staticmethod
+    def insert_batch(frame):
+        """
+        Insert the rows of ``frame`` (IMPORT_COLUMNS, deduplicated within the
+        batch) that don't duplicate an existing task: same task_name,
+        description, created_at and user_id. Returns the (status, priority,
+        user_id) of the inserted rows.
+        """
+        if frame.empty:
+            return []
+        if not shard_router.enabled:
+            return TaskImportRepository._insert(db.session, frame, with_ids=False)
+
+        frame = frame.assign(id=shard_router.next_ids("task_manager", len(frame)))
+        binds = frame["user_id"].map({user_id: shard_router.bind_for_user(user_id) for user_id in frame["user_id"].unique()})
+        inserted = []
+        for bind, part in frame.groupby(binds):
+            with shard_router.session(bind) as session:
+                inserted += TaskImportRepository._insert(session, part, with_ids=True)
+        return inserted
+
+    @staticmethod
+    def _insert(session, frame, with_ids):
+        columns = (("id",) if with_ids else ()) + IMPORT_COLUMNS
+        connection = session.connection()
+        _staging.create(connection)
+        if connection.dialect.driver == "psycopg2":
+            _copy(connection, frame, columns)
+        else:
+            connection.execute(insert(_staging), frame[list(columns)].to_dict("records"))
+
+        task = TaskManager.__table__
+        staged = _staging.c
+        duplicate = exists().where(
+            task.c.task_name == staged.task_name,
+            task.c.description.is_not_distinct_from(staged.description),
+            task.c.created_at == staged.created_at,
+            task.c.user_id == staged.user_id,
+        )
+        stmt = insert(task).from_select(
+            list(columns) + ["next_due"],
+            select(*[staged[name] for name in columns], literal(datetime.utcnow().date()).label("next_due"))
+            .where(~duplicate)
+        ).returning(task.c.status, task.c.priority, task.c.user_id)
+        inserted = [tuple(row) for row in connection.execute(stmt)]
+        _staging.drop(connection)
+        session.commit()
+        return inserted
@@ -0,0 +1,120 @@
+from app.models import TaskLogger, TaskLogMonthlySummary
+from app.extensions import db
+from app.repositories.dialects import dialect_insert
+from app.repositories.entity_repository import EntityRepository
+from collections import Counter
+from sqlalchemy import select, delete, func
+
+class TaskLogArchiveRepository:
+    @staticmethod
+    def oldest_month():
+        """First day of the month of the oldest task_logger row, or None."""
+        oldest = db.session.query(func.min(TaskLogger.date_logged)).scalar()
+        return oldest.replace(day=1) if oldest else None
+
+    @staticmethod
+    def max_id_in_range(start, end):
+        return db.session.query(func.max(TaskLogger.id)).filter(
+            TaskLogger.date_logged >= start,
+            TaskLogger.date_logged < end,
+        ).scalar()
+
+    @staticmethod
+    def iter_range(start, end, max_id, chunk_size=5000):
+        """Yield task_logger rows in [start, end) with id <= max_id, in id order, chunk by chunk."""
+        last_id = 0
+        while True:
+            rows = db.session.execute(
+                select(TaskLogger.id, TaskLogger.task_id, TaskLogger.date_logged, TaskLogger.status)
+                .where(
+                    TaskLogger.date_logged >= start,
+                    TaskLogger.date_logged < end,
+                    TaskLogger.id > last_id,
+                    TaskLogger.id <= max_id,
+                )
+                .order_by(TaskLogger.id)
+                .limit(chunk_size)
+            ).all()
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1].id
+
+    @staticmethod
+    def delete_batch_with_rollup(start, end, max_id, month, batch_size=5000):
+        """
+        Delete up to ``batch_size`` rows in [start, end) and fold them into the
+        monthly summary in the same transaction, so a crash between batches
+        can never count a row twice. Returns the number of rows deleted.
+        """
+        batch_ids = select(TaskLogger.id).where(
+            TaskLogger.date_logged >= start,
+            TaskLogger.date_logged < end,
+            TaskLogger.id <= max_id,
+        ).order_by(TaskLogger.id).limit(batch_size).scalar_subquery()
+
+        deleted = db.session.execute(
+            delete(TaskLogger)
+            .where(TaskLogger.id.in_(batch_ids))
+            .returning(TaskLogger.id, TaskLogger.task_id, TaskLogger.status)
+        ).all()
+        if not deleted:
+            db.session.rollback()
+            return 0
+
+        logged, active = Counter(), Counter()
+        for row in deleted:
+            logged[row.task_id] += 1
+            if row.status:
+                active[row.task_id] += 1
+
+        TaskLogArchiveRepository._add_to_summary(month, logged, active)
+        db.session.commit()
+        EntityRepository.evict_logs([row.id for row in deleted])
+        return len(deleted)
+
+    @staticmethod
+    def restore_rows(rows, month):
+        """
+        Re-insert archived rows (dicts with id, task_id, date_logged, status)
+        and take them back out of the monthly summary. Rows whose id is
+        already present are skipped. Returns the number of rows inserted.
+        """
+        inserted = db.session.execute(
+            dialect_insert(TaskLogger)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[TaskLogger.id])
+            .returning(TaskLogger.task_id, TaskLogger.status)
+        ).all()
+
+        logged, active = Counter(), Counter()
+        for row in inserted:
+            logged[row.task_id] -= 1
+            if row.status:
+                active[row.task_id] -= 1
+
+        TaskLogArchiveRepository._add_to_summary(month, logged, active)
+        db.session.flush()
+        return len(inserted)
+
+    @staticmethod
+    def _add_to_summary(month, logged, active):
+        if not logged:
+            return
+        stmt = dialect_insert(TaskLogMonthlySummary).values([
+            {
+                "task_id": task_id,
+                "month": month,
+                "days_logged": count,
+                "days_active": active.get(task_id, 0),
+            }
+            for task_id, count in logged.items()
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TaskLogMonthlySummary.task_id, TaskLogMonthlySummary.month],
+            set_={
+                "days_logged": TaskLogMonthlySummary.days_logged + stmt.excluded.days_logged,
+                "days_active": TaskLogMonthlySummary.days_active + stmt.excluded.days_active,
+            },
+        )
+        db.session.execute(stmt)
@@ -0,0 +1,220 @@
+from app.models import TaskLogger, TaskManager, TaskLogBitmap
+from app.extensions import db
+from app.repositories.dialects import dialect_insert
+from app.repositories.schedule_repository import ScheduleRepository
+from flask_sqlalchemy.pagination import Pagination
+from sqlalchemy import select, func, literal, union_all, case, and_, or_, Date
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm.attributes import set_committed_value
+
+
+def _month_start(day):
+    return day.replace(day=1)
+
+
+def _bit(day):
+    return 1 << (day.day - 1)
+
+
+class _BitmapLogPagination(Pagination):
+    """Pagination over the expanded bitmap view, yielding TaskLogger objects."""
+
+    def _query_items(self):
+        stmt = self._query_args["select"].limit(self.per_page).offset(self._query_offset)
+        rows = db.session.execute(stmt).all()
+        return TaskLogBitmapRepository.to_logs(
+            rows, with_task=self._query_args["with_task"], task_columns=self._query_args["task_columns"]
+        )
+
+    def _query_count(self):
+        sub = self._query_args["select"].order_by(None).subquery()
+        return db.session.execute(select(func.count()).select_from(sub)).scalar()
+
+
+class TaskLogBitmapRepository:
+    """
+    Storage backend for TASK_LOG_STORAGE=bitmap.
+
+    Reads expand (task_id, month) bitmaps back into one (task_id,
+    date_logged, status) row per logged day, so callers get the same
+    shape as the row-per-day task_logger table. Expanded logs are
+    transient TaskLogger objects with ``id=None``.
+    """
+
+    @staticmethod
+    def set_bit(task_id, day, status):
+        db.session.execute(TaskLogBitmapRepository.set_bits_stmt([task_id], day, status))
+        db.session.commit()
+
+    @staticmethod
+    def set_bits(statuses):
+        """Apply {(task_id, day): status} in one transaction (idempotent)."""
+        for (task_id, day), status in statuses.items():
+            db.session.execute(TaskLogBitmapRepository.set_bits_stmt([task_id], day, status))
+        db.session.commit()
+
+    @staticmethod
+    def set_bits_stmt(task_ids, day, status):
+        """One multi-row upsert setting ``day`` to ``status`` for every task."""
+        bit = _bit(day)
+        stmt = dialect_insert(TaskLogBitmap).values([
+            {
+                "task_id": task_id,
+                "month": _month_start(day),
+                "present": bit,
+                "status": bit if status else 0,
+            }
+            for task_id in task_ids
+        ])
+        return stmt.on_conflict_do_update(
+            index_elements=[TaskLogBitmap.task_id, TaskLogBitmap.month],
+            set_={
+                "present": TaskLogBitmap.present.op("|")(bit),
+                "status": TaskLogBitmap.status.op("&")(~bit).op("|")(bit if status else 0),
+            },
+        )
+
+    @staticmethod
+    def snapshot_active(day):
+        """
+        Set today's bit for every active task due on ``day`` in one
+        statement and advance their next_due.
+
+        Tasks already logged today keep their logged status, matching the
+        exists-check of the row-per-day snapshot.
+        """
+        bit = _bit(day)
+        source = select(
+            TaskManager.id,
+            literal(_month_start(day), Date),
+            literal(bit),
+            literal(bit),
+        ).where(*ScheduleRepository.due(day))
+
+        stmt = dialect_insert(TaskLogBitmap).from_select(
+            ["task_id", "month", "present", "status"], source
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TaskLogBitmap.task_id, TaskLogBitmap.month],
+            set_={
+                "present": TaskLogBitmap.present.op("|")(bit),
+                "status": case(
+                    (TaskLogBitmap.present.op("&")(bit) != 0, TaskLogBitmap.status),
+                    else_=TaskLogBitmap.status.op("|")(bit),
+                ),
+            },
+        )
+        result = db.session.execute(stmt)
+        ScheduleRepository.advance(db.session, day)
+        db.session.commit()
+        return result.rowcount
+
+    @staticmethod
+    def exists(task_id, log_date):
+        return db.session.query(
+            TaskLogBitmap.query.filter(
+                TaskLogBitmap.task_id == task_id,
+                TaskLogBitmap.month == _month_start(log_date),
+                TaskLogBitmap.present.op("&")(_bit(log_date)) != 0,
+            ).exists()
+        ).scalar()
+
+    @staticmethod
+    def get_by_date(log_date):
+        stmt = TaskLogBitmapRepository.expanded(day=log_date)
+        stmt = stmt.order_by(TaskLogBitmap.task_id)
+        return TaskLogBitmapRepository.to_logs(db.session.execute(stmt).all())
+
+    @staticmethod
+    def get_paginated(page=1, per_page=10, date_filter=None, newest_first=False, with_task=False,
+                      task_columns=None, count=True):
+        logs = TaskLogBitmapRepository.expanded(day=date_filter).subquery()
+        order = logs.c.date_logged.desc() if newest_first else logs.c.date_logged
+        stmt = select(logs).order_by(order, logs.c.task_id)
+        return _BitmapLogPagination(
+            page=page,
+            per_page=per_page,
+            max_per_page=None,
+            error_out=False,
+            count=count,
+            select=stmt,
+            with_task=with_task,
+            task_columns=task_columns,
+        )
+
+    @staticmethod
+    def get_history(task_id, start=None, end=None, after=None, limit=50):
+        logs = TaskLogBitmapRepository.expanded(task_id=task_id, start=start, end=end).subquery()
+        stmt = select(logs)
+        if after:
+            # One entry per day in this layout, so the date alone is the key
+            stmt = stmt.where(logs.c.date_logged > after[0])
+        stmt = stmt.order_by(logs.c.date_logged).limit(limit)
+        return TaskLogBitmapRepository.to_logs(db.session.execute(stmt).all())
+
+    @staticmethod
+    def daily_statuses(task_id, start=None, end=None):
+        """(date_logged, status) per logged day, for the run-length query."""
+        return TaskLogBitmapRepository.expanded(task_id=task_id, start=start, end=end).subquery()
+
+    @staticmethod
+    def expanded(task_id=None, day=None, start=None, end=None):
+        """
+        Select one (task_id, date_logged, status) row per set ``present`` bit.
+
+        Filters are applied to (task_id, month, day-of-month) before the
+        expansion so they can use the primary key and month index.
+        """
+        days = union_all(*[
+            select(
+                literal(n).label("day"),
+                literal(1 << (n - 1)).label("bit"),
+                literal(f"+{n - 1} days").label("modifier"),
+            )
+            for n in range(1, 32)
+        ]).subquery("days")
+
+        if db.engine.dialect.name == "sqlite":
+            date_logged = func.date(TaskLogBitmap.month, days.c.modifier, type_=Date)
+        else:
+            date_logged = TaskLogBitmap.month + (days.c.day - 1)
+
+        conditions = [TaskLogBitmap.present.op("&")(days.c.bit) != 0]
+        if task_id is not None:
+            conditions.append(TaskLogBitmap.task_id == task_id)
+        if day:
+            conditions.append(TaskLogBitmap.month == _month_start(day))
+            conditions.append(days.c.day == day.day)
+        if start:
+            conditions.append(or_(
+                TaskLogBitmap.month > _month_start(start),
+                and_(TaskLogBitmap.month == _month_start(start), days.c.day >= start.day),
+            ))
+        if end:
+            conditions.append(or_(
+                TaskLogBitmap.month < _month_start(end),
+                and_(TaskLogBitmap.month == _month_start(end), days.c.day <= end.day),
+            ))
+
+        return select(
+            TaskLogBitmap.task_id,
+            date_logged.label("date_logged"),
+            (TaskLogBitmap.status.op("&")(days.c.bit) != 0).label("status"),
+        ).select_from(TaskLogBitmap).join(days, and_(*conditions))
+
+    @staticmethod
+    def to_logs(rows, with_task=False, task_columns=None):
+        logs = [
+            TaskLogger(task_id=row.task_id, date_logged=row.date_logged, status=row.status)
+            for row in rows
+        ]
+        if with_task and logs:
+            query = TaskManager.query.filter(TaskManager.id.in_({log.task_id for log in logs}))
+            if task_columns:
+                query = query.options(load_only(*[getattr(TaskManager, name) for name in task_columns]))
+            tasks = {task.id: task for task in query}
+            for log in logs:
+                # Attach without relationship events so the transient log is
+                # never cascaded into the session and flushed as a real row
+                set_committed_value(log, "task", tasks.get(log.task_id))
+        return logs
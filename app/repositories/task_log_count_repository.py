@@ -0,0 +1,108 @@
+from app.models import TaskLogger
+from app.extensions import db, redis_client
+from app.repositories.sharding import shard_router
+from collections import Counter
+from flask import current_app
+from sqlalchemy import select, func, literal, text
+
+COUNT_MODES = ("exact", "cached", "approximate", "none")
+
+COUNTER_PREFIX = "tasklog:count:"
+
+# INCRBY only the counters that exist: a missing counter is computed exactly
+# on its next read, so it must not be started from a partial delta
+_INCR_EXISTING = """
+for i, key in ipairs(KEYS) do
+    if redis.call('EXISTS', key) == 1 then
+        redis.call('INCRBY', key, ARGV[i])
+    end
+end
+"""
+_incr_existing = redis_client.register_script(_INCR_EXISTING)
+
+def _counter_key(date_filter):
+    return COUNTER_PREFIX + (date_filter.isoformat() if date_filter else "all")
+
+def _date_filter(stmt, date_filter):
+    return stmt.where(TaskLogger.date_logged == date_filter) if date_filter else stmt
+
+class TaskLogCountRepository:
+    """
+    task_logger row counts (the ``total`` of /tasks) by strategy:
+
+    - exact: COUNT(*), summed over the shards when sharded
+    - cached: one Redis counter per date plus one overall, initialised
+      with an exact count on a miss and kept current by the logger writes
+      (see increment). Counters expire after TASKLOG_COUNT_TTL, which
+      bounds the drift from writes that bypass the repositories.
+    - approximate: planner statistics, Postgres only
+
+    Only the row storage is covered; the bitmap layout has no row table to
+    count, so callers use the exact count of the expanded view there.
+    """
+
+    @staticmethod
+    def exact(date_filter=None):
+        stmt = _date_filter(select(func.count()).select_from(TaskLogger), date_filter)
+        if shard_router.enabled:
+            return sum(shard_router.run(lambda session: session.scalar(stmt)))
+        return db.session.scalar(stmt)
+
+    @staticmethod
+    def cached(date_filter=None):
+        key = _counter_key(date_filter)
+        value = redis_client.get(key)
+        if value is not None:
+            return int(value)
+        count = TaskLogCountRepository.exact(date_filter)
+        # nx: a concurrent request may have initialised it in the meantime,
+        # and increments since then are only reflected in that value
+        redis_client.set(key, count, ex=current_app.config["TASKLOG_COUNT_TTL"], nx=True)
+        return count
+
+    @staticmethod
+    def approximate(date_filter=None):
+        """
+        pg_class.reltuples for the whole table, the planner's row estimate
+        for one date. None when the database has no statistics to offer
+        (not Postgres, or the table was never analyzed).
+        """
+        def estimate(session):
+            dialect = session.get_bind().dialect
+            if dialect.name != "postgresql":
+                return None
+            if date_filter is None:
+                reltuples = session.scalar(text(
+                    "SELECT reltuples FROM pg_class WHERE oid = 'task_logger'::regclass"
+                ))
+                return None if reltuples is None or reltuples < 0 else int(reltuples)
+            # Literal binds: EXPLAIN can't take bound parameters with every driver
+            query = _date_filter(select(literal(1)).select_from(TaskLogger), date_filter)
+            sql = query.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+            plan = session.scalar(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+            return int(plan[0]["Plan"]["Plan Rows"])
+
+        if shard_router.enabled:
+            estimates = shard_router.run(estimate)
+            return None if None in estimates else sum(estimates)
+        return estimate(db.session)
+
+    @staticmethod
+    def increment(counts):
+        """
+        Add ``{date_logged: rows inserted}`` (or one date per inserted row)
+        to the initialised counters, the date's and the overall one. Call
+        after the insert commits.
+        """
+        counts = {day: n for day, n in Counter(counts).items() if n}
+        if not counts or current_app.config.get("TASK_LOG_STORAGE") == "bitmap":
+            return
+        keys = [_counter_key(day) for day in counts] + [_counter_key(None)]
+        _incr_existing(keys=keys, args=[*counts.values(), sum(counts.values())])
+
+    @staticmethod
+    def invalidate():
+        """Drop every counter, e.g. after rows were archived or restored."""
+        keys = list(redis_client.scan_iter(match=COUNTER_PREFIX + "*", count=1000))
+        if keys:
+            redis_client.delete(*keys)
@@ -1,35 +1,327 @@
-from app.models import TaskLogger
+from app.models import TaskLogger, TaskManager, User
 from app.extensions import db
+from app.repositories.task_log_bitmap_repository import TaskLogBitmapRepository
+from app.repositories.task_log_count_repository import TaskLogCountRepository
+from app.repositories.entity_repository import EntityRepository
+from app.repositories.schedule_repository import ScheduleRepository
+from app.repositories.sharding import shard_router
+from app.repositories.sharded_repository import ShardedTaskLoggerRepository
+from app.utils.cache import invalidate_task_logs
+from app.utils.events import task_events
 from datetime import datetime, date
+from flask import current_app
+from sqlalchemy import select, insert, update, func, literal, literal_column, tuple_, and_, or_, Date
+from sqlalchemy.orm import joinedload, load_only
+from sqlalchemy.orm.attributes import set_committed_value
+
+def _bitmap_storage():
+    return current_app.config.get("TASK_LOG_STORAGE") == "bitmap"
+
+def _log_load_options(columns=None, with_task=False, task_columns=None, with_user=False):
+    """
+    Loader options selecting only ``columns`` of the log and, when
+    ``with_task``, joining only ``task_columns`` of its task (and the
+    task's user when ``with_user``). None means every column.
+    """
+    options = []
+    if columns:
+        options.append(load_only(*[getattr(TaskLogger, name) for name in columns]))
+    if with_task:
+        loader = joinedload(TaskLogger.task)
+        if task_columns:
+            loader = loader.load_only(*[getattr(TaskManager, name) for name in task_columns])
+        if with_user:
+            user_loader = loader.joinedload(TaskManager.user)
+            # Only the username is shown when the task columns were narrowed
+            loader = user_loader.load_only(User.username) if task_columns else user_loader
+        options.append(loader)
+    return options
 
 class TaskLoggerRepository:
     @staticmethod
     def create(task_id, status):
+        today = datetime.utcnow().date()
+        if _bitmap_storage():
+            TaskLogBitmapRepository.set_bit(task_id, today, status)
+            invalidate_task_logs()
+            return TaskLogger(task_id=task_id, status=status, date_logged=today)
+
         log = TaskLogger(
             task_id=task_id,
             status=status,
-            date_logged=datetime.utcnow().date()
+            date_logged=today
         )
-        db.session.add(log)
-        db.session.commit()
+        if shard_router.enabled:
+            ShardedTaskLoggerRepository.add(log)
+        else:
+            db.session.add(log)
+            db.session.commit()
+        TaskLogCountRepository.increment({today: 1})
+        invalidate_task_logs()
         return log
 
+    @staticmethod
+    def stage_statuses(session, task_ids, status, log_date):
+        """
+        Add one ``status`` log per task for ``log_date`` to ``session`` with a
+        single multi-row insert. The caller commits.
+        """
+        if not task_ids:
+            return 0
+        if _bitmap_storage():
+            session.execute(TaskLogBitmapRepository.set_bits_stmt(task_ids, log_date, status))
+            return len(task_ids)
+
+        rows = [{"task_id": task_id, "date_logged": log_date, "status": status} for task_id in task_ids]
+        if shard_router.enabled:
+            for row, log_id in zip(rows, shard_router.next_ids("task_logger", len(rows))):
+                row["id"] = log_id
+        session.execute(insert(TaskLogger), rows)
+        return len(rows)
+
+    @staticmethod
+    def apply_day_statuses(statuses):
+        """
+        Record the final status per day from {(task_id, day): status}.
+
+        The latest log of each (task_id, day) is updated in place and a row
+        is inserted only when the day has none, so replaying a batch leaves
+        the table unchanged (used by the write-behind flush).
+        """
+        if not statuses:
+            return 0
+        if _bitmap_storage():
+            TaskLogBitmapRepository.set_bits(statuses)
+            invalidate_task_logs()
+            return len(statuses)
+
+        latest = db.session.execute(
+            select(TaskLogger.task_id, TaskLogger.date_logged, func.max(TaskLogger.id))
+            .where(tuple_(TaskLogger.task_id, TaskLogger.date_logged).in_(list(statuses)))
+            .group_by(TaskLogger.task_id, TaskLogger.date_logged)
+        ).all()
+        existing = {(task_id, day): log_id for task_id, day, log_id in latest}
+
+        updates = [
+            {"id": existing[key], "status": status}
+            for key, status in statuses.items() if key in existing
+        ]
+        inserts = [
+            {"task_id": task_id, "date_logged": day, "status": status}
+            for (task_id, day), status in statuses.items() if (task_id, day) not in existing
+        ]
+        if updates:
+            db.session.execute(update(TaskLogger), updates)
+        if inserts:
+            db.session.execute(insert(TaskLogger), inserts)
+        db.session.commit()
+        # Write through: an eviction could be undone by a reader that loaded
+        # the old row before the commit (see EntityCache)
+        EntityRepository.store_logs(*[
+            TaskLogger(id=existing[key], task_id=key[0], date_logged=key[1], status=status)
+            for key, status in statuses.items() if key in existing
+        ])
+        TaskLogCountRepository.increment([row["date_logged"] for row in inserts])
+        invalidate_task_logs()
+        return len(statuses)
+
+    @staticmethod
+    def snapshot_active(log_date):
+        """
+        Log every active task due on ``log_date`` in one set-based
+        statement, skipping tasks that already have a log for that day, and
+        advance their next_due in the same transaction.
+        """
+        if _bitmap_storage():
+            count = TaskLogBitmapRepository.snapshot_active(log_date)
+            invalidate_task_logs()
+            task_events.publish("tasklog.snapshot", {"date": log_date, "logged": count})
+            return count
+        if shard_router.enabled:
+            count = ShardedTaskLoggerRepository.snapshot_active(log_date)
+            TaskLogCountRepository.increment({log_date: count})
+            invalidate_task_logs()
+            task_events.publish("tasklog.snapshot", {"date": log_date, "logged": count})
+            return count
+
+        already_logged = select(TaskLogger.id).where(
+            TaskLogger.task_id == TaskManager.id,
+            TaskLogger.date_logged == log_date,
+        ).exists()
+        source = select(
+            TaskManager.id,
+            literal(log_date, Date),
+            TaskManager.status,
+        ).where(*ScheduleRepository.due(log_date), ~already_logged)
+
+        result = db.session.execute(
+            TaskLogger.__table__.insert().from_select(
+                ["task_id", "date_logged", "status"], source
+            )
+        )
+        ScheduleRepository.advance(db.session, log_date)
+        db.session.commit()
+        TaskLogCountRepository.increment({log_date: result.rowcount})
+        invalidate_task_logs()
+        task_events.publish("tasklog.snapshot", {"date": log_date, "logged": result.rowcount})
+        return result.rowcount
+
     @staticmethod
     def get_by_date(log_date):
+        if _bitmap_storage():
+            return TaskLogBitmapRepository.get_by_date(log_date)
+        if shard_router.enabled:
+            return ShardedTaskLoggerRepository.get_by_date(log_date)
         return TaskLogger.query.filter_by(date_logged=log_date).all()
 
     @staticmethod
-    def get_paginated(page=1, per_page=10, date_filter=None):
-        query = TaskLogger.query
+    def get_paginated(page=1, per_page=10, date_filter=None, newest_first=False, with_task=False,
+                      columns=None, task_columns=None, count=True):
+        """
+        ``columns``/``task_columns`` narrow the selected log and task columns
+        (sparse fieldsets); the task join is skipped unless ``with_task``.
+        Without ``count`` no COUNT(*) is run and ``total`` is None.
+        """
+        if _bitmap_storage():
+            return TaskLogBitmapRepository.get_paginated(
+                page=page,
+                per_page=per_page,
+                date_filter=date_filter,
+                newest_first=newest_first,
+                with_task=with_task,
+                task_columns=task_columns,
+                count=count
+            )
+        options = _log_load_options(columns, with_task, task_columns)
+        if shard_router.enabled:
+            return ShardedTaskLoggerRepository.get_paginated(
+                page=page,
+                per_page=per_page,
+                date_filter=date_filter,
+                newest_first=newest_first,
+                options=options,
+                count=count
+            )
+
+        query = TaskLogger.query.options(*options)
         if date_filter:
             query = query.filter_by(date_logged=date_filter)
-        return query.paginate(page=page, per_page=per_page, error_out=False)
+        if newest_first:
+            query = query.order_by(TaskLogger.date_logged.desc())
+        return query.paginate(page=page, per_page=per_page, error_out=False, count=count)
+
+    @staticmethod
+    def get_detail(log_id, with_task=True, with_user=True, columns=None, task_columns=None):
+        """
+        One log row, or None. By default its task and the task's user are
+        loaded; the flags and column lists narrow that to what the caller
+        will read.
+        """
+        with_user = with_task and with_user
+        if with_user and task_columns and "user_id" not in task_columns:
+            task_columns = [*task_columns, "user_id"]
+        if not shard_router.enabled:
+            # The user lives in this database, so it can be joined
+            options = _log_load_options(columns, with_task, task_columns, with_user)
+            return TaskLogger.query.options(*options).filter_by(id=log_id).first()
+
+        options = _log_load_options(columns, with_task, task_columns)
+        log = ShardedTaskLoggerRepository.get_by_id(log_id, options=options)
+        if log and with_user and log.task:
+            # Users live in the default database, not on the task's shard
+            set_committed_value(log.task, "user", db.session.get(User, log.task.user_id))
+        return log
 
     @staticmethod
     def exists(task_id, log_date):
-        return db.session.query(
-            TaskLogger.query.filter_by(
-                task_id=task_id,
-                date_logged=log_date
-            ).exists()
-        ).scalar()
\ No newline at end of file
+        if _bitmap_storage():
+            return TaskLogBitmapRepository.exists(task_id, log_date)
+        with shard_router.session_for_task(task_id) as session:
+            return session.query(
+                select(TaskLogger.id).where(
+                    TaskLogger.task_id == task_id,
+                    TaskLogger.date_logged == log_date
+                ).exists()
+            ).scalar()
+
+    @staticmethod
+    def get_history(task_id, start=None, end=None, after=None, limit=50):
+        """
+        One task's log rows in date order, keyset-paginated on (date_logged, id).
+
+        ``after`` is the (date_logged, id) of the last row of the previous page.
+        """
+        if _bitmap_storage():
+            return TaskLogBitmapRepository.get_history(task_id, start=start, end=end, after=after, limit=limit)
+
+        with shard_router.session_for_task(task_id) as session:
+            query = session.query(TaskLogger).filter(TaskLogger.task_id == task_id)
+            if start:
+                query = query.filter(TaskLogger.date_logged >= start)
+            if end:
+                query = query.filter(TaskLogger.date_logged <= end)
+            if after:
+                after_date, after_id = after
+                query = query.filter(or_(
+                    TaskLogger.date_logged > after_date,
+                    and_(TaskLogger.date_logged == after_date, TaskLogger.id > after_id),
+                ))
+            return query.order_by(TaskLogger.date_logged, TaskLogger.id).limit(limit).all()
+
+    @staticmethod
+    def get_status_runs(task_id, start=None, end=None, after=None, limit=50):
+        """
+        Run-length encode one task's history into (start, end, status, days)
+        segments of consecutive days with the same status, computed in SQL.
+
+        The last log of each day wins. A missing day ends the current run.
+        ``after`` is the start date of the last segment of the previous page.
+        """
+        if _bitmap_storage():
+            latest = TaskLogBitmapRepository.daily_statuses(task_id, start=start, end=end)
+        else:
+            conditions = [TaskLogger.task_id == task_id]
+            if start:
+                conditions.append(TaskLogger.date_logged >= start)
+            if end:
+                conditions.append(TaskLogger.date_logged <= end)
+
+            ranked = select(
+                TaskLogger.date_logged,
+                TaskLogger.status,
+                func.row_number().over(
+                    partition_by=TaskLogger.date_logged,
+                    order_by=TaskLogger.id.desc()
+                ).label("rn"),
+            ).where(*conditions).subquery()
+            latest = select(ranked.c.date_logged, ranked.c.status).where(ranked.c.rn == 1).subquery()
+
+        # Gaps-and-islands: day number minus the row's rank within its status
+        # is constant across a run of consecutive days with the same status.
+        daily = select(
+            latest.c.date_logged,
+            latest.c.status,
+            (
+                TaskLoggerRepository._day_number(latest.c.date_logged)
+                - func.row_number().over(partition_by=latest.c.status, order_by=latest.c.date_logged)
+            ).label("grp"),
+        ).subquery()
+
+        runs = select(
+            func.min(daily.c.date_logged).label("start"),
+            func.max(daily.c.date_logged).label("end"),
+            daily.c.status,
+            func.count().label("days"),
+        ).group_by(daily.c.status, daily.c.grp).subquery()
+
+        query = select(runs)
+        if after:
+            query = query.where(runs.c.start > after)
+        with shard_router.session_for_task(task_id) as session:
+            return session.execute(query.order_by(runs.c.start).limit(limit)).all()
+
+    @staticmethod
+    def _day_number(column):
+        if db.engine.dialect.name == "sqlite":
+            return func.julianday(column)
+        return column - literal_column("DATE '1970-01-01'", type_=Date)
@@ -1,51 +1,209 @@
 from app.models import TaskManager
+from app.repositories.task_logger_repository import TaskLoggerRepository
+from app.repositories.task_log_count_repository import TaskLogCountRepository
+from app.repositories.entity_repository import EntityRepository
+from app.repositories.task_counter_repository import TaskCounterRepository
 from app.extensions import db
+from app.utils.cache import invalidate_task_lists
+from app.utils.events import publish_task_event, task_events
+from app.repositories.sharding import shard_router
+from app.repositories.sharded_repository import ShardedTaskRepository
 from datetime import datetime
-from sqlalchemy.orm import joinedload
+from sqlalchemy import update
+from sqlalchemy.orm import load_only
 
 class TaskRepository:
     @staticmethod
-    def create(task_name, description, status, priority, user_id, created_at=None):
+    def create(task_name, description, status, priority, user_id, created_at=None, recurrence=None, next_due=None):
         task = TaskManager(
             task_name=task_name,
             description=description,
             status=status,
             priority=priority,
             created_at=created_at or datetime.utcnow(),
-            user_id=user_id
+            user_id=user_id,
+            recurrence=recurrence,
+            next_due=next_due
         )
-        db.session.add(task)
-        db.session.commit()
+        if shard_router.enabled:
+            ShardedTaskRepository.add(task)
+        else:
+            db.session.add(task)
+            db.session.commit()
+        TaskCounterRepository.apply([(None, TaskCounterRepository.state(task))])
+        invalidate_task_lists(task.user_id, task_logs=False)
+        publish_task_event("task.created", task)
         return task
 
+    @staticmethod
+    def add_many(tasks):
+        """Insert new TaskManager objects and commit the current session."""
+        if shard_router.enabled:
+            db.session.commit()  # users created alongside the tasks
+            if tasks:
+                ShardedTaskRepository.add_many(tasks)
+        else:
+            db.session.add_all(tasks)
+            db.session.commit()
+        TaskCounterRepository.apply([(None, TaskCounterRepository.state(task)) for task in tasks])
+
+    @staticmethod
+    def exists_duplicate(task_name, description, created_at, user_id):
+        with shard_router.session_for_user(user_id) as session:
+            return session.query(TaskManager.id).filter_by(
+                task_name=task_name,
+                description=description,
+                created_at=created_at,
+                user_id=user_id
+            ).first() is not None
+
     @staticmethod
     def get_by_id(task_id):
+        if shard_router.enabled:
+            return ShardedTaskRepository.get_by_id(task_id)
         return TaskManager.query.get(task_id)
 
     @staticmethod
-    def get_all_active():
-        return TaskManager.query.filter_by(status=True).all()
+    def get_all_active(columns=None):
+        """Active tasks; ``columns`` limits the selected columns (the rest stay deferred)."""
+        if shard_router.enabled:
+            return ShardedTaskRepository.get_all_active(columns)
+        query = TaskManager.query.filter_by(status=True)
+        if columns:
+            query = query.options(load_only(*[getattr(TaskManager, name) for name in columns]))
+        return query.all()
+
+    @staticmethod
+    def get_by_user(user_id, status=None, priority=None, after_id=None, limit=20):
+        """
+        Keyset-paginated task rows for one user, ordered by id.
+
+        Only the listed columns are selected so Postgres can answer from
+        ix_task_manager_user_status_priority_id with an index-only scan.
+        """
+        with shard_router.session_for_user(user_id) as session:
+            query = session.query(
+                TaskManager.id,
+                TaskManager.task_name,
+                TaskManager.status,
+                TaskManager.priority,
+                TaskManager.created_at,
+            ).filter(TaskManager.user_id == user_id)
+
+            if status is not None:
+                query = query.filter(TaskManager.status == status)
+            if priority is not None:
+                query = query.filter(TaskManager.priority == priority)
+            if after_id is not None:
+                query = query.filter(TaskManager.id > after_id)
+
+            return query.order_by(TaskManager.id).limit(limit).all()
 
     @staticmethod
     def update(task_id, **kwargs):
-        task = TaskManager.query.get(task_id)
-        if not task:
-            return None
-        for key, value in kwargs.items():
-            setattr(task, key, value)
-        db.session.commit()
+        if shard_router.enabled:
+            task, previous = ShardedTaskRepository.update(task_id, **kwargs)
+            if not task:
+                return None
+        else:
+            task = TaskManager.query.get(task_id)
+            if not task:
+                return None
+            previous = TaskCounterRepository.state(task)
+            for key, value in kwargs.items():
+                setattr(task, key, value)
+            db.session.commit()
+        TaskCounterRepository.apply([(previous, TaskCounterRepository.state(task))])
+        EntityRepository.store_tasks(task)
+        invalidate_task_lists(previous[2], task.user_id)
+        publish_task_event("task.updated", task)
         return task
 
     @staticmethod
     def soft_delete(task_id):
-        task = TaskManager.query.get(task_id)
+        if shard_router.enabled:
+            task, previous_status = ShardedTaskRepository.soft_delete(task_id)
+        else:
+            task = TaskManager.query.get(task_id)
+            if task:
+                previous_status = task.status
+                task.status = False
+                db.session.commit()
         if task:
-            task.status = False
-            db.session.commit()
+            TaskCounterRepository.apply([(
+                (previous_status, task.priority, task.user_id),
+                TaskCounterRepository.state(task),
+            )])
+            EntityRepository.store_tasks(task)
+            invalidate_task_lists(task.user_id)
+            publish_task_event("task.deleted", task)
         return task
 
     @staticmethod
-    def get_with_logs(task_id):
-        return TaskManager.query.options(
-            joinedload(TaskManager.logs)
-        ).get(task_id)
\ No newline at end of file
+    def bulk_set_status(status, user_id=None, priority=None, created_from=None, created_to=None, ids=None):
+        """
+        Set ``status`` on every task matching the filters with one
+        UPDATE ... RETURNING and log the changed tasks with one multi-row
+        insert, in a single transaction (one per shard when sharded).
+        Tasks already in ``status`` are left alone.
+
+        Returns the changed rows, with every column the entity cache keeps,
+        so their cached documents are written through rather than evicted.
+        """
+        conditions = [TaskManager.status.is_not(status)]
+        if user_id is not None:
+            conditions.append(TaskManager.user_id == user_id)
+        if priority is not None:
+            conditions.append(TaskManager.priority == priority)
+        if created_from is not None:
+            conditions.append(TaskManager.created_at >= created_from)
+        if created_to is not None:
+            conditions.append(TaskManager.created_at <= created_to)
+        if ids is not None:
+            conditions.append(TaskManager.id.in_(ids))
+
+        stmt = (
+            update(TaskManager)
+            .where(*conditions)
+            .values(status=status)
+            .returning(
+                TaskManager.id, TaskManager.task_name, TaskManager.description, TaskManager.status,
+                TaskManager.priority, TaskManager.created_at, TaskManager.user_id
+            )
+            .execution_options(synchronize_session=False)
+        )
+        today = datetime.utcnow().date()
+
+        def apply(session):
+            rows = session.execute(stmt).all()
+            TaskLoggerRepository.stage_statuses(session, [row.id for row in rows], status, today)
+            session.commit()
+            return rows
+
+        if shard_router.enabled:
+            binds = [shard_router.bind_for_user(user_id)] if user_id is not None else None
+            rows = [row for shard_rows in shard_router.run(apply, binds=binds) for row in shard_rows]
+        else:
+            rows = apply(db.session)
+
+        if rows:
+            TaskLogCountRepository.increment({today: len(rows)})
+            EntityRepository.store_tasks(*rows)
+            # Rows with a NULL status match too and are counted as flipped from
+            # "not status"; reconcile() corrects that rare case
+            TaskCounterRepository.apply([
+                ((not status, row.priority, row.user_id), (status, row.priority, row.user_id)) for row in rows
+            ])
+            invalidate_task_lists(*{row.user_id for row in rows})
+            # The filter and a count, not the changed ids: a broad filter can
+            # change any number of tasks, and every SSE client gets this event
+            event_filter = {
+                name: value for name, value in
+                (("user_id", user_id), ("priority", priority), ("created_from", created_from), ("created_to", created_to))
+                if value is not None
+            }
+            if ids is not None:
+                event_filter["id_count"] = len(ids)
+            task_events.publish("task.bulk_status", {"status": status, "count": len(rows), "filter": event_filter})
+        return rows
+
@@ -0,0 +1,117 @@
+from app.models import TaskManager
+from app.extensions import db
+from sqlalchemy import func, literal_column, cast, Float, Boolean, Date, or_, and_, text, inspect
+
+# SQLite fallback: external-content FTS5 table kept in sync by triggers.
+# Mirrors the sqlite branch of the search migration so create_all'd local
+# databases get the same index on first use.
+SQLITE_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS task_manager_fts USING fts5(
+        task_name, description, content='task_manager', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_manager_fts_ai AFTER INSERT ON task_manager BEGIN
+        INSERT INTO task_manager_fts(rowid, task_name, description)
+        VALUES (new.id, new.task_name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_manager_fts_ad AFTER DELETE ON task_manager BEGIN
+        INSERT INTO task_manager_fts(task_manager_fts, rowid, task_name, description)
+        VALUES ('delete', old.id, old.task_name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_manager_fts_au AFTER UPDATE ON task_manager BEGIN
+        INSERT INTO task_manager_fts(task_manager_fts, rowid, task_name, description)
+        VALUES ('delete', old.id, old.task_name, old.description);
+        INSERT INTO task_manager_fts(rowid, task_name, description)
+        VALUES (new.id, new.task_name, new.description);
+    END
+    """,
+]
+
+_sqlite_fts_ready = False
+
+
+class TaskSearchRepository:
+    @staticmethod
+    def search(q, after=None, limit=20):
+        """
+        Ranked full-text search over task_name and description.
+
+        Returns rows with a ``rank`` column (higher is better), ordered by
+        (rank desc, id desc). ``after`` is the (rank, id) of the last row of
+        the previous page.
+        """
+        if db.engine.dialect.name == "sqlite":
+            return TaskSearchRepository._search_sqlite(q, after, limit)
+        return TaskSearchRepository._search_postgres(q, after, limit)
+
+    @staticmethod
+    def _search_postgres(q, after, limit):
+        tsquery = func.websearch_to_tsquery("english", q)
+        vector = literal_column("task_manager.search_vector")
+        # ts_rank returns real; cast so the value round-trips exactly through the cursor
+        rank = cast(func.ts_rank(vector, tsquery), Float(precision=53))
+
+        query = db.session.query(
+            TaskManager.id,
+            TaskManager.task_name,
+            TaskManager.description,
+            TaskManager.status,
+            TaskManager.priority,
+            TaskManager.created_at,
+            rank.label("rank"),
+        ).filter(vector.op("@@")(tsquery))
+
+        if after is not None:
+            after_rank, after_id = after
+            query = query.filter(or_(
+                rank < after_rank,
+                and_(rank == after_rank, TaskManager.id < after_id),
+            ))
+
+        return query.order_by(rank.desc(), TaskManager.id.desc()).limit(limit).all()
+
+    @staticmethod
+    def _search_sqlite(q, after, limit):
+        TaskSearchRepository.ensure_sqlite_fts()
+
+        # Quote every term so user input can't inject FTS5 query syntax
+        match = " ".join('"' + term.replace('"', '""') + '"' for term in q.split())
+        params = {"match": match, "limit": limit}
+        keyset = ""
+        if after is not None:
+            keyset = "AND (rank < :after_rank OR (rank = :after_rank AND id < :after_id))"
+            params["after_rank"], params["after_id"] = after
+
+        sql = text(f"""
+            SELECT * FROM (
+                SELECT t.id, t.task_name, t.description, t.status, t.priority, t.created_at,
+                       -bm25(task_manager_fts, 10.0, 5.0) AS rank
+                FROM task_manager_fts
+                JOIN task_manager t ON t.id = task_manager_fts.rowid
+                WHERE task_manager_fts MATCH :match
+            )
+            WHERE 1 = 1 {keyset}
+            ORDER BY rank DESC, id DESC
+            LIMIT :limit
+        """).columns(status=Boolean, created_at=Date, rank=Float)
+        return db.session.execute(sql, params).all()
+
+    @staticmethod
+    def ensure_sqlite_fts():
+        """Create and backfill the FTS5 index once per process (SQLite only)."""
+        global _sqlite_fts_ready
+        if _sqlite_fts_ready:
+            return
+        with db.engine.begin() as conn:
+            created = not inspect(conn).has_table("task_manager_fts")
+            for statement in SQLITE_FTS_DDL:
+                conn.execute(text(statement))
+            if created:
+                conn.execute(text("INSERT INTO task_manager_fts(task_manager_fts) VALUES ('rebuild')"))
+        _sqlite_fts_ready = True
@@ -1,5 +1,6 @@
 from app.models import User
 from app.extensions import db
+from app.repositories.entity_repository import EntityRepository
 
 class UserRepository:
     @staticmethod
@@ -12,6 +13,7 @@ class UserRepository:
         )
         db.session.add(user)
         db.session.commit()
+        EntityRepository.store_users(user)
         return user
 
     @staticmethod
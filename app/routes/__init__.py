@@ -2,5 +2,7 @@
 
 from .task_routes import bp as task_bp
 from .user_routes import user_bp
+from .metrics_routes import metrics_bp
+from .events_routes import events_bp
 
-__all__ = ['task_bp', 'user_bp']
\ No newline at end of file
+__all__ = ['task_bp', 'user_bp', 'metrics_bp', 'events_bp']
\ No newline at end of file
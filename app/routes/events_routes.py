@@ -0,0 +1,43 @@
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
+import re
+from app.utils.events import task_events
+
+events_bp = Blueprint("events", __name__, url_prefix="/events")
+
+@events_bp.route("/tasks", methods=["GET"])
+def task_events_stream():
+    """
+    Server-Sent Events feed of task changes, so clients can stop polling
+    /tasks and /activetasks.
+
+    **Headers:**
+    - Last-Event-ID: resume after this event id (sent automatically by
+      EventSource on reconnect; `?last_event_id=` works too)
+
+    **Events:**
+    - task.created / task.updated / task.deleted:
+      `{"id": 1, "task_name": "...", "status": true, "priority": "high", "user_id": 2}`
+    - task.imported: `{"count": 120, "user_ids": [1, 2]}`
+    - tasklog.snapshot: `{"date": "2025-06-01", "logged": 350}`
+    - reset: the requested id is older than the retained history; refetch
+      state. Its id is the current tail, so reconnecting continues from there.
+
+    A `: heartbeat` comment is sent every SSE_HEARTBEAT seconds. Each open
+    stream holds a worker thread/greenlet; serve it with the gevent profile
+    (see gunicorn.conf.py).
+
+    **Response:**
+    - 200: `text/event-stream`
+    - 400: Malformed Last-Event-ID
+    """
+    last_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    if last_id and not re.fullmatch(r"\d+-\d+", last_id):
+        return jsonify({"error": "Invalid Last-Event-ID"}), 400
+    heartbeat = current_app.config["SSE_HEARTBEAT"]
+    response = Response(
+        stream_with_context(task_events.stream_events(last_id, heartbeat=heartbeat)),
+        mimetype="text/event-stream",
+    )
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"  # don't let nginx buffer the stream
+    return response
@@ -0,0 +1,90 @@
+from flask import Blueprint, jsonify
+from app.utils.cache import cache
+from app.utils.revocation import token_revocation
+from app.utils.task_metrics import task_metrics
+from app.services import task_log_stream_stats
+from celery_worker import QUEUES
+
+metrics_bp = Blueprint("metrics", __name__, url_prefix="/metrics")
+
+@metrics_bp.route("/cache", methods=["GET"])
+def cache_metrics():
+    """
+    Hit/miss counters for the two-tier cache of the worker serving the request.
+
+    **Response:**
+    - 200: Returns per-tier counters and hit ratios
+      ```json
+      {
+        "l1_hits": 950, "l1_misses": 50, "l1_hit_ratio": 0.95,
+        "l2_hits": 45, "l2_misses": 5, "l2_hit_ratio": 0.9,
+        "l1_size": 120, "l1_maxsize": 1024, "l1_ttl": 5.0
+      }
+      ```
+    """
+    return jsonify(cache.stats()), 200
+
+
+@metrics_bp.route("/task-log-stream", methods=["GET"])
+def task_log_stream_metrics():
+    """
+    Backlog of the write-behind status stream (TASK_LOG_WRITE_BEHIND).
+
+    **Response:**
+    - 200: Returns unflushed entries, entries delivered but not yet
+      acknowledged, and the age of the oldest unflushed change
+      ```json
+      {"enabled": true, "backlog": 42, "pending": 10, "lag_seconds": 3.2}
+      ```
+    """
+    return jsonify(task_log_stream_stats()), 200
+
+
+@metrics_bp.route("/revocation", methods=["GET"])
+def revocation_metrics():
+    """
+    Token revocation checks of the worker serving the request.
+
+    **Response:**
+    - 200: Returns how many checks reached Redis (Bloom filter hits) and
+      how many of those were false positives
+      ```json
+      {
+        "checks": 1000, "filter_hits": 3, "filter_hit_ratio": 0.003,
+        "revoked": 2, "false_positives": 1,
+        "filter_size_bits": 1437759, "filter_hashes": 10, "filter_capacity": 100000
+      }
+      ```
+    """
+    return jsonify(token_revocation.stats()), 200
+
+
+@metrics_bp.route("/celery", methods=["GET"])
+def celery_metrics():
+    """
+    Depth of the Celery queues and recent task durations, as recorded by
+    the workers.
+
+    **Response:**
+    - 200: Returns, per queue, the waiting messages and the age of the
+      oldest one; per task, success/failure totals and the p50/p95/max run
+      time and queue wait (seconds) over its last CELERY_METRICS_WINDOW runs
+      ```json
+      {
+        "queues": {
+          "scheduled": {"depth": 0, "oldest_seconds": null},
+          "bulk": {"depth": 3, "oldest_seconds": 412.5},
+          "interactive": {"depth": 0, "oldest_seconds": null}
+        },
+        "tasks": {
+          "app.tasks.log_task.log_tasks_daily": {
+            "queue": "scheduled", "succeeded": 30, "failed": 0, "window": 30,
+            "runtime_p50": 1.2, "runtime_p95": 2.8, "runtime_max": 3.1,
+            "wait_p50": 0.01, "wait_p95": 0.04, "wait_max": 0.2,
+            "last_finished_at": 1760832000.5
+          }
+        }
+      }
+      ```
+    """
+    return jsonify({"queues": task_metrics.queue_depths(QUEUES), "tasks": task_metrics.task_stats()}), 200
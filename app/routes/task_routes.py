@@ -1,16 +1,33 @@
-from flask import Blueprint, request, jsonify
-from sqlalchemy.orm import joinedload
+from flask import Blueprint, request, jsonify, current_app
 import csv
-import json
 import pandas as pd
-from app.models import TaskManager,User,TaskLogger
-from app.schemas import TaskCreateSchema, TaskUpdateSchema
+from app.models import TaskManager,User
+from app.schemas import TaskCreateSchema, TaskUpdateSchema, TaskBulkStatusSchema
 from pydantic import ValidationError
-from app.services import task_manager_service, tasklogger_service
+from app.services import task_manager_service, tasklogger_service, get_task_summary, import_tasks
+from app.services.import_service import IMPORT_FORMATS, import_format
+from app.repositories import TaskRepository
+from app.repositories.sharding import shard_router
+from app.repositories.task_log_count_repository import COUNT_MODES
 from app.tasks.tasklogger_tasks import log_active_tasks_to_logger
+from app.tasks.cache_tasks import warm_caches
 from app.utils.role_guard import jwt_required
-from app.extensions import db ,redis_client, limiter
-from app.utils.serializer import serialize_task
+from app.utils.idempotency import idempotent
+from app.extensions import db, limiter
+from app.utils.compression import cached_json_response
+from app.utils.cache import (
+    cache,
+    store_json,
+    tasklogs_cache_key,
+    active_tasks_cache_key,
+    invalidate_task_lists,
+    TASKLOGS_CACHE_TTL,
+    ACTIVE_TASKS_CACHE_TTL
+)
+from app.utils.cursor import encode_cursor, decode_cursor
+from app.utils.events import task_events
+from app.utils.fieldsets import FieldSet
+from app.utils.serializer import TASK_LOG_FIELDS, TASK_LOG_DETAIL_FIELDS, ACTIVE_TASK_FIELDS
 from datetime import datetime
 
 bp = Blueprint("tasks", __name__, url_prefix="/")
@@ -43,6 +60,7 @@ def ping():
 
 @bp.route("/task", methods=["POST"])
 @jwt_required(roles=["admin"])
+@idempotent()
 def create_task():
     """
     Create a new task in the TaskManager.
@@ -54,12 +72,17 @@ def create_task():
         "status": true/false,            # Optional: Task status (default is false)
         "priority": "string",           # Required: Priority level (e.g., High, Medium, Low)
         "created_at": "YYYY-MM-DD",      # Required: Date the task was created
-        "assigned_user": "string"        # Required: Username of the assigned user
+        "assigned_user": "string",       # Required: Username of the assigned user
+        "recurrence": "string"           # Optional: daily/weekly/monthly/yearly or an RRULE
     }
 
     **Authorization:**
     - Requires JWT token with "admin" role.
 
+    **Headers:**
+    - Idempotency-Key (optional): Retries with the same key replay the
+      first response instead of running again
+
     **Rate Limiting:**
     - Limited to 10 requests per minute per user.
 
@@ -74,7 +97,7 @@ def create_task():
         task = task_manager_service.create_task(validated_data.dict())
         return jsonify({"id": task.id, "task_name": task.task_name}), 201
     except ValidationError as e:
-        return jsonify({"error": e.errors()}), 400
+        return jsonify({"error": e.errors(include_context=False)}), 400
 
 @bp.route("/tasks", methods=["GET"])
 @limiter.limit("60/minute")
@@ -86,46 +109,115 @@ def get_tasks():
     - date (optional): Filter by specific date (YYYY-MM-DD)
     - page (optional): Page number for pagination
     - per_page (optional): Number of items per page
+    - fields (optional): Comma-separated subset of id, task_id, date_logged,
+      status, task, task.task_name, task.description. The task join is
+      skipped when no task field is requested.
+    - count (optional): How `total` is computed: exact, cached,
+      approximate or none (no total, `pages` is null too). Defaults to
+      TASKLOG_COUNT_MODE; the mode used is returned as `count_mode`.
 
     Returns:
         Paginated list of tasks (optionally filtered by date), or all tasks for the specified date.
+        400 for an unknown field or count mode.
     """
     page = int(request.args.get("page", 1))
     per_page = int(request.args.get("per_page", 10))
     date = request.args.get("date")
-
-    cache_key = f"tasklogs:{date}:{page}:{per_page}"
-    cached_data = redis_client.get(cache_key)
+    try:
+        fields = FieldSet.parse(request.args.get("fields"), TASK_LOG_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    count_mode = request.args.get("count") or current_app.config["TASKLOG_COUNT_MODE"]
+    if count_mode not in COUNT_MODES:
+        return jsonify({"error": f"Invalid count mode. Use one of: {', '.join(COUNT_MODES)}"}), 400
+
+    cache_key = tasklogs_cache_key(
+        date, page, per_page, fields.key,
+        count="" if count_mode == current_app.config["TASKLOG_COUNT_MODE"] else count_mode
+    )
+    cached_data = cache.get(cache_key)
 
     if cached_data:
-        return jsonify(json.loads(cached_data)), 200
-
-    query = db.session.query(TaskLogger).options(joinedload(TaskLogger.task))
+        return cached_json_response(cache_key, cached_data, TASKLOGS_CACHE_TTL)
 
+    query_date = None
     if date:
         try:
             query_date = datetime.strptime(date, "%Y-%m-%d").date()
-            query = query.filter(TaskLogger.date_logged == query_date)
         except ValueError:
             return jsonify({"error": "Invalid date format. Use YYYY-MM-DD"}), 400
 
-    paginated_logs = query.order_by(TaskLogger.date_logged.desc()).paginate(
-        page=page, per_page=per_page, error_out=False
+    result = tasklogger_service.get_task_logs_page(
+        page=page, per_page=per_page, date_filter=query_date,
+        fields=None if fields.is_full else fields, count_mode=count_mode
     )
+    body = store_json(cache_key, TASKLOGS_CACHE_TTL, result)
 
-    serialized = [serialize_task(log) for log in paginated_logs.items]
+    return cached_json_response(cache_key, body, TASKLOGS_CACHE_TTL)
 
-    result = {
-        "tasks": serialized,
-        "total": paginated_logs.total,
-        "pages": paginated_logs.pages,
-        "current_page": paginated_logs.page,
-    }
 
-    redis_client.setex(cache_key, 60, json.dumps(result))  # Cache for 1 minute
 
-    return jsonify(result), 200
+@bp.route("/tasks/search", methods=["GET"])
+@limiter.limit("60/minute")
+def search_tasks():
+    """
+    Full-text search over task names and descriptions.
+
+    Uses the `search_vector` GIN index on Postgres and an FTS5 table on SQLite.
+    Results are ranked (task_name matches weigh more than description matches).
+
+    **Query Parameters:**
+    - q (required): Search terms
+    - limit (optional): Page size, default 20, max 100
+    - cursor (optional): `next_cursor` from the previous page
+
+    **Response:**
+    - 200: Returns ranked matches
+      ```json
+      {
+        "tasks": [
+          {"id": 1, "task_name": "Deploy API", "description": "...", "status": true,
+           "priority": "high", "created_at": "2025-04-01", "rank": 0.0759}
+        ],
+        "next_cursor": "WzAuMDc1OSwxXQ"
+      }
+      ```
+    - 400: Missing query or invalid cursor
+    - 501: Tasks are sharded (SHARD_DATABASE_URLS)
+    """
+    q = (request.args.get("q") or "").strip()
+    if not q:
+        return jsonify({"error": "Query parameter 'q' is required"}), 400
+    if shard_router.enabled:
+        # Ranks are per-database statistics and can't be merged across shards
+        return jsonify({"error": "Search is not available with SHARD_DATABASE_URLS"}), 501
+
+    try:
+        limit = min(max(int(request.args.get("limit", 20)), 1), 100)
+        cursor = request.args.get("cursor")
+        after = tuple(decode_cursor(cursor)) if cursor else None
+        if after is not None and len(after) != 2:
+            raise ValueError("Invalid cursor")
+    except ValueError:
+        return jsonify({"error": "Invalid limit or cursor"}), 400
 
+    rows = task_manager_service.search_tasks(q, after=after, limit=limit)
+
+    return jsonify({
+        "tasks": [
+            {
+                "id": row.id,
+                "task_name": row.task_name,
+                "description": row.description,
+                "status": row.status,
+                "priority": row.priority,
+                "created_at": row.created_at.isoformat() if row.created_at else None,
+                "rank": row.rank,
+            }
+            for row in rows
+        ],
+        "next_cursor": encode_cursor([rows[-1].rank, rows[-1].id]) if len(rows) == limit else None,
+    }), 200
 
 
 @bp.route("/tasklogger/<int:log_id>", methods=["GET"])
@@ -137,6 +229,11 @@ def get_logged_task(log_id):
     **Parameters:**
     - log_id: TaskLogger ID (required)
 
+    **Query Parameters:**
+    - fields (optional): Comma-separated subset of log_id, date_logged,
+      status, task and task.<field>, e.g. `fields=log_id,status` (no joins)
+      or `fields=status,task.task_name` (no user join)
+
     **Response:**
     - 200: Returns task log details
       ```json
@@ -154,32 +251,23 @@ def get_logged_task(log_id):
         }
       }
       ```
+    - 400: Unknown field
     - 404: Task log not found
       ```json
       {"message": "Task log not found"}
       ```
     """
-    log = TaskLogger.query.options(
-        joinedload(TaskLogger.task).joinedload(TaskManager.user)
-    ).filter_by(id=log_id).first()
+    try:
+        fields = FieldSet.parse(request.args.get("fields"), TASK_LOG_DETAIL_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    log = tasklogger_service.get_task_log_detail(log_id, fields=None if fields.is_full else fields)
 
     if not log:
         return jsonify({"message": "Task log not found"}), 404
 
-    task = log.task
-    return jsonify({
-        "log_id": log.id,
-        "date_logged": log.date_logged.strftime("%Y-%m-%d"),
-        "status": log.status,
-        "task": {
-            "id": task.id,
-            "task_name": task.task_name,
-            "description": task.description,
-            "priority": task.priority,
-            "created_at": task.created_at.strftime("%Y-%m-%d") if task.created_at else None,
-            "assigned_user": task.user.username if task.user else None
-        }
-    }), 200
+    return jsonify(log), 200
 
 @bp.route("/task/<int:task_id>", methods=["PUT"])
 @jwt_required(roles=["admin"])
@@ -200,7 +288,8 @@ def update_task(task_id):
         "description": "string (optional)",
         "status": "boolean (optional)",
         "priority": "string (optional, enum: low/medium/high)",
-        "assigned_user": "string (optional)"
+        "assigned_user": "string (optional)",
+        "recurrence": "string (optional, daily/weekly/monthly/yearly or RRULE; null removes it)"
     }
     ```
 
@@ -222,7 +311,7 @@ def update_task(task_id):
         validated_data = TaskUpdateSchema.model_validate(data)
         update_data = validated_data.model_dump(exclude_unset=True)
     except ValidationError as e:
-        return jsonify({"error": e.errors()}), 400
+        return jsonify({"error": e.errors(include_context=False)}), 400
 
     task = task_manager_service.update_task(task_id, update_data)
     if not task:
@@ -251,32 +340,198 @@ def delete_task(task_id):
     task = task_manager_service.delete_task(task_id)
     if not task:
         return {"message": "Task not found"}, 404
-    
-    # Soft delete by marking status as False
-    task.status = False
-    db.session.commit()
     return jsonify({
         "message": "Task soft-deleted successfully",
         "task_id": task.id,
         "status": task.status
     })
 
+@bp.route("/tasks/bulk-status", methods=["POST"])
+@jwt_required(roles=["admin"])
+def bulk_update_status():
+    """
+    Set the status of every task matching a filter.
+
+    Runs as one `UPDATE ... RETURNING` plus one multi-row task_logger insert
+    in a single transaction; tasks already in the target status are left
+    alone and are not logged again.
+
+    **Authorization:**
+    - Requires JWT token with "admin" role
+
+    **Request Body (JSON):**
+    ```json
+    {
+        "status": "boolean (required)",
+        "user_id": "integer (optional)",
+        "priority": "string (optional, enum: low/medium/high)",
+        "created_from": "YYYY-MM-DD (optional, inclusive)",
+        "created_to": "YYYY-MM-DD (optional, inclusive)",
+        "ids": "array of integers (optional, max 10000)"
+    }
+    ```
+    At least one filter is required; filters are combined with AND.
+
+    **Responses:**
+    - 200: Tasks updated
+      ```json
+      {"updated": 2, "logged": 2}
+      ```
+    - 400: Validation error or no filter given
+    - 401: Unauthorized
+    - 403: Forbidden
+    """
+    try:
+        validated_data = TaskBulkStatusSchema.model_validate(request.get_json(silent=True) or {})
+    except ValidationError as e:
+        return jsonify({"error": e.errors(include_context=False)}), 400
+
+    filters = validated_data.model_dump(exclude={"status"})
+    result = task_manager_service.bulk_update_status(validated_data.status, **filters)
+    return jsonify(result)
+
+@bp.route("/task/<int:task_id>/history", methods=["GET"])
+@limiter.limit("60/minute")
+def get_task_history(task_id):
+    """
+    Paginated status history for one task.
+
+    **Parameters:**
+    - task_id: Task ID (required)
+
+    **Query Parameters:**
+    - start, end (optional): Inclusive date range (YYYY-MM-DD)
+    - compact (optional): true to collapse consecutive days with the same
+      status into segments
+    - limit (optional): Page size, default 50, max 500
+    - cursor (optional): `next_cursor` from the previous page
+
+    **Response:**
+    - 200: Returns log rows, or segments when compact=true
+      ```json
+      {"task_id": 1, "history": [{"id": 10, "date_logged": "2025-04-01", "status": true}], "next_cursor": null}
+      ```
+      ```json
+      {"task_id": 1, "segments": [{"start": "2025-01-01", "end": "2025-03-31", "status": true, "days": 90}], "next_cursor": null}
+      ```
+    - 400: Invalid date, limit or cursor
+    - 404: Task not found
+      ```json
+      {"message": "Task not found"}
+      ```
+    """
+    compact = request.args.get("compact", "false").lower() == "true"
+
+    try:
+        start = request.args.get("start")
+        end = request.args.get("end")
+        start = datetime.strptime(start, "%Y-%m-%d").date() if start else None
+        end = datetime.strptime(end, "%Y-%m-%d").date() if end else None
+        limit = min(max(int(request.args.get("limit", 50)), 1), 500)
+        cursor = request.args.get("cursor")
+        after = decode_cursor(cursor) if cursor else None
+        if after is not None:
+            after_date = datetime.strptime(after[0], "%Y-%m-%d").date()
+            # Bitmap storage has no log ids, so the id part may be null
+            after = after_date if compact else (after_date, after[1] and int(after[1]))
+    except (ValueError, TypeError, IndexError):
+        return jsonify({"error": "Invalid date, limit or cursor. Dates use YYYY-MM-DD"}), 400
+
+    if not task_manager_service.get_task(task_id):
+        return {"message": "Task not found"}, 404
+
+    rows = task_manager_service.get_task_history(
+        task_id, start=start, end=end, after=after, limit=limit, compact=compact
+    )
+    has_more = len(rows) == limit
+
+    if compact:
+        return jsonify({
+            "task_id": task_id,
+            "segments": [
+                {
+                    "start": row.start.isoformat(),
+                    "end": row.end.isoformat(),
+                    "status": row.status,
+                    "days": row.days,
+                }
+                for row in rows
+            ],
+            "next_cursor": encode_cursor([rows[-1].start.isoformat()]) if has_more else None,
+        }), 200
+
+    return jsonify({
+        "task_id": task_id,
+        "history": [
+            {"id": log.id, "date_logged": log.date_logged.isoformat(), "status": log.status}
+            for log in rows
+        ],
+        "next_cursor": encode_cursor([rows[-1].date_logged.isoformat(), rows[-1].id]) if has_more else None,
+    }), 200
+
+@bp.route("/summary", methods=["GET"])
+@limiter.limit("60/minute")
+def task_summary():
+    """
+    Live task counts for dashboards, read from counters in Redis rather
+    than counted from the table.
+
+    **Query Parameters:**
+    - user_id (optional): Only this user's counts under by_user
+
+    **Response:**
+    - 200: Counts by status, priority and user
+      ```json
+      {
+        "total": 120, "active": 100, "inactive": 20,
+        "by_priority": {"high": {"active": 40, "inactive": 5}, ...},
+        "by_user": {"1": {"active": 12, "inactive": 3}, "none": {...}, ...},
+        "reconciled_at": "2025-04-01T10:00:00Z"
+      }
+      ```
+    - 400: Invalid user_id
+    """
+    user_id = request.args.get("user_id")
+    if user_id is not None:
+        try:
+            user_id = int(user_id)
+        except ValueError:
+            return jsonify({"error": "user_id must be an integer"}), 400
+    return jsonify(get_task_summary(user_id)), 200
+
 @bp.route("/activetasks", methods=["GET"])
 def get_all_tasks():
     """
     Get all active tasks (status=True).
 
+    **Query Parameters:**
+    - fields (optional): Comma-separated subset of id, task_name
+
     **Response:**
     - 200: Returns list of active tasks
       ```json
       [{"id": 1, "task_name": "Task 1"}, ...]
       ```
+    - 400: Unknown field
     """
-    tasks = task_manager_service.get_all_tasks()
-    return jsonify([{"id": t.id, "task_name": t.task_name} for t in tasks])
+    try:
+        fields = FieldSet.parse(request.args.get("fields"), ACTIVE_TASK_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    cache_key = active_tasks_cache_key(fields.key)
+    cached_data = cache.get(cache_key)
+
+    if cached_data:
+        return cached_json_response(cache_key, cached_data, ACTIVE_TASKS_CACHE_TTL)
+
+    body = store_json(cache_key, ACTIVE_TASKS_CACHE_TTL, task_manager_service.list_active_tasks(fields))
+
+    return cached_json_response(cache_key, body, ACTIVE_TASKS_CACHE_TTL)
 
 @bp.route("/upload-csv", methods=["POST"])
 @limiter.limit("10/hour")
+@idempotent()
 def upload_csv():
     """
     Bulk upload tasks from a CSV file with duplicate detection.
@@ -285,6 +540,10 @@ def upload_csv():
     - Content-Type: multipart/form-data
     - Form-data field named 'file' containing a .csv file
 
+    **Headers:**
+    - Idempotency-Key (optional): Retries with the same key replay the
+      first response instead of running again
+
     **CSV Format:**
     ```
     task_name,description,status,priority,created_at,assigned_user
@@ -330,6 +589,9 @@ def upload_csv():
 
     success_count = 0
     skipped_count = 0
+    touched_user_ids = set()
+    new_tasks = []
+    seen = set()
 
     for row in reader:
         try:
@@ -352,16 +614,11 @@ def upload_csv():
             created_at = datetime.strptime(row["created_at"].strip(), "%m/%d/%Y").date()
 
             # Check if task already exists for the same user on the same date
-            existing_task = TaskManager.query.filter_by(
-                task_name=task_name,
-                description=description,
-                created_at=created_at,
-                user_id=user.id
-            ).first()
-
-            if existing_task:
+            key = (task_name, description, created_at, user.id)
+            if key in seen or TaskRepository.exists_duplicate(*key):
                 skipped_count += 1
                 continue  # Skip duplicate
+            seen.add(key)
 
             task = TaskManager(
                 task_name=task_name,
@@ -372,14 +629,19 @@ def upload_csv():
                 user_id=user.id
             )
 
-            db.session.add(task)
+            new_tasks.append(task)
+            touched_user_ids.add(user.id)
             success_count += 1
 
         except Exception as e:
             print(f"Error processing row: {row} — {e}")
             continue
 
-    db.session.commit()
+    TaskRepository.add_many(new_tasks)
+    if touched_user_ids:
+        invalidate_task_lists(*touched_user_ids, task_logs=False)
+        task_events.publish("task.imported", {"count": success_count, "user_ids": sorted(touched_user_ids)})
+        warm_caches.delay()
 
     return jsonify({
         "message": f"{success_count} tasks uploaded successfully",
@@ -387,11 +649,72 @@ def upload_csv():
     })
 
 
+@bp.route("/import", methods=["POST"])
+@limiter.limit("10/hour")
+@idempotent()
+def import_tasks_file():
+    """
+    Bulk import tasks from a CSV, NDJSON or Parquet file in columnar batches.
+
+    **Request:**
+    - Content-Type: multipart/form-data
+    - Form-data field named 'file' (.csv, .ndjson/.jsonl or .parquet)
+
+    **Headers:**
+    - Idempotency-Key (optional): Retries with the same key replay the
+      first response instead of running again
+
+    **Query Parameters:**
+    - format (optional): csv, ndjson or parquet; default from the file extension
+
+    **Columns:** task_name, description, status, priority, created_at,
+    assigned_user as in the CSV upload. created_at may be MM/DD/YYYY or
+    YYYY-MM-DD; a missing status means active.
+
+    **Behavior:**
+    - Creates missing users like the CSV upload.
+    - Rejects invalid rows (reported in `errors`, first 20) and skips
+      duplicates of tasks in the file or the database.
+
+    **Responses:**
+    - 200: File imported
+      ```json
+      {
+        "rows": 1000000, "imported": 998000, "skipped": 1500, "rejected": 500,
+        "errors": [{"row": 12, "error": "created_at is not a valid date"}],
+        "seconds": 41.2, "rows_per_second": 24272
+      }
+      ```
+    - 400: Missing file, unsupported format, missing columns or unreadable file
+    """
+    if 'file' not in request.files:
+        return jsonify({"error": "File is required"}), 400
+
+    file = request.files['file']
+    fmt = request.args.get("format") or import_format(file.filename)
+    if fmt not in IMPORT_FORMATS:
+        return jsonify({"error": f"Unsupported format. Use one of: {', '.join(IMPORT_FORMATS)}"}), 400
+
+    try:
+        result = import_tasks(file.stream, fmt)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if result["imported"]:
+        warm_caches.delay()
+    return jsonify(result), 200
+
+
 @bp.route("/log-tasks", methods=["POST"])
+@idempotent()
 def trigger_task_logging():
     """
     Manually trigger the daily task logging process.
 
+    **Headers:**
+    - Idempotency-Key (optional): Retries with the same key replay the
+      first response instead of running again
+
     **Response:**
     - 202: Logging process initiated
       ```json
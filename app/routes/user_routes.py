@@ -1,7 +1,13 @@
 from flask import Blueprint, request, jsonify
 from app.extensions import db, limiter
-from app.utils.jwt_utils import generate_jwt
+from app.utils.jwt_utils import generate_jwt, decode_jwt
+from app.utils.revocation import token_revocation
+from app.utils.role_guard import jwt_required
+from app.utils.cache import cache, store_json, user_tasks_cache_key, USER_TASKS_CACHE_TTL
+from app.utils.compression import cached_json_response
 from app.models import User
+from app.repositories import UserRepository
+from app.services import task_manager_service
 
 user_bp = Blueprint("users", __name__, url_prefix="/")
 
@@ -88,3 +94,150 @@ def login():
     
     token = generate_jwt(user.id, user.username, user.role)
     return jsonify({"token": token})
+
+@user_bp.route("/logout", methods=["POST"])
+@jwt_required()
+def logout():
+    """
+    Revoke the token sent with this request.
+
+    The token's `jti` is kept in Redis until the token would have expired,
+    so later requests with it get 401 `{"error": "Token revoked"}`.
+
+    **Authorization:**
+    - Requires a JWT token (any role)
+
+    **Responses:**
+    - 200: Token revoked
+      ```json
+      {"message": "Logged out"}
+      ```
+    - 400: Token issued without a `jti` (it stays valid until it expires)
+    - 401: Missing, invalid, expired or already revoked token
+    """
+    jti = request.user.get("jti")
+    if not jti:
+        return jsonify({"error": "Token has no jti and cannot be revoked"}), 400
+    token_revocation.revoke(jti, request.user["exp"])
+    return jsonify({"message": "Logged out"}), 200
+
+@user_bp.route("/tokens/revoke", methods=["POST"])
+@jwt_required(roles=["admin"])
+def revoke_token():
+    """
+    Revoke another token, e.g. one that leaked.
+
+    **Authorization:**
+    - Requires JWT token with "admin" role
+
+    **Request Body (JSON):**
+    ```json
+    {"token": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9..."}
+    ```
+
+    **Responses:**
+    - 200: Token revoked
+      ```json
+      {"message": "Token revoked", "jti": "9f1c...", "expires_at": 1767225600}
+      ```
+    - 400: Missing, invalid or expired token, or a token without a `jti`
+    - 401: Unauthorized
+    - 403: Forbidden
+    """
+    data = request.get_json(silent=True) or {}
+    decoded = decode_jwt(data.get("token") or "")
+    if "error" in decoded:
+        return jsonify(decoded), 400
+    if not decoded.get("jti"):
+        return jsonify({"error": "Token has no jti and cannot be revoked"}), 400
+    token_revocation.revoke(decoded["jti"], decoded["exp"])
+    return jsonify({"message": "Token revoked", "jti": decoded["jti"], "expires_at": decoded["exp"]}), 200
+
+@user_bp.route("/users/<int:user_id>/tasks", methods=["GET"])
+@limiter.limit("60/minute")
+def get_user_tasks(user_id):
+    """
+    List one user's tasks with optional filters and keyset pagination.
+
+    **Parameters:**
+    - user_id: User ID (required)
+
+    **Query Parameters:**
+    - status (optional): true/false
+    - priority (optional): low/medium/high
+    - after_id (optional): Return tasks with id greater than this (use `next_cursor`)
+    - limit (optional): Page size, default 20, max 100
+
+    **Response:**
+    - 200: Returns a page of tasks
+      ```json
+      {
+        "tasks": [
+          {"id": 1, "task_name": "Sample", "status": true, "priority": "high", "created_at": "2025-04-01"}
+        ],
+        "next_cursor": 1
+      }
+      ```
+    - 400: Invalid filter value
+    - 404: User not found
+      ```json
+      {"message": "User not found"}
+      ```
+    """
+    status = request.args.get("status")
+    priority = request.args.get("priority")
+
+    if status is not None:
+        if status.lower() not in ("true", "false"):
+            return jsonify({"error": "status must be 'true' or 'false'"}), 400
+        status = status.lower() == "true"
+
+    if priority is not None:
+        priority = priority.lower()
+        if priority not in ("low", "medium", "high"):
+            return jsonify({"error": "Priority must be 'low', 'medium', or 'high'"}), 400
+
+    after_id = request.args.get("after_id")
+    try:
+        after_id = int(after_id) if after_id is not None else None
+    except ValueError:
+        return jsonify({"error": "after_id must be an integer"}), 400
+    try:
+        limit = min(max(int(request.args.get("limit", 20)), 1), 100)
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+
+    cache_key = user_tasks_cache_key(user_id, status, priority, after_id, limit)
+    cached_data = cache.get(cache_key)
+
+    if cached_data:
+        return cached_json_response(cache_key, cached_data, USER_TASKS_CACHE_TTL)
+
+    if not UserRepository.get_by_id(user_id):
+        return jsonify({"message": "User not found"}), 404
+
+    rows = task_manager_service.get_user_tasks(
+        user_id,
+        status=status,
+        priority=priority,
+        after_id=after_id,
+        limit=limit
+    )
+
+    result = {
+        "tasks": [
+            {
+                "id": row.id,
+                "task_name": row.task_name,
+                "status": row.status,
+                "priority": row.priority,
+                "created_at": row.created_at.isoformat() if row.created_at else None,
+            }
+            for row in rows
+        ],
+        "next_cursor": rows[-1].id if len(rows) == limit else None,
+    }
+
+    body = store_json(cache_key, USER_TASKS_CACHE_TTL, result)
+
+    return cached_json_response(cache_key, body, USER_TASKS_CACHE_TTL)
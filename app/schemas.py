@@ -1,6 +1,7 @@
-from pydantic import BaseModel, field_validator , ConfigDict
-from typing import Optional
+from pydantic import BaseModel, field_validator , model_validator, ConfigDict, Field
+from typing import Optional, List
 from datetime import date
+from app.utils.recurrence import normalize_rule
 
 class TaskCreateSchema(BaseModel):
     task_name: str
@@ -9,6 +10,7 @@ class TaskCreateSchema(BaseModel):
     priority: str
     created_at: date
     assigned_user: str
+    recurrence: Optional[str] = None
 
     @field_validator('priority')
     def validate_priority(cls, value):
@@ -16,6 +18,11 @@ class TaskCreateSchema(BaseModel):
             raise ValueError("Priority must be 'low', 'medium', or 'high'")
         return value.lower()
 
+    @field_validator('recurrence')
+    def validate_recurrence(cls, value):
+        normalize_rule(value, date.today())
+        return value
+
 
 class TaskUpdateSchema(BaseModel):
     task_name: Optional[str] = None
@@ -24,6 +31,7 @@ class TaskUpdateSchema(BaseModel):
     priority: Optional[str] = None
     created_at: Optional[date] = None
     assigned_user: Optional[str] = None
+    recurrence: Optional[str] = None
 
     model_config = ConfigDict(extra="allow")
 
@@ -33,3 +41,31 @@ class TaskUpdateSchema(BaseModel):
             raise ValueError("Priority must be 'low', 'medium', or 'high'")
         return v.lower() if v else v
 
+    @field_validator("recurrence")
+    def validate_recurrence(cls, v):
+        normalize_rule(v, date.today())
+        return v
+
+
+class TaskBulkStatusSchema(BaseModel):
+    status: bool
+    user_id: Optional[int] = None
+    priority: Optional[str] = None
+    created_from: Optional[date] = None
+    created_to: Optional[date] = None
+    ids: Optional[List[int]] = Field(default=None, min_length=1, max_length=10000)
+
+    model_config = ConfigDict(extra="forbid")
+
+    @field_validator("priority")
+    def validate_priority(cls, v):
+        if v and v.lower() not in ["low", "medium", "high"]:
+            raise ValueError("Priority must be 'low', 'medium', or 'high'")
+        return v.lower() if v else v
+
+    @model_validator(mode="after")
+    def require_filter(self):
+        # An empty filter would flip every task in the table
+        if all(getattr(self, name) is None for name in ("user_id", "priority", "created_from", "created_to", "ids")):
+            raise ValueError("At least one filter (user_id, priority, created_from, created_to, ids) is required")
+        return self
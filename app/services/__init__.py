@@ -3,19 +3,63 @@
 from .task_manager_service import (
     create_task,
     get_all_tasks,
+    list_active_tasks,
+    get_user_tasks,
+    search_tasks,
+    get_task_history,
     update_task,
-    delete_task
+    delete_task,
+    bulk_update_status
 )
 from .tasklogger_service import (
     get_tasks_by_date,
+    get_task_logs,
+    get_task_log,
+    get_task_log_detail,
+    get_task_logs_page,
     log_daily_tasks
 )
+from .archive_service import (
+    archive_task_logs,
+    restore_task_logs
+)
+from .cache_warming_service import warm_task_caches
+from .import_service import import_tasks
+from .report_service import build_weekly_reports
+from .summary_service import (
+    get_task_summary,
+    reconcile_task_counters
+)
+from .task_log_stream_service import (
+    enqueue_status_change,
+    flush_status_changes,
+    task_log_stream_stats
+)
 
 __all__ = [
     'create_task',
     'get_all_tasks',
+    'list_active_tasks',
+    'get_user_tasks',
+    'search_tasks',
+    'get_task_history',
     'update_task',
     'delete_task',
+    'bulk_update_status',
     'get_tasks_by_date',
-    'log_daily_tasks'
+    'get_task_logs',
+    'get_task_log',
+    'get_task_log_detail',
+    'get_task_logs_page',
+    'log_daily_tasks',
+    'archive_task_logs',
+    'restore_task_logs',
+    'warm_task_caches',
+    'import_tasks',
+    'build_weekly_reports',
+    'get_task_summary',
+    'reconcile_task_counters',
+    'enqueue_status_change',
+    'flush_status_changes',
+    'task_log_stream_stats'
 ]
\ No newline at end of file
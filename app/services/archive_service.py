@@ -0,0 +1,135 @@
+from app.repositories.task_log_archive_repository import TaskLogArchiveRepository
+from app.repositories.task_log_count_repository import TaskLogCountRepository
+from app.extensions import db
+from app.repositories.sharding import shard_router
+from app.utils.cache import invalidate_task_logs
+from datetime import date, datetime, timedelta
+from flask import current_app
+import glob
+import gzip
+import json
+import os
+import time
+
+def _next_month(month):
+    return (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+def _partition_dir(month):
+    return os.path.join(
+        current_app.config["TASK_LOG_ARCHIVE_DIR"],
+        "task_logger",
+        f"year={month.year}",
+        f"month={month.month:02d}"
+    )
+
+def archive_task_logs(today=None):
+    """
+    Move task_logger rows older than the retention horizon to cold storage.
+
+    Only whole months before the horizon are archived. For each month the
+    rows are first written to a new gzip NDJSON part file, then deleted in
+    small batches that also fold them into task_log_monthly_summary.
+    """
+    if shard_router.enabled:
+        raise RuntimeError("Task log archival is not supported with SHARD_DATABASE_URLS")
+    config = current_app.config
+    today = today or date.today()
+    horizon = today - timedelta(days=config["TASK_LOG_RETENTION_DAYS"])
+    cutoff = horizon.replace(day=1)
+
+    archived = {}
+    month = TaskLogArchiveRepository.oldest_month()
+    while month and month < cutoff:
+        count = archive_month(month)
+        if count:
+            archived[month.strftime("%Y-%m")] = count
+        month = _next_month(month)
+
+    if archived:
+        TaskLogCountRepository.invalidate()
+        invalidate_task_logs()
+    return {"archived": archived, "rows": sum(archived.values())}
+
+def archive_month(month):
+    config = current_app.config
+    batch_size = config["TASK_LOG_ARCHIVE_BATCH_SIZE"]
+    start, end = month, _next_month(month)
+
+    # Rows inserted after this point (late logs for an old date) are left
+    # for the next run instead of being deleted without being archived.
+    max_id = TaskLogArchiveRepository.max_id_in_range(start, end)
+    if max_id is None:
+        return 0
+
+    _write_part(month, TaskLogArchiveRepository.iter_range(start, end, max_id, batch_size), max_id)
+
+    deleted = 0
+    while True:
+        count = TaskLogArchiveRepository.delete_batch_with_rollup(start, end, max_id, month, batch_size)
+        if not count:
+            break
+        deleted += count
+        current_app.logger.info("Archived %s task_logger rows for %s", deleted, month.strftime("%Y-%m"))
+        time.sleep(config["TASK_LOG_ARCHIVE_BATCH_PAUSE"])  # let autovacuum and other writers keep up
+    return deleted
+
+def _write_part(month, chunks, max_id):
+    """
+    Write rows to a new part file. Each run writes its own part, so rows
+    archived by an earlier, interrupted run are never overwritten.
+    """
+    directory = _partition_dir(month)
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+    path = os.path.join(directory, f"part-{stamp}-{max_id}.ndjson.gz")
+    tmp_path = path + ".tmp"
+
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        for rows in chunks:
+            for row in rows:
+                f.write(json.dumps({
+                    "id": row.id,
+                    "task_id": row.task_id,
+                    "date_logged": row.date_logged.isoformat(),
+                    "status": row.status,
+                }))
+                f.write("\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_path, path)
+    return path
+
+def restore_task_logs(month):
+    """
+    Load an archived month back into task_logger and remove its part files.
+
+    Restored rows are subtracted from the monthly summary. If they are still
+    older than the retention horizon, the next archive run moves them out again.
+    """
+    if shard_router.enabled:
+        raise RuntimeError("Task log archival is not supported with SHARD_DATABASE_URLS")
+    batch_size = current_app.config["TASK_LOG_ARCHIVE_BATCH_SIZE"]
+    parts = sorted(glob.glob(os.path.join(_partition_dir(month), "part-*.ndjson.gz")))
+
+    restored = 0
+    for path in parts:
+        batch = []
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                row = json.loads(line)
+                row["date_logged"] = date.fromisoformat(row["date_logged"])
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    restored += TaskLogArchiveRepository.restore_rows(batch, month)
+                    db.session.commit()
+                    batch = []
+        if batch:
+            restored += TaskLogArchiveRepository.restore_rows(batch, month)
+            db.session.commit()
+        os.remove(path)
+
+    if restored:
+        TaskLogCountRepository.invalidate()
+        invalidate_task_logs()
+    return restored
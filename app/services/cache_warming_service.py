@@ -0,0 +1,52 @@
+from app.services.task_manager_service import list_active_tasks
+from app.services.tasklogger_service import get_task_logs_page
+from app.utils.cache import cache, store_json, tasklogs_cache_key, active_tasks_cache_key
+from datetime import date
+from flask import current_app
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+def warm_task_caches(dates=(), pages=None, per_page=None):
+    """
+    Pre-compute the hottest list pages so the first readers after a bulk
+    write hit the cache instead of the database.
+
+    Warms /activetasks and the first ``pages`` pages of /tasks, unfiltered
+    and for each date in ``dates`` (ISO strings or date objects). Keys are
+    built exactly as the endpoints build them. Warming stops early at the
+    last page of a listing or when the time or row budget is spent.
+    """
+    config = current_app.config
+    pages = pages or config["CACHE_WARM_PAGES"]
+    per_page = per_page or config["CACHE_WARM_PER_PAGE"]
+    ttl = config["CACHE_WARM_TTL"]
+    deadline = time.monotonic() + config["CACHE_WARM_TIME_BUDGET"]
+    row_budget = config["CACHE_WARM_ROW_BUDGET"]
+
+    # Read namespace generations from Redis, not a possibly stale L1 copy
+    cache.clear_local()
+
+    active = list_active_tasks()
+    store_json(active_tasks_cache_key(), ttl, active)
+    stats = {"keys": 1, "rows": len(active), "budget_exhausted": False}
+
+    for day in [None, *dates]:
+        day = date.fromisoformat(day) if isinstance(day, str) else day
+        for page in range(1, pages + 1):
+            if time.monotonic() >= deadline or stats["rows"] >= row_budget:
+                stats["budget_exhausted"] = True
+                logger.info("Cache warming stopped at budget: %s", stats)
+                return stats
+            payload = get_task_logs_page(page=page, per_page=per_page, date_filter=day)
+            key = tasklogs_cache_key(day.isoformat() if day else None, page, per_page)
+            store_json(key, ttl, payload)
+            stats["keys"] += 1
+            stats["rows"] += len(payload["tasks"])
+            # has_next is set in every count mode; pages is None with count=none
+            if not payload["has_next"]:
+                break
+
+    logger.info("Cache warming done: %s", stats)
+    return stats
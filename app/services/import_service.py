@@ -0,0 +1,138 @@
+from app.repositories.task_import_repository import TaskImportRepository, IMPORT_COLUMNS
+from app.repositories.task_counter_repository import TaskCounterRepository
+from app.utils.cache import invalidate_task_lists
+from app.utils.events import task_events
+from flask import current_app
+import os
+import time
+import pandas as pd
+
+IMPORT_FORMATS = ("csv", "ndjson", "parquet")
+_EXTENSIONS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson", ".parquet": "parquet"}
+REQUIRED_COLUMNS = ("task_name", "priority", "created_at", "assigned_user")
+PRIORITIES = ("low", "medium", "high")
+TRUE_VALUES = ("true", "1", "yes")
+DEDUP_COLUMNS = ["task_name", "description", "created_at", "assigned_user"]
+MAX_ERRORS = 20  # rejected rows reported back, the rest are only counted
+
+def import_format(filename):
+    """Format for ``filename`` by extension, or None."""
+    return _EXTENSIONS.get(os.path.splitext(filename or "")[1].lower())
+
+def read_batches(source, fmt, batch_size):
+    """DataFrames of up to ``batch_size`` rows from a path or binary file object."""
+    if fmt == "csv":
+        yield from pd.read_csv(source, chunksize=batch_size, dtype=str, keep_default_na=False)
+    elif fmt == "ndjson":
+        with pd.read_json(source, lines=True, chunksize=batch_size, dtype=False, convert_dates=False) as reader:
+            yield from reader
+    elif fmt == "parquet":
+        import pyarrow.parquet as pq  # only needed for Parquet, like pandas' own reader
+
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=batch_size):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+def _text(frame, name):
+    if name not in frame:
+        return pd.Series("", index=frame.index, dtype="string")
+    return frame[name].astype("string").str.strip().fillna("")
+
+def _dates(column):
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return column.dt.date
+    values = column.astype("string").str.strip()
+    # The CSV upload's MM/DD/YYYY first, then ISO dates as TaskCreateSchema takes them
+    parsed = pd.to_datetime(values, format="%m/%d/%Y", errors="coerce")
+    retry = parsed.isna() & values.notna()
+    parsed[retry] = pd.to_datetime(values[retry], format="ISO8601", errors="coerce")
+    return parsed.dt.date.where(parsed.notna(), None)
+
+def normalize(frame):
+    """
+    Validate and normalize one batch column by column, the way
+    TaskCreateSchema and the CSV upload treat single rows. Returns the
+    valid rows (task_name, description, status, priority, created_at,
+    assigned_user) and a Series of rejection reasons indexed by row.
+    """
+    missing = [name for name in REQUIRED_COLUMNS if name not in frame]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    status = _text(frame, "status").str.lower()
+    rows = pd.DataFrame({
+        "task_name": _text(frame, "task_name"),
+        "description": _text(frame, "description"),
+        # No status means active, like TaskCreateSchema's default
+        "status": status.isin(TRUE_VALUES) | (status == ""),
+        "priority": _text(frame, "priority").str.lower(),
+        "created_at": _dates(frame["created_at"]),
+        "assigned_user": _text(frame, "assigned_user"),
+    })
+
+    checks = [
+        (rows["task_name"] == "", "task_name is required"),
+        (rows["task_name"].str.len() > 255, "task_name is longer than 255 characters"),
+        (rows["assigned_user"] == "", "assigned_user is required"),
+        (rows["assigned_user"].str.len() > 50, "assigned_user is longer than 50 characters"),
+        (~rows["priority"].isin(PRIORITIES), "Priority must be 'low', 'medium', or 'high'"),
+        (rows["created_at"].isna(), "created_at is not a valid date"),
+    ]
+    reasons = pd.Series(None, index=rows.index, dtype=object)
+    for failed, message in checks:
+        reasons = reasons.mask(failed & reasons.isna(), message)
+    rejected = reasons.notna()
+    return rows[~rejected], reasons[rejected]
+
+def import_tasks(source, fmt, batch_size=None):
+    """
+    Import tasks from a CSV, NDJSON or Parquet file in batches of
+    ``batch_size`` rows (default IMPORT_BATCH_SIZE).
+
+    Each batch is normalized and deduplicated in pandas, its users are
+    resolved (and created) in bulk, and its rows are bulk-loaded and
+    inserted unless the same task already exists. Batches commit one by
+    one, so a file that fails half-way keeps the batches before it.
+    """
+    batch_size = batch_size or current_app.config["IMPORT_BATCH_SIZE"]
+    result = {"rows": 0, "imported": 0, "skipped": 0, "rejected": 0, "errors": []}
+    user_ids = set()
+    started = time.perf_counter()
+
+    for batch in read_batches(source, fmt, batch_size):
+        offset = result["rows"]
+        result["rows"] += len(batch)
+        batch = batch.reset_index(drop=True)
+        rows, reasons = normalize(batch)
+
+        before = len(rows)
+        rows = rows.drop_duplicates(DEDUP_COLUMNS)
+        result["skipped"] += before - len(rows)
+
+        ids = TaskImportRepository.resolve_users(rows["assigned_user"].unique().tolist())
+        user_id = rows["assigned_user"].map(ids)
+        unresolved = user_id.isna()
+        reasons = pd.concat([reasons, pd.Series("assigned_user could not be created", index=rows.index[unresolved])])
+        rows = rows[~unresolved].assign(user_id=user_id[~unresolved].astype(int))
+
+        inserted = TaskImportRepository.insert_batch(rows[list(IMPORT_COLUMNS)])
+        TaskCounterRepository.apply([(None, state) for state in inserted])
+        user_ids.update(state[2] for state in inserted)
+
+        result["imported"] += len(inserted)
+        result["skipped"] += len(rows) - len(inserted)
+        result["rejected"] += len(reasons)
+        for index, message in reasons.sort_index().items():
+            if len(result["errors"]) >= MAX_ERRORS:
+                break
+            result["errors"].append({"row": offset + index + 1, "error": message})
+
+    if user_ids:
+        invalidate_task_lists(*user_ids, task_logs=False)
+        task_events.publish("task.imported", {"count": result["imported"], "user_ids": sorted(user_ids)})
+
+    seconds = time.perf_counter() - started
+    result["seconds"] = round(seconds, 2)
+    result["rows_per_second"] = round(result["rows"] / seconds) if seconds else None
+    return result
@@ -0,0 +1,188 @@
+from app.repositories.report_repository import ReportRepository
+from app.extensions import db
+from app.repositories.sharding import shard_router
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from flask import current_app
+from sqlalchemy import create_engine
+import json
+import multiprocessing
+import os
+import shutil
+import time
+import pandas as pd
+
+PRIORITIES = ("low", "medium", "high")
+REPORT_COLUMNS = [
+    "user_id", "username", "tasks", "days_logged", "days_active", "active_ratio",
+    *(f"active_{priority}" for priority in PRIORITIES), "first_logged", "last_logged",
+]
+
+def _last_week_start(today=None):
+    today = today or date.today()
+    return today - timedelta(days=today.weekday() + 7)
+
+def _report_dir(week_start):
+    return os.path.join(current_app.config["REPORT_DIR"], "weekly", f"week={week_start.isoformat()}")
+
+def build_weekly_reports(week_start=None, parallelism=None, shards=None, fmt=None):
+    """
+    Build the per-user activity report for the week starting ``week_start``
+    (default: last Monday-to-Sunday week).
+
+    Users are split into ``shards`` contiguous id ranges (default: four per
+    process, so a slow range doesn't leave the other processes idle) and
+    each range is aggregated and written to its own part file by a pool of
+    ``parallelism`` processes. The week's directory is replaced as a whole,
+    so readers never see a half-written report.
+    """
+    config = current_app.config
+    if config["TASK_LOG_STORAGE"] == "bitmap":
+        raise RuntimeError("Reports are not supported with TASK_LOG_STORAGE=bitmap")
+    week_start = week_start or _last_week_start()
+    if isinstance(week_start, str):
+        week_start = date.fromisoformat(week_start)
+    parallelism = parallelism or config["REPORT_PARALLELISM"]
+    shards = shards or config["REPORT_SHARDS"] or parallelism * 4
+    fmt = fmt or config["REPORT_FORMAT"]
+    if fmt not in ("csv", "parquet"):
+        raise ValueError(f"Unsupported report format: {fmt}")
+
+    # Tasks and logs live on the shard databases when sharded, users never do
+    user_url = db.engine.url.render_as_string(hide_password=False)
+    if shard_router.enabled:
+        task_urls = [db.engines[bind].url.render_as_string(hide_password=False) for bind in shard_router.binds]
+    else:
+        task_urls = [user_url]
+
+    directory = _report_dir(week_start)
+    tmp_directory = f"{directory}.tmp-{os.getpid()}"
+    os.makedirs(tmp_directory, exist_ok=True)
+    started = time.monotonic()
+
+    ranges = ReportRepository.user_id_ranges(shards)
+    # spawn: the parent holds DB/Redis connections and listener threads
+    # that must not be inherited by forked children
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=parallelism, mp_context=context) as pool:
+        futures = [
+            pool.submit(
+                build_report_shard,
+                task_urls,
+                user_url,
+                first_user_id,
+                last_user_id,
+                week_start,
+                week_start + timedelta(days=7),
+                os.path.join(tmp_directory, f"part-{index:05d}.{fmt}"),
+                fmt,
+                config["REPORT_CHUNK_SIZE"],
+            )
+            for index, (first_user_id, last_user_id) in enumerate(ranges)
+        ]
+        parts = [future.result() for future in futures]
+
+    summary = {
+        "week": week_start.isoformat(),
+        "format": fmt,
+        "parallelism": parallelism,
+        "shards": len(ranges),
+        "users": sum(part["users"] for part in parts),
+        "rows": sum(part["rows"] for part in parts),
+        "seconds": round(time.monotonic() - started, 3),
+        "parts": parts,
+    }
+    with open(os.path.join(tmp_directory, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(tmp_directory, directory)
+    current_app.logger.info(
+        "Weekly report %s: %s users from %s log rows in %ss",
+        summary["week"], summary["users"], summary["rows"], summary["seconds"],
+    )
+    return {key: value for key, value in summary.items() if key != "parts"} | {"path": directory}
+
+def build_report_shard(task_urls, user_url, first_user_id, last_user_id, start, end, path, fmt, chunk_size):
+    """
+    Aggregate one user id range and write it to ``path``. Runs in a pool
+    process with its own engines.
+
+    Logs are streamed in ``chunk_size`` row chunks (server-side cursor on
+    Postgres) and reduced to one row per (user, task, priority) per chunk,
+    so memory is bounded by the number of tasks in the range, not logs.
+    """
+    started = time.monotonic()
+    stmt = ReportRepository.activity_stmt(first_user_id, last_user_id, start, end)
+    partials, rows = [], 0
+    for url in task_urls:
+        engine = create_engine(url)
+        try:
+            with engine.connect() as conn:
+                conn = conn.execution_options(stream_results=True, max_row_buffer=chunk_size)
+                for chunk in pd.read_sql(stmt, conn, chunksize=chunk_size):
+                    rows += len(chunk)
+                    partials.append(_per_task(chunk))
+        finally:
+            engine.dispose()
+
+    engine = create_engine(user_url)
+    try:
+        with engine.connect() as conn:
+            usernames = pd.read_sql(ReportRepository.usernames_stmt(first_user_id, last_user_id), conn)
+    finally:
+        engine.dispose()
+
+    report = _per_user(partials, usernames)
+    tmp_path = path + ".tmp"
+    if fmt == "parquet":
+        report.to_parquet(tmp_path, index=False)
+    else:
+        report.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return {
+        "file": os.path.basename(path),
+        "first_user_id": first_user_id,
+        "last_user_id": last_user_id,
+        "users": len(report),
+        "rows": rows,
+        "seconds": round(time.monotonic() - started, 3),
+    }
+
+def _per_task(logs):
+    logs["status"] = logs["status"].astype(bool)
+    return logs.groupby(["user_id", "task_id", "priority"], sort=False).agg(
+        days_logged=("status", "size"),
+        days_active=("status", "sum"),
+        first_logged=("date_logged", "min"),
+        last_logged=("date_logged", "max"),
+    )
+
+def _per_user(partials, usernames):
+    if not partials:
+        return pd.DataFrame(columns=REPORT_COLUMNS)
+
+    # A task can span chunks: combine the partial aggregates first
+    per_task = pd.concat(partials).groupby(level=[0, 1, 2], sort=False).agg({
+        "days_logged": "sum",
+        "days_active": "sum",
+        "first_logged": "min",
+        "last_logged": "max",
+    }).reset_index()
+
+    report = per_task.groupby("user_id").agg(
+        tasks=("task_id", "nunique"),
+        days_logged=("days_logged", "sum"),
+        days_active=("days_active", "sum"),
+        first_logged=("first_logged", "min"),
+        last_logged=("last_logged", "max"),
+    )
+    by_priority = per_task.pivot_table(
+        index="user_id", columns="priority", values="days_active", aggfunc="sum", fill_value=0
+    ).reindex(columns=list(PRIORITIES), fill_value=0).add_prefix("active_")
+    report = report.join(by_priority).fillna({f"active_{p}": 0 for p in PRIORITIES})
+    report["active_ratio"] = (report["days_active"] / report["days_logged"]).round(4)
+    report = report.astype({f"active_{p}": "int64" for p in PRIORITIES})
+
+    report = report.reset_index().merge(usernames, on="user_id", how="left")
+    return report.sort_values("user_id")[REPORT_COLUMNS]
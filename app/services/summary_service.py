@@ -0,0 +1,40 @@
+from app.repositories.task_counter_repository import TaskCounterRepository
+from flask import current_app
+
+def _by_activity(counts):
+    # {"high:active": 3, "high:inactive": 1} -> {"high": {"active": 3, "inactive": 1}}
+    grouped = {}
+    for field, count in counts.items():
+        name, activity = field.rsplit(":", 1)
+        grouped.setdefault(name, {"active": 0, "inactive": 0})[activity] = count
+    return grouped
+
+def get_task_summary(user_id=None):
+    """
+    Active/inactive task counts overall, by priority and by user (only
+    ``user_id`` when given), from the live Redis counters.
+    """
+    by_status, by_priority, by_user, reconciled_at = TaskCounterRepository.read(user_id)
+    if reconciled_at is None:
+        # Never built (fresh Redis): count once, every later read is O(1)
+        TaskCounterRepository.reconcile()
+        by_status, by_priority, by_user, reconciled_at = TaskCounterRepository.read(user_id)
+    active, inactive = by_status.get("active", 0), by_status.get("inactive", 0)
+    return {
+        "total": active + inactive,
+        "active": active,
+        "inactive": inactive,
+        "by_priority": _by_activity(by_priority),
+        "by_user": _by_activity(by_user),
+        "reconciled_at": reconciled_at,
+    }
+
+def reconcile_task_counters():
+    """Rebuild the counters from the database; returns how far they had drifted."""
+    drift = TaskCounterRepository.reconcile()
+    if drift:
+        current_app.logger.warning("Task counters drifted in %s fields: %s", len(drift), dict(list(drift.items())[:20]))
+    return {
+        "drifted": len(drift),
+        "fields": {field: {"cached": cached, "actual": actual} for field, (cached, actual) in drift.items()},
+    }
@@ -0,0 +1,121 @@
+from app.extensions import redis_client
+from app.repositories.task_logger_repository import TaskLoggerRepository
+from datetime import date, datetime
+from flask import current_app
+from redis.exceptions import ResponseError
+import os
+import socket
+import time
+
+APPLIED_TTL = 2 * 24 * 3600  # seconds; redeliveries older than this are not expected
+
+def _entry_id(entry_id):
+    ms, _, seq = entry_id.decode().partition("-")
+    return int(ms), int(seq)
+
+def _applied_key(stream, day):
+    return f"{stream}:applied:{day.isoformat()}"
+
+def _ensure_group(stream, group):
+    try:
+        redis_client.xgroup_create(stream, group, id="0", mkstream=True)
+    except ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+def enqueue_status_change(task_id, status):
+    """Append a status change to the write-behind stream; returns the entry id."""
+    return redis_client.xadd(current_app.config["TASK_LOG_STREAM"], {
+        "task_id": task_id,
+        "status": int(bool(status)),
+        "date": datetime.utcnow().date().isoformat(),
+    })
+
+def flush_status_changes():
+    """
+    Drain the write-behind stream into task_logger.
+
+    Delivery is at-least-once: entries are acknowledged (and deleted) only
+    after the batch is committed, and entries left pending by a crashed
+    consumer are reclaimed with XAUTOCLAIM once they have been idle for
+    TASK_LOG_STREAM_CLAIM_IDLE ms. Within a batch only the newest change
+    per (task_id, day) is written; the last applied entry id per task and
+    day is remembered so a late redelivery never overwrites a newer status.
+    """
+    config = current_app.config
+    stream, group = config["TASK_LOG_STREAM"], config["TASK_LOG_STREAM_GROUP"]
+    batch_size = config["TASK_LOG_FLUSH_BATCH_SIZE"]
+    consumer = f"{socket.gethostname()}:{os.getpid()}"
+    _ensure_group(stream, group)
+
+    entries = redis_client.xautoclaim(
+        stream, group, consumer, config["TASK_LOG_STREAM_CLAIM_IDLE"], count=batch_size
+    )[1]
+    stats = {"entries": 0, "written": 0}
+    for _ in range(config["TASK_LOG_FLUSH_MAX_BATCHES"]):
+        if len(entries) < batch_size:
+            fresh = redis_client.xreadgroup(group, consumer, {stream: ">"}, count=batch_size - len(entries))
+            if fresh:
+                entries += fresh[0][1]
+        if not entries:
+            break
+        stats["entries"] += len(entries)
+        stats["written"] += _flush_batch(stream, group, entries)
+        entries = []
+    return stats
+
+def _flush_batch(stream, group, entries):
+    latest = {}
+    for entry_id, fields in entries:
+        if not fields:  # deleted while pending
+            continue
+        key = (int(fields[b"task_id"]), date.fromisoformat(fields[b"date"].decode()))
+        if key not in latest or _entry_id(entry_id) > _entry_id(latest[key][0]):
+            latest[key] = (entry_id, fields[b"status"] == b"1")
+
+    by_day = {}
+    for task_id, day in latest:
+        by_day.setdefault(day, []).append(task_id)
+    applied = {}
+    for day, task_ids in by_day.items():
+        values = redis_client.hmget(_applied_key(stream, day), task_ids)
+        applied.update({(task_id, day): value for task_id, value in zip(task_ids, values) if value})
+
+    statuses = {
+        key: status for key, (entry_id, status) in latest.items()
+        if key not in applied or _entry_id(entry_id) > _entry_id(applied[key])
+    }
+    written = TaskLoggerRepository.apply_day_statuses(statuses)
+
+    pipe = redis_client.pipeline()
+    for (task_id, day) in statuses:
+        pipe.hset(_applied_key(stream, day), task_id, latest[(task_id, day)][0])
+    for day in {day for _, day in statuses}:
+        pipe.expire(_applied_key(stream, day), APPLIED_TTL)
+    ids = [entry_id for entry_id, _ in entries]
+    pipe.xack(stream, group, *ids)
+    pipe.xdel(stream, *ids)
+    pipe.execute()
+    return written
+
+def task_log_stream_stats():
+    """
+    Backlog of the write-behind stream. Flushed entries are deleted, so the
+    stream length is the number of changes not yet in task_logger.
+    """
+    config = current_app.config
+    stream, group = config["TASK_LOG_STREAM"], config["TASK_LOG_STREAM_GROUP"]
+    stats = {
+        "enabled": config["TASK_LOG_WRITE_BEHIND"],
+        "backlog": redis_client.xlen(stream),
+        "pending": 0,
+        "lag_seconds": 0.0,
+    }
+    oldest = redis_client.xrange(stream, count=1)
+    if oldest:
+        stats["lag_seconds"] = round(max(time.time() - _entry_id(oldest[0][0])[0] / 1000, 0), 3)
+    try:
+        stats["pending"] = redis_client.xpending(stream, group)["pending"]
+    except ResponseError:  # group not created yet
+        pass
+    return stats
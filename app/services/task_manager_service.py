@@ -1,6 +1,18 @@
 from app.repositories.task_repository import TaskRepository
 from app.repositories.task_logger_repository import TaskLoggerRepository
+from app.repositories.task_search_repository import TaskSearchRepository
+from app.repositories.entity_repository import EntityRepository
+from app.services.task_log_stream_service import enqueue_status_change
+from app.utils.entity_cache import entity_cache
+from app.utils.fieldsets import FieldSet
+from app.utils.recurrence import normalize_rule, first_due
+from app.utils.serializer import ACTIVE_TASK_FIELDS, serialize_active_task
 from datetime import datetime
+from flask import current_app
+
+def _schedule(recurrence, start):
+    rule = normalize_rule(recurrence, start)
+    return {"recurrence": rule, "next_due": first_due(rule, start)}
 
 def create_task(data):
     return TaskRepository.create(
@@ -8,20 +20,55 @@ def create_task(data):
         description=data.get("description", ""),
         status=data.get("status", False),
         priority=data["priority"],
-        user_id=data["assigned_user"]
+        user_id=data["assigned_user"],
+        **_schedule(data.get("recurrence"), datetime.utcnow().date())
     )
 
 def get_all_tasks():
     return TaskRepository.get_all_active()
 
+def list_active_tasks(fields=None):
+    fields = fields or FieldSet(ACTIVE_TASK_FIELDS)
+    return [serialize_active_task(t, fields) for t in TaskRepository.get_all_active(columns=["id", *fields])]
+
+def get_user_tasks(user_id, status=None, priority=None, after_id=None, limit=20):
+    return TaskRepository.get_by_user(
+        user_id,
+        status=status,
+        priority=priority,
+        after_id=after_id,
+        limit=limit
+    )
+
+def search_tasks(q, after=None, limit=20):
+    return TaskSearchRepository.search(q, after=after, limit=limit)
+
 def get_task(task_id):
-    return TaskRepository.get_with_logs(task_id)
+    """The task, or None; a read-only copy from the entity cache when it is enabled."""
+    if entity_cache.enabled:
+        return EntityRepository.tasks([task_id]).get(task_id)
+    return TaskRepository.get_by_id(task_id)
+
+def get_task_history(task_id, start=None, end=None, after=None, limit=50, compact=False):
+    if compact:
+        return TaskLoggerRepository.get_status_runs(task_id, start=start, end=end, after=after, limit=limit)
+    return TaskLoggerRepository.get_history(task_id, start=start, end=end, after=after, limit=limit)
 
 def update_task(task_id, data):
+    if "recurrence" in data:
+        # A new rule starts counting from today
+        data = {**data, **_schedule(data["recurrence"], datetime.utcnow().date())}
     task = TaskRepository.update(task_id, **data)
-    if "status" in data:
-        TaskLoggerRepository.create(task_id, data["status"])
+    if task and "status" in data:
+        if current_app.config["TASK_LOG_WRITE_BEHIND"]:
+            enqueue_status_change(task_id, data["status"])
+        else:
+            TaskLoggerRepository.create(task_id, data["status"])
     return task
 
 def delete_task(task_id):
-    return TaskRepository.soft_delete(task_id)
\ No newline at end of file
+    return TaskRepository.soft_delete(task_id)
+
+def bulk_update_status(status, **filters):
+    rows = TaskRepository.bulk_set_status(status, **filters)
+    return {"updated": len(rows), "logged": len(rows)}
\ No newline at end of file
@@ -1,14 +1,120 @@
-from app.repositories.task_repository import TaskRepository
 from app.repositories.task_logger_repository import TaskLoggerRepository
+from app.repositories.task_log_count_repository import TaskLogCountRepository
+from app.repositories.entity_repository import EntityRepository
+from app.utils.entity_cache import entity_cache
+from app.utils.serializer import serialize_task, serialize_task_log_detail
 from datetime import date
+from flask import current_app
+import math
+
+def _log_columns(fields):
+    # The primary key is always loaded; "log_id" is the detail view's name for it
+    return ["id", *(name for name in fields if name not in ("id", "log_id", "task"))]
+
+def _task_columns(fields):
+    return ["id", *(name for name in fields.sub("task") if name not in ("id", "assigned_user"))]
 
 def get_tasks_by_date(target_date):
     return TaskLoggerRepository.get_by_date(target_date)
 
+def get_task_logs(page=1, per_page=10, date_filter=None, fields=None, count=True):
+    """
+    ``fields`` (a FieldSet) limits the selected columns and skips the task
+    join when unused. Without ``count`` the page's ``total`` is None.
+
+    With the entity cache on, the page query doesn't join tasks at all:
+    the page's tasks are attached from the cache with one MGET.
+    """
+    with_task = fields is None or "task" in fields
+    cached_tasks = with_task and entity_cache.enabled
+    columns = task_columns = None
+    if fields is not None:
+        columns, task_columns = _log_columns(fields), _task_columns(fields)
+        if cached_tasks and "task_id" not in columns:
+            columns.append("task_id")
+    paginated = TaskLoggerRepository.get_paginated(
+        page=page,
+        per_page=per_page,
+        date_filter=date_filter,
+        newest_first=True,
+        with_task=with_task and not cached_tasks,
+        columns=columns,
+        task_columns=task_columns,
+        count=count
+    )
+    if cached_tasks:
+        EntityRepository.attach_tasks(paginated.items)
+    return paginated
+
+def get_task_log(log_id, fields=None):
+    if entity_cache.enabled:
+        return EntityRepository.log_detail(
+            log_id,
+            with_task=fields is None or "task" in fields,
+            with_user=fields is None or "assigned_user" in fields.sub("task")
+        )
+    if fields is None:
+        return TaskLoggerRepository.get_detail(log_id)
+    return TaskLoggerRepository.get_detail(
+        log_id,
+        with_task="task" in fields,
+        with_user="assigned_user" in fields.sub("task"),
+        columns=_log_columns(fields),
+        task_columns=_task_columns(fields)
+    )
+
+def get_task_log_detail(log_id, fields=None):
+    log = get_task_log(log_id, fields=fields)
+    return serialize_task_log_detail(log, fields) if log else None
+
+def _has_next(page, per_page, date_filter, items):
+    # Without a total: is there a row right after this page?
+    if len(items) < per_page:
+        return False
+    probe = TaskLoggerRepository.get_paginated(
+        page=page * per_page + 1, per_page=1, date_filter=date_filter, newest_first=True,
+        columns=["id"], count=False
+    )
+    return bool(probe.items)
+
+def get_task_logs_page(page=1, per_page=10, date_filter=None, fields=None, count_mode=None):
+    """
+    One /tasks page. ``count_mode`` (default TASKLOG_COUNT_MODE) picks how
+    ``total`` is computed, see TaskLogCountRepository; "none" skips it and
+    leaves ``total``/``pages`` null. ``count_mode`` in the result is the
+    mode actually used: cached and approximate fall back to exact with the
+    bitmap storage, approximate also where there are no planner statistics.
+    """
+    mode = count_mode or current_app.config["TASKLOG_COUNT_MODE"]
+    if mode in ("cached", "approximate") and current_app.config["TASK_LOG_STORAGE"] == "bitmap":
+        mode = "exact"
+
+    paginated_logs = get_task_logs(
+        page=page, per_page=per_page, date_filter=date_filter, fields=fields, count=mode == "exact"
+    )
+    total = paginated_logs.total
+    if mode == "cached":
+        total = TaskLogCountRepository.cached(date_filter)
+    elif mode == "approximate":
+        total = TaskLogCountRepository.approximate(date_filter)
+        if total is None:
+            total, mode = TaskLogCountRepository.exact(date_filter), "exact"
+
+    if total is None:
+        pages = None
+        has_next = _has_next(page, per_page, date_filter, paginated_logs.items)
+    else:
+        pages = math.ceil(total / per_page) if per_page else 0
+        has_next = page < pages
+    return {
+        "tasks": [serialize_task(log, fields) for log in paginated_logs.items],
+        "total": total,
+        "pages": pages,
+        "current_page": paginated_logs.page,
+        "has_next": has_next,
+        "count_mode": mode,
+    }
+
 def log_daily_tasks():
     today = date.today()
-    active_tasks = TaskRepository.get_all_active()
-    
-    for task in active_tasks:
-        if not TaskLoggerRepository.exists(task.id, today):
-            TaskLoggerRepository.create(task.id, task.status)
\ No newline at end of file
+    return TaskLoggerRepository.snapshot_active(today)
@@ -1,9 +1,19 @@
 # Initialization file for the tasks module
 
-from .tasklogger_tasks import log_active_tasks_to_logger
+from .tasklogger_tasks import log_active_tasks_to_logger, flush_task_log_stream
 from .log_task import log_tasks_daily
+from .archive_tasks import archive_old_task_logs
+from .cache_tasks import warm_caches
+from .report_tasks import build_weekly_user_reports
+from .summary_tasks import reconcile_summary_counters
+from . import signals  # task duration and queue wait metrics
 
 __all__ = [
     'log_active_tasks_to_logger',
-    'log_tasks_daily'
+    'flush_task_log_stream',
+    'log_tasks_daily',
+    'archive_old_task_logs',
+    'warm_caches',
+    'build_weekly_user_reports',
+    'reconcile_summary_counters'
 ]
\ No newline at end of file
@@ -0,0 +1,6 @@
+from celery_worker import celery_app
+from app.services.archive_service import archive_task_logs
+
+@celery_app.task
+def archive_old_task_logs():
+    return archive_task_logs()
@@ -0,0 +1,6 @@
+from celery_worker import celery_app
+from app.services.cache_warming_service import warm_task_caches
+
+@celery_app.task
+def warm_caches(dates=()):
+    return warm_task_caches(dates=dates)
@@ -1,13 +1,10 @@
 from celery_worker import celery_app
-from app.repositories.task_repository import TaskRepository
-from app.repositories.task_logger_repository import TaskLoggerRepository
+from app.services.tasklogger_service import log_daily_tasks
+from app.tasks.cache_tasks import warm_caches
 from datetime import date
 
 @celery_app.task
 def log_tasks_daily():
-    today = date.today()
-    active_tasks = TaskRepository.get_all_active()
-    
-    for task in active_tasks:
-        if not TaskLoggerRepository.exists(task.id, today):
-            TaskLoggerRepository.create(task.id, task.status)
\ No newline at end of file
+    count = log_daily_tasks()
+    warm_caches.delay([date.today().isoformat()])
+    return count
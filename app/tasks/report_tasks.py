@@ -0,0 +1,7 @@
+from celery_worker import celery_app
+from app.services.report_service import build_weekly_reports
+
+@celery_app.task
+def build_weekly_user_reports(week_start=None, parallelism=None):
+    """``week_start`` as YYYY-MM-DD (default: last week); ``parallelism`` overrides REPORT_PARALLELISM."""
+    return build_weekly_reports(week_start=week_start, parallelism=parallelism)
@@ -0,0 +1,44 @@
+from celery.signals import before_task_publish, task_prerun, task_postrun
+from app.utils.task_metrics import task_metrics
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# task id -> perf_counter at task_prerun, per worker process
+_started = {}
+
+
+@before_task_publish.connect
+def stamp_published_at(headers=None, **kwargs):
+    # Wall clock, so the worker can tell how long the message sat in the queue
+    if headers is not None:
+        headers.setdefault("published_at", time.time())
+
+
+@task_prerun.connect
+def start_timer(task_id=None, **kwargs):
+    _started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def record_task_metrics(task_id=None, task=None, state=None, **kwargs):
+    started = _started.pop(task_id, None)
+    if started is None or task is None:
+        return
+    runtime = time.perf_counter() - started
+    request = task.request
+    published_at = getattr(request, "published_at", None)
+    # Time from publish until the task started; eager calls have no stamp
+    wait = max(time.time() - runtime - published_at, 0.0) if published_at else None
+    try:
+        task_metrics.record(
+            task.name,
+            (request.delivery_info or {}).get("routing_key"),
+            round(runtime, 4),
+            round(wait, 4) if wait is not None else None,
+            state == "FAILURE",
+        )
+    except Exception:
+        # Metrics must never fail the task
+        logger.exception("Could not record metrics for task %s", task.name)
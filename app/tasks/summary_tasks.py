@@ -0,0 +1,6 @@
+from celery_worker import celery_app
+from app.services.summary_service import reconcile_task_counters
+
+@celery_app.task
+def reconcile_summary_counters():
+    return reconcile_task_counters()
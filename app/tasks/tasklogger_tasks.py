@@ -1,13 +1,15 @@
 from celery_worker import celery_app
-from app.repositories.task_repository import TaskRepository
-from app.repositories.task_logger_repository import TaskLoggerRepository
-from datetime import datetime
+from app.services.tasklogger_service import log_daily_tasks
+from app.services.task_log_stream_service import flush_status_changes
+from app.tasks.cache_tasks import warm_caches
+from datetime import date
 
 @celery_app.task
 def log_active_tasks_to_logger():
-    today = datetime.now().date()
-    active_tasks = TaskRepository.get_all_active()
-    
-    for task in active_tasks:
-        if not TaskLoggerRepository.exists(task.id, today):
-            TaskLoggerRepository.create(task.id, task.status)
\ No newline at end of file
+    count = log_daily_tasks()
+    warm_caches.delay([date.today().isoformat()])
+    return count
+
+@celery_app.task
+def flush_task_log_stream():
+    return flush_status_changes()
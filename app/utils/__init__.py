@@ -5,11 +5,23 @@ from .jwt_utils import (
     decode_jwt
 )
 from .role_guard import jwt_required
-from .serializer import serialize_task
+from .serializer import serialize_task, serialize_task_log_detail, serialize_active_task
+from .fieldsets import FieldSet
+from .compression import (
+    negotiate_encoding,
+    cached_json_response,
+    init_compression
+)
 
 __all__ = [
     'generate_jwt',
     'decode_jwt',
     'jwt_required',
-    'serialize_task'
+    'serialize_task',
+    'serialize_task_log_detail',
+    'serialize_active_task',
+    'FieldSet',
+    'negotiate_encoding',
+    'cached_json_response',
+    'init_compression'
 ]
\ No newline at end of file
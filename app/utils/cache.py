@@ -0,0 +1,225 @@
+from app.extensions import redis_client, redis_listener_client
+from collections import OrderedDict
+from flask import current_app
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+TASKLOGS_CACHE_TTL = 60  # seconds
+ACTIVE_TASKS_CACHE_TTL = 60  # seconds
+USER_TASKS_CACHE_TTL = 300  # seconds
+
+
+class TwoTierCache:
+    """
+    In-process TTL/LRU cache (L1) in front of Redis (L2).
+
+    L1 entries live at most ``l1_ttl`` seconds, which bounds how stale a
+    worker can be even if an invalidation message is lost. Invalidations
+    are published on a Redis channel; every process runs one listener
+    thread that evicts matching L1 entries, subscribed through
+    ``listener_redis`` (default: ``redis``).
+    """
+
+    def __init__(self, redis, channel="cache:invalidate", l1_maxsize=1024, l1_ttl=5.0, listener_redis=None):
+        self.redis = redis
+        self.listener_redis = listener_redis or redis
+        self.channel = channel
+        self.l1_maxsize = l1_maxsize
+        self.l1_ttl = l1_ttl
+        self._l1 = OrderedDict()
+        self._lock = threading.Lock()
+        self._listener_pid = None
+        self._counters = {"l1_hits": 0, "l1_misses": 0, "l2_hits": 0, "l2_misses": 0}
+
+    def init_app(self, app):
+        self.channel = app.config["CACHE_INVALIDATION_CHANNEL"]
+        self.l1_maxsize = app.config["CACHE_L1_MAXSIZE"]
+        self.l1_ttl = app.config["CACHE_L1_TTL"]
+
+    def get(self, key):
+        self._ensure_listener()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._l1.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._l1.move_to_end(key)
+                    self._counters["l1_hits"] += 1
+                    return value
+                del self._l1[key]
+            self._counters["l1_misses"] += 1
+
+        value = self.redis.get(key)
+        with self._lock:
+            self._counters["l2_hits" if value is not None else "l2_misses"] += 1
+        if value is not None:
+            self._set_local(key, value, self.l1_ttl)
+        return value
+
+    def setex(self, key, ttl, value):
+        self.redis.setex(key, ttl, value)
+        self._set_local(key, value, min(self.l1_ttl, ttl))
+
+    def ttl(self, key):
+        return self.redis.ttl(key)
+
+    def invalidate(self, keys=(), prefixes=()):
+        """Evict keys/prefixes from L1 in every process (Redis is not touched)."""
+        message = {"keys": list(keys), "prefixes": list(prefixes)}
+        self._apply(message)
+        self.redis.publish(self.channel, json.dumps(message))
+
+    def clear_local(self):
+        with self._lock:
+            self._l1.clear()
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+            size = len(self._l1)
+        l1_total = counters["l1_hits"] + counters["l1_misses"]
+        l2_total = counters["l2_hits"] + counters["l2_misses"]
+        return {
+            **counters,
+            "l1_hit_ratio": counters["l1_hits"] / l1_total if l1_total else None,
+            "l2_hit_ratio": counters["l2_hits"] / l2_total if l2_total else None,
+            "l1_size": size,
+            "l1_maxsize": self.l1_maxsize,
+            "l1_ttl": self.l1_ttl,
+        }
+
+    def _set_local(self, key, value, ttl):
+        with self._lock:
+            self._l1[key] = (value, time.monotonic() + ttl)
+            self._l1.move_to_end(key)
+            while len(self._l1) > self.l1_maxsize:
+                self._l1.popitem(last=False)
+
+    def _apply(self, message):
+        keys = message.get("keys") or ()
+        prefixes = tuple(message.get("prefixes") or ())
+        with self._lock:
+            for key in keys:
+                self._l1.pop(key, None)
+            if prefixes:
+                for key in [k for k in self._l1 if k.startswith(prefixes)]:
+                    del self._l1[key]
+
+    def _ensure_listener(self):
+        # Started lazily and per pid so forked workers (gunicorn --preload)
+        # each get their own listener thread.
+        pid = os.getpid()
+        if self._listener_pid == pid:
+            return
+        with self._lock:
+            if self._listener_pid == pid:
+                return
+            self._listener_pid = pid
+            self._l1.clear()
+        threading.Thread(target=self._listen, name="cache-invalidation", daemon=True).start()
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self.listener_redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                # Messages may have been missed while (re)connecting
+                self.clear_local()
+                for message in pubsub.listen():
+                    self._apply(json.loads(message["data"]))
+            except Exception:
+                logger.exception("Cache invalidation listener failed; reconnecting")
+                self.clear_local()
+                time.sleep(1)
+
+
+cache = TwoTierCache(redis_client, listener_redis=redis_listener_client)
+
+
+def store_json(key, ttl, payload):
+    """Serialize ``payload`` the way the endpoints do, cache it and return the body."""
+    body = current_app.json.dumps(payload).encode("utf-8")
+    cache.setex(key, ttl, body)
+    return body
+
+
+def _generation_key(namespace):
+    return f"{namespace}:gen"
+
+
+def namespaced_key(namespace, *parts):
+    """
+    Build a cache key inside a namespace's current generation.
+
+    Bumping the generation (see invalidate_namespaces) orphans every key of
+    the namespace in O(1); orphaned keys simply expire with their TTL.
+    """
+    generation = int(cache.get(_generation_key(namespace)) or 0)
+    return ":".join(str(part) for part in (namespace, generation, *parts))
+
+
+def invalidate_namespaces(*namespaces):
+    namespaces = [namespace for namespace in dict.fromkeys(namespaces) if namespace]
+    if not namespaces:
+        return
+    pipe = redis_client.pipeline()
+    for namespace in namespaces:
+        pipe.incr(_generation_key(namespace))
+    pipe.execute()
+    cache.invalidate(
+        keys=[_generation_key(namespace) for namespace in namespaces],
+        prefixes=[f"{namespace}:" for namespace in namespaces],
+    )
+
+
+def _fields_part(fields):
+    # The full representation keeps the key it had before ?fields= existed
+    return (f"fields={fields}",) if fields else ()
+
+
+def tasklogs_cache_key(date, page, per_page, fields="", count=""):
+    """``count``: a count mode other than the configured default, if requested."""
+    count_part = (f"count={count}",) if count else ()
+    return namespaced_key("tasklogs", date, page, per_page, *_fields_part(fields), *count_part)
+
+
+def active_tasks_cache_key(fields=""):
+    return namespaced_key("activetasks", *_fields_part(fields))
+
+
+def _user_tasks_namespace(user_id):
+    return f"usertasks:{user_id}"
+
+
+def user_tasks_cache_key(user_id, status, priority, after_id, limit):
+    return namespaced_key(_user_tasks_namespace(user_id), status, priority, after_id, limit)
+
+
+def invalidate_user_tasks(*user_ids):
+    """Drop every cached task page for the given users."""
+    invalidate_namespaces(*[
+        _user_tasks_namespace(user_id) for user_id in user_ids if user_id is not None
+    ])
+
+
+def invalidate_task_logs():
+    """Drop cached /tasks pages (log rows embed task names and statuses)."""
+    invalidate_namespaces("tasklogs")
+
+
+def invalidate_task_lists(*user_ids, task_logs=True):
+    """
+    Drop every cached list a task write can affect. New tasks have no log
+    rows yet, so inserts can pass ``task_logs=False`` to keep /tasks warm.
+    """
+    invalidate_namespaces(
+        "tasklogs" if task_logs else None,
+        "activetasks",
+        *[_user_tasks_namespace(user_id) for user_id in user_ids if user_id is not None]
+    )
@@ -0,0 +1,175 @@
+import gzip
+import zlib
+from flask import request, current_app, Response
+from app.utils.cache import cache
+
+try:
+    import brotli
+except ImportError:  # optional: br is only offered when installed
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional: zstd is only offered when installed
+    zstandard = None
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "text/csv",
+    "text/plain",
+    "text/event-stream",
+}
+
+
+def available_encodings():
+    """Encodings we can produce, in server preference order."""
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+
+def negotiate_encoding(accept_encoding):
+    """
+    Pick the best content-coding for an Accept-Encoding header.
+
+    Returns None when the client accepts none of the encodings we support
+    (or only identity).
+    """
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+
+    best, best_q = None, 0.0
+    for encoding in available_encodings():
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(data, encoding, level=6):
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=level)
+    if encoding == "br":
+        return brotli.compress(data, quality=min(level, 11))
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def stream_compress(chunks, encoding, level=6):
+    """
+    Compress an iterable of byte chunks as it is produced.
+
+    Every chunk is flushed so that long-lived streams (SSE, exports) reach
+    the client as they are generated instead of sitting in a buffer.
+    """
+    if encoding == "gzip":
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31 = gzip container
+        for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+    elif encoding == "br":
+        compressor = brotli.Compressor(quality=min(level, 11))
+        for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+    elif encoding == "zstd":
+        compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        yield compressor.flush()
+    else:
+        raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def compress_response(response):
+    """after_request hook: negotiate and compress eligible responses."""
+    config = current_app.config
+    if not config["COMPRESS_ENABLED"]:
+        return response
+    if response.status_code < 200 or response.status_code in (204, 304):
+        return response
+    if request.method == "HEAD" or "Content-Encoding" in response.headers:
+        return response
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+
+    response.vary.add("Accept-Encoding")
+    encoding = negotiate_encoding(request.headers.get("Accept-Encoding"))
+    if not encoding:
+        return response
+
+    level = config["COMPRESS_LEVEL"]
+    if response.is_streamed:
+        response.response = stream_compress(response.iter_encoded(), encoding, level)
+        response.direct_passthrough = False
+        response.headers.pop("Content-Length", None)
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    if response.direct_passthrough:
+        return response
+
+    data = response.get_data()
+    if len(data) < config["COMPRESS_MIN_SIZE"]:
+        return response
+
+    response.set_data(compress(data, encoding, level))
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def cached_json_response(cache_key, body, ttl, status=200):
+    """
+    Build a JSON response for a cached payload, reusing a cached compressed
+    copy when the client negotiates one.
+
+    The compressed variant is stored next to the raw payload as
+    ``<cache_key>:<encoding>`` and expires with it, so each encoding is
+    compressed once per cache generation instead of once per request.
+    """
+    config = current_app.config
+    encoding = None
+    if config["COMPRESS_ENABLED"] and len(body) >= config["COMPRESS_MIN_SIZE"]:
+        encoding = negotiate_encoding(request.headers.get("Accept-Encoding"))
+
+    if not encoding:
+        response = Response(body, status=status, mimetype="application/json")
+        response.vary.add("Accept-Encoding")
+        return response
+
+    variant_key = f"{cache_key}:{encoding}"
+    compressed = cache.get(variant_key)
+    if compressed is None:
+        compressed = compress(body, encoding, config["COMPRESS_LEVEL"])
+        remaining = cache.ttl(cache_key)
+        cache.setex(variant_key, remaining if remaining and remaining > 0 else ttl, compressed)
+
+    response = Response(compressed, status=status, mimetype="application/json")
+    response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def init_compression(app):
+    app.after_request(compress_response)
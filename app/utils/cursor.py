@@ -0,0 +1,17 @@
+import base64
+import json
+
+
+def encode_cursor(values):
+    """Encode keyset position values into an opaque, URL-safe cursor."""
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token):
+    """Decode a cursor produced by encode_cursor. Raises ValueError if malformed."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
@@ -0,0 +1,68 @@
+from app.extensions import redis_client
+import json
+
+
+class EntityCache:
+    """
+    One JSON document per row in Redis under ``entity:<kind>:<id>``.
+
+    Reads go through get_many, which fetches every requested id with one
+    MGET and loads only the misses via ``loader``. Misses are stored with
+    SET NX, so a reader that loaded a row before a concurrent write can't
+    overwrite the writer's fresher document. Writers overwrite (set_many)
+    rather than evict wherever they hold the full row, which closes the
+    same race for evictions.
+    """
+
+    def __init__(self, redis, ttl=604800, enabled=True):
+        self.redis = redis
+        self.ttl = ttl
+        self.enabled = enabled
+
+    def init_app(self, app):
+        self.ttl = app.config["ENTITY_CACHE_TTL"]
+        self.enabled = app.config["ENTITY_CACHE_ENABLED"]
+
+    @staticmethod
+    def key(kind, entity_id):
+        return f"entity:{kind}:{entity_id}"
+
+    def get_many(self, kind, ids, loader):
+        """
+        {id: document} for the ids that exist. ``loader(missing_ids)``
+        returns {id: document} for the rows not in the cache.
+        """
+        ids = list(dict.fromkeys(entity_id for entity_id in ids if entity_id is not None))
+        if not ids:
+            return {}
+        found, missing = {}, []
+        for entity_id, raw in zip(ids, self.redis.mget([self.key(kind, i) for i in ids])):
+            if raw is None:
+                missing.append(entity_id)
+            else:
+                found[entity_id] = json.loads(raw)
+        if missing:
+            loaded = loader(missing)
+            self._store(kind, loaded, nx=True)
+            found.update(loaded)
+        return found
+
+    def set_many(self, kind, documents):
+        """Write-through: replace the cached documents {id: document}."""
+        self._store(kind, documents, nx=False)
+
+    def evict(self, kind, ids):
+        keys = [self.key(kind, entity_id) for entity_id in ids]
+        if keys:
+            self.redis.delete(*keys)
+
+    def _store(self, kind, documents, nx):
+        if not documents:
+            return
+        pipe = self.redis.pipeline(transaction=False)
+        for entity_id, document in documents.items():
+            pipe.set(self.key(kind, entity_id), json.dumps(document), ex=self.ttl, nx=nx)
+        pipe.execute()
+
+
+entity_cache = EntityCache(redis_client)
@@ -0,0 +1,191 @@
+from app.extensions import redis_client, redis_listener_client
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def _stream_id(entry_id):
+    if isinstance(entry_id, bytes):
+        entry_id = entry_id.decode()
+    ms, _, seq = entry_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+def format_sse(event_id, event_type, data):
+    return f"id: {event_id}\nevent: {event_type}\ndata: {data}\n\n".encode("utf-8")
+
+
+class _Subscriber:
+    def __init__(self, maxsize):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+
+class EventHub:
+    """
+    Task change feed: every event is appended to a capped Redis stream (for
+    Last-Event-ID replay) and published on a pub/sub channel.
+
+    Each process holds one subscription and fans messages out to its
+    connected SSE clients through bounded in-memory queues, so Redis sees
+    one connection per worker, not one per client. A client that falls
+    behind is disconnected and catches up from the stream when it
+    reconnects with Last-Event-ID.
+    """
+
+    def __init__(self, redis, stream="events:tasks", channel="events:tasks:live", maxlen=10000, queue_size=256, listener_redis=None):
+        self.redis = redis
+        self.listener_redis = listener_redis or redis
+        self.stream = stream
+        self.channel = channel
+        self.maxlen = maxlen
+        self.queue_size = queue_size
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._listener_pid = None
+
+    def init_app(self, app):
+        self.stream = app.config["TASK_EVENTS_STREAM"]
+        self.channel = app.config["TASK_EVENTS_CHANNEL"]
+        self.maxlen = app.config["TASK_EVENTS_MAXLEN"]
+        self.queue_size = app.config["SSE_CLIENT_QUEUE_SIZE"]
+
+    def publish(self, event_type, data):
+        payload = json.dumps(data, default=str)
+        event_id = self.redis.xadd(
+            self.stream,
+            {"type": event_type, "data": payload},
+            maxlen=self.maxlen,
+            approximate=True,
+        ).decode()
+        self.redis.publish(self.channel, json.dumps({"id": event_id, "type": event_type, "data": payload}))
+        return event_id
+
+    def replay(self, last_id):
+        """
+        Events after ``last_id`` as (id, type, data) tuples, or None when
+        the stream has been trimmed past ``last_id`` and the client must
+        refetch its state.
+        """
+        try:
+            info = self.redis.xinfo_stream(self.stream)
+        except Exception:  # stream does not exist yet
+            return []
+        first = info.get("first-entry")
+        trimmed = info.get("entries-added", 0) > info["length"] if "entries-added" in info \
+            else info["length"] >= self.maxlen
+        if first and trimmed and _stream_id(last_id) < _stream_id(first[0]):
+            return None
+        return [
+            (entry_id.decode(), fields[b"type"].decode(), fields[b"data"].decode())
+            for entry_id, fields in self.redis.xrange(self.stream, min=f"({last_id}")
+        ]
+
+    def last_id(self):
+        latest = self.redis.xrevrange(self.stream, count=1)
+        return latest[0][0].decode() if latest else "0-0"
+
+    def subscribe(self):
+        self._ensure_listener()
+        subscriber = _Subscriber(self.queue_size)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def client_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def _dispatch(self, message):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.queue.put_nowait(message)
+            except queue.Full:
+                subscriber.overflowed = True
+                self.unsubscribe(subscriber)
+
+    def _ensure_listener(self):
+        # One listener per process; see TwoTierCache._ensure_listener
+        pid = os.getpid()
+        if self._listener_pid == pid:
+            return
+        with self._lock:
+            if self._listener_pid == pid:
+                return
+            self._listener_pid = pid
+            self._subscribers.clear()
+        threading.Thread(target=self._listen, name="task-events", daemon=True).start()
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self.listener_redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    self._dispatch(json.loads(message["data"]))
+            except Exception:
+                logger.exception("Task event listener failed; reconnecting")
+                time.sleep(1)
+
+    def stream_events(self, last_id=None, heartbeat=15):
+        """
+        Generator of SSE frames: replay after ``last_id``, then live events,
+        with a comment line every ``heartbeat`` seconds to keep proxies from
+        closing an idle connection.
+        """
+        # Subscribe before replaying so nothing published in between is lost;
+        # ids already sent during the replay are skipped below.
+        subscriber = self.subscribe()
+        try:
+            yield b"retry: 3000\n\n"
+            sent = _stream_id(last_id) if last_id else (0, 0)
+            if last_id:
+                missed = self.replay(last_id)
+                if missed is None:
+                    # Too far behind: refetch state, then resume from the tail
+                    yield format_sse(self.last_id(), "reset", "{}")
+                    return
+                for event_id, event_type, data in missed:
+                    yield format_sse(event_id, event_type, data)
+                    sent = _stream_id(event_id)
+
+            while True:
+                if subscriber.overflowed and subscriber.queue.empty():
+                    # Dropped for falling behind; reconnecting resumes from here
+                    yield b"event: overflow\ndata: {}\n\n"
+                    return
+                try:
+                    message = subscriber.queue.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield b": heartbeat\n\n"
+                    continue
+                if _stream_id(message["id"]) <= sent:
+                    continue
+                yield format_sse(message["id"], message["type"], message["data"])
+                sent = _stream_id(message["id"])
+        finally:
+            self.unsubscribe(subscriber)
+
+
+task_events = EventHub(redis_client, listener_redis=redis_listener_client)
+
+
+def publish_task_event(event_type, task):
+    task_events.publish(event_type, {
+        "id": task.id,
+        "task_name": task.task_name,
+        "status": task.status,
+        "priority": task.priority,
+        "user_id": task.user_id,
+    })
@@ -0,0 +1,77 @@
+class FieldSet:
+    """
+    A parsed ``?fields=`` selection over a response schema.
+
+    ``schema`` maps each top-level field, in output order, to None or to
+    the tuple of sub-fields of a nested object, e.g.
+    ``{"id": None, "task": ("task_name", "description")}``. ``task`` selects
+    the whole nested object and ``task.task_name`` a single sub-field.
+    Selections can only narrow the schema, never widen it.
+    """
+
+    def __init__(self, schema, selected=None):
+        self.schema = schema
+        self.selected = dict(schema) if selected is None else selected
+
+    @classmethod
+    def parse(cls, raw, schema):
+        """
+        FieldSet for a ``fields`` query value; raises ValueError on unknown
+        names or when nothing is selected (``fields=,``), which would
+        otherwise share the full representation's cache entry.
+
+        >>> FieldSet.parse("task.task_name", {"id": None, "task": ("task_name", "description")}).key
+        'task.task_name'
+        >>> FieldSet.parse(",", {"id": None})
+        Traceback (most recent call last):
+        ValueError: No fields selected
+        """
+        if not raw or not raw.strip():
+            return cls(schema)
+
+        requested = {}
+        for part in raw.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            name, dot, sub = part.partition(".")
+            if name not in schema or (dot and sub not in (schema[name] or ())):
+                raise ValueError(f"Unknown field: {part}")
+            if sub:
+                requested.setdefault(name, set()).add(sub)
+            else:
+                requested[name] = set(schema[name] or ())
+        if not requested:
+            raise ValueError("No fields selected")
+
+        return cls(schema, {
+            name: None if subfields is None else tuple(s for s in subfields if s in requested[name])
+            for name, subfields in schema.items()
+            if name in requested
+        })
+
+    def __contains__(self, name):
+        return name in self.selected
+
+    def __iter__(self):
+        return iter(self.selected)
+
+    def sub(self, name):
+        return self.selected.get(name) or ()
+
+    @property
+    def is_full(self):
+        return self.selected == self.schema
+
+    @property
+    def key(self):
+        """Canonical cache-key part; empty for the full representation only."""
+        if self.is_full:
+            return ""
+        if not self.selected:
+            return "-"
+        return ",".join(
+            name if subfields is None or subfields == self.schema[name]
+            else ",".join(f"{name}.{s}" for s in subfields)
+            for name, subfields in self.selected.items()
+        )
@@ -0,0 +1,158 @@
+from functools import wraps
+from flask import request, jsonify, current_app, make_response
+from app.extensions import redis_client
+import hashlib
+import json
+import threading
+import time
+import uuid
+
+HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+_REPLAYED_HEADERS = ("Content-Type", "Location", "Retry-After")
+_CHUNK_SIZE = 64 * 1024
+
+# Extend, release or complete the in-progress claim only while it is still
+# ours: a request that outlived its claim must not touch a newer one
+_EXTEND_CLAIM = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_CLAIM = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+_COMPLETE_CLAIM = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+    return 1
+end
+return 0
+"""
+_extend_claim = redis_client.register_script(_EXTEND_CLAIM)
+_release_claim = redis_client.register_script(_RELEASE_CLAIM)
+_complete_claim = redis_client.register_script(_COMPLETE_CLAIM)
+
+
+def _redis_key(key):
+    # Scoped per endpoint and caller: the same key from another user, or
+    # for another endpoint, is a different request
+    user = getattr(request, "user", None) or {}
+    return f"idempotency:{request.path}:{user.get('user_id', '-')}:{key}"
+
+
+def _fingerprint():
+    digest = hashlib.sha256(f"{request.method} {request.full_path}".encode("utf-8"))
+    if request.files:
+        # Multipart boundaries differ between retries; hash the parts instead
+        for name, value in sorted(request.form.items(multi=True)):
+            digest.update(f"{name}={value}".encode("utf-8"))
+        for name, file in sorted(request.files.items(multi=True), key=lambda item: item[0]):
+            digest.update(f"{name}:{file.filename}".encode("utf-8"))
+            for chunk in iter(lambda: file.stream.read(_CHUNK_SIZE), b""):
+                digest.update(chunk)
+            file.stream.seek(0)
+    else:
+        digest.update(request.get_data())
+    return digest.hexdigest()
+
+
+def _replay(record):
+    response = make_response(record["body"], record["status"])
+    for name, value in record["headers"].items():
+        response.headers[name] = value
+    response.headers[REPLAYED_HEADER] = "true"
+    return response
+
+
+def _keep_claim(redis_key, pending, lock_timeout, stop):
+    # Renew the claim every third of its lifetime until the view returns, so
+    # a long import doesn't lose it and let a retry run alongside
+    while not stop.wait(lock_timeout / 3):
+        try:
+            if not _extend_claim(keys=[redis_key], args=[pending, lock_timeout]):
+                return
+        except Exception:
+            pass  # Redis hiccup: try again next round; the claim expires if it lasts
+
+
+def idempotent():
+    """
+    Honour an ``Idempotency-Key`` header on a POST view.
+
+    The first request with a key claims it in Redis (SET NX) with an
+    in-progress marker, runs the view and stores its response for
+    IDEMPOTENCY_TTL seconds. Repeats with the same key get that response
+    replayed (with ``Idempotent-Replayed: true``) without running the
+    view again. A repeat that arrives while the first is still running
+    waits up to IDEMPOTENCY_WAIT seconds for it, then gets a 409.
+
+    Only responses below 500 are stored. The marker is renewed while the
+    view runs; on a server error, or if the worker dies (the marker then
+    expires after IDEMPOTENCY_LOCK_TIMEOUT seconds), the key is released so
+    a retry runs the view again. Reusing
+    a key for a different payload is a 422. Requests without the header
+    are not affected.
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            key = request.headers.get(HEADER)
+            if key is None:
+                return f(*args, **kwargs)
+            if not key or len(key) > 255:
+                return jsonify({"error": f"{HEADER} must be 1-255 characters"}), 400
+
+            config = current_app.config
+            redis_key = _redis_key(key)
+            fingerprint = _fingerprint()
+            # The token tells this request's claim apart from a later one
+            pending = json.dumps({"state": "pending", "fingerprint": fingerprint, "token": uuid.uuid4().hex})
+            lock_timeout = config["IDEMPOTENCY_LOCK_TIMEOUT"]
+            deadline = time.monotonic() + config["IDEMPOTENCY_WAIT"]
+            delay = 0.05
+
+            while not redis_client.set(redis_key, pending, nx=True, ex=lock_timeout):
+                raw = redis_client.get(redis_key)
+                if raw is None:
+                    continue  # released or expired in between: try to claim it
+                record = json.loads(raw)
+                if record["fingerprint"] != fingerprint:
+                    return jsonify({"error": f"{HEADER} was already used for a different request"}), 422
+                if record["state"] == "done":
+                    return _replay(record)
+                if time.monotonic() >= deadline:
+                    response = jsonify({"error": f"A request with this {HEADER} is still in progress"})
+                    response.headers["Retry-After"] = "1"
+                    return response, 409
+                time.sleep(delay)
+                delay = min(delay * 2, 0.5)
+
+            stop = threading.Event()
+            threading.Thread(
+                target=_keep_claim, args=(redis_key, pending, lock_timeout, stop), name="idempotency-claim", daemon=True
+            ).start()
+            try:
+                response = make_response(f(*args, **kwargs))
+            except Exception:
+                _release_claim(keys=[redis_key], args=[pending])
+                raise
+            finally:
+                stop.set()
+            if response.status_code >= 500 or response.is_streamed:
+                _release_claim(keys=[redis_key], args=[pending])
+                return response
+            _complete_claim(keys=[redis_key], args=[pending, json.dumps({
+                "state": "done",
+                "fingerprint": fingerprint,
+                "status": response.status_code,
+                "headers": {name: response.headers[name] for name in _REPLAYED_HEADERS if name in response.headers},
+                "body": response.get_data(as_text=True),
+            }), config["IDEMPOTENCY_TTL"]])
+            return response
+        return wrapper
+    return decorator
@@ -3,6 +3,7 @@ from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from flask import current_app
 import os
+import uuid
 
 load_dotenv()
 
@@ -16,7 +17,8 @@ def generate_jwt(user_id, username, role, expires_in=None):
         "user_id": user_id,
         "username": username,
         "role": role,
-        "exp": datetime.now() + timedelta(seconds=expires_in)
+        "exp": datetime.now() + timedelta(seconds=expires_in),
+        "jti": uuid.uuid4().hex  # revocation id, see TokenRevocation
     }
     return jwt.encode(payload, SECRET_KEY, algorithm="HS256")
 
@@ -0,0 +1,247 @@
+"""
+Low-lock schema changes for Alembic revisions on large tables.
+
+Plain ``op.create_index`` / ``op.add_column(nullable=False)`` hold a lock
+that blocks writes (or reads and writes) for as long as the table takes
+to scan. On Postgres the helpers here split such changes into steps that
+only take brief locks:
+
+- create_index_concurrently / drop_index_concurrently run outside the
+  migration's transaction with CONCURRENTLY;
+- add_column_with_backfill adds a nullable column, fills it in
+  primary-key batches of their own short transactions (throttled, with
+  progress logged) and only then enforces NOT NULL;
+- set_not_null / add_check_constraint / add_foreign_key add the
+  constraint NOT VALID and VALIDATE it separately, which scans without
+  blocking writes;
+- every DDL statement runs under a short lock_timeout and is retried, so
+  a migration waiting behind a long transaction never queues the app's
+  queries behind itself.
+
+On other dialects (SQLite in development) they fall back to the plain
+Alembic operations. Example revision::
+
+    from app.utils.online_migrations import add_column_with_backfill, create_index_concurrently
+
+    def upgrade():
+        add_column_with_backfill(
+            'task_manager', sa.Column('score', sa.Integer()), '0', not_null=True
+        )
+        create_index_concurrently('ix_task_manager_score', 'task_manager', ['score'])
+"""
+from alembic import op
+import logging
+import os
+import sqlalchemy as sa
+import time
+
+logger = logging.getLogger("alembic.online")
+
+LOCK_TIMEOUT = os.getenv("MIGRATION_LOCK_TIMEOUT", "2s")
+LOCK_RETRIES = int(os.getenv("MIGRATION_LOCK_RETRIES", 10))
+LOCK_RETRY_DELAY = float(os.getenv("MIGRATION_LOCK_RETRY_DELAY", 1.0))  # seconds, doubled per retry up to 30
+BACKFILL_BATCH_SIZE = int(os.getenv("MIGRATION_BACKFILL_BATCH_SIZE", 10000))
+BACKFILL_SLEEP = float(os.getenv("MIGRATION_BACKFILL_SLEEP", 0.05))  # seconds between batches
+PROGRESS_INTERVAL = 10  # seconds between progress lines
+
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+def _is_postgres():
+    return op.get_context().dialect.name == "postgresql"
+
+
+def _offline():
+    return op.get_context().as_sql
+
+
+def _is_lock_timeout(error):
+    orig = getattr(error, "orig", None)
+    code = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+    return code == LOCK_NOT_AVAILABLE
+
+
+def configure_session(connection):
+    """
+    Called by migrations/env.py before running revisions: plain Alembic
+    operations fail after MIGRATION_LOCK_TIMEOUT instead of waiting (and
+    making every later query on the table wait behind them).
+    """
+    if connection.dialect.name != "postgresql":
+        return
+    connection.exec_driver_sql(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+    connection.commit()
+
+
+def run_with_lock_retry(statement, lock_timeout=LOCK_TIMEOUT, retries=LOCK_RETRIES, description=None):
+    """
+    Run ``statement`` (SQL string, SQLAlchemy construct, or a callable
+    taking the connection) in autocommit with ``lock_timeout``, retrying
+    with backoff when the lock isn't granted in time. Returns the
+    callable's result (or the statement's CursorResult).
+
+    In offline (--sql) mode the statement is emitted once between COMMIT
+    and BEGIN, and callables get None for the connection.
+    """
+    description = description or (statement if isinstance(statement, str) else getattr(statement, "__name__", "statement"))
+    with op.get_context().autocommit_block():
+        if _offline():
+            return statement(None) if callable(statement) else op.execute(statement)
+        connection = op.get_bind()
+        delay = LOCK_RETRY_DELAY
+        for attempt in range(1, retries + 2):
+            connection.exec_driver_sql(f"SET lock_timeout = '{lock_timeout}'")
+            try:
+                if callable(statement):
+                    return statement(connection)
+                if isinstance(statement, str):
+                    return connection.exec_driver_sql(statement)
+                return connection.execute(statement)
+            except sa.exc.OperationalError as e:
+                if not _is_lock_timeout(e) or attempt > retries:
+                    raise
+                logger.warning(
+                    "Lock not granted within %s for %s (attempt %s/%s), retrying in %.1fs",
+                    lock_timeout, description, attempt, retries + 1, delay
+                )
+                time.sleep(delay)
+                delay = min(delay * 2, 30)
+            finally:
+                connection.exec_driver_sql(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+
+
+def create_index_concurrently(index_name, table_name, columns, **kw):
+    """op.create_index without blocking writes; safe to re-run after a failed build."""
+    if not _is_postgres():
+        op.create_index(index_name, table_name, columns, **kw)
+        return
+
+    def create(connection):
+        # A failed or cancelled CONCURRENTLY build leaves an INVALID index
+        # behind that IF NOT EXISTS would otherwise keep
+        invalid = connection is not None and connection.execute(sa.text("""
+            SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = :name AND NOT i.indisvalid
+        """), {"name": index_name}).first()
+        if invalid:
+            logger.info("Dropping invalid index %s left by an earlier build", index_name)
+            connection.exec_driver_sql(f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"')
+        started = time.monotonic()
+        op.create_index(index_name, table_name, columns, postgresql_concurrently=True, if_not_exists=True, **kw)
+        logger.info("Built index %s on %s in %.1fs", index_name, table_name, time.monotonic() - started)
+
+    run_with_lock_retry(create, description=f"CREATE INDEX {index_name}")
+
+
+def drop_index_concurrently(index_name, table_name):
+    if not _is_postgres():
+        op.drop_index(index_name, table_name=table_name)
+        return
+    run_with_lock_retry(
+        lambda connection: op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True, if_exists=True),
+        description=f"DROP INDEX {index_name}"
+    )
+
+
+def backfill(table_name, column_name, value_sql, batch_size=BACKFILL_BATCH_SIZE, sleep=BACKFILL_SLEEP, key="id"):
+    """
+    ``UPDATE table SET column = value_sql WHERE column IS NULL`` in
+    batches of ``batch_size`` ``key`` values, each its own transaction,
+    sleeping ``sleep`` seconds between batches. Re-running resumes where
+    a previous run stopped. Returns the number of rows updated.
+    """
+    update = (
+        f'UPDATE "{table_name}" SET "{column_name}" = {value_sql} '
+        f'WHERE "{column_name}" IS NULL'
+    )
+    if _offline() or not _is_postgres():
+        # Offline scripts and SQLite get the single statement
+        op.execute(update)
+        return None
+
+    connection = op.get_bind()
+    low, high = connection.execute(sa.text(f'SELECT min("{key}"), max("{key}") FROM "{table_name}"')).one()
+    if low is None:
+        return 0
+    batch = sa.text(f'{update} AND "{key}" >= :start AND "{key}" < :end')
+    label = f"{table_name}.{column_name}"
+    updated, started = 0, time.monotonic()
+    last_report = started
+    for start in range(low, high + 1, batch_size):
+        result = run_with_lock_retry(
+            lambda conn: conn.execute(batch, {"start": start, "end": start + batch_size}),
+            description=f"backfill {label}"
+        )
+        updated += result.rowcount
+        now = time.monotonic()
+        if now - last_report >= PROGRESS_INTERVAL:
+            done = min((start + batch_size - low) / (high - low + 1), 1)
+            rate = updated / (now - started)
+            logger.info(
+                "Backfill %s: %.0f%% of %s range, %s rows updated, %.0f rows/s, ~%.0fs left",
+                label, done * 100, key, updated, rate, (now - started) * (1 - done) / done
+            )
+            last_report = now
+        if sleep:
+            time.sleep(sleep)
+    logger.info("Backfilled %s rows of %s in %.1fs", updated, label, time.monotonic() - started)
+    return updated
+
+
+def add_check_constraint(constraint_name, table_name, condition):
+    """CHECK added NOT VALID (brief lock) and then validated (scan without blocking writes)."""
+    if not _is_postgres():
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.create_check_constraint(constraint_name, sa.text(condition))
+        return
+    run_with_lock_retry(f'ALTER TABLE "{table_name}" ADD CONSTRAINT "{constraint_name}" CHECK ({condition}) NOT VALID')
+    run_with_lock_retry(f'ALTER TABLE "{table_name}" VALIDATE CONSTRAINT "{constraint_name}"')
+
+
+def add_foreign_key(constraint_name, source_table, referent_table, local_cols, remote_cols, ondelete=None):
+    """Foreign key added NOT VALID and then validated, like add_check_constraint."""
+    if not _is_postgres():
+        with op.batch_alter_table(source_table) as batch_op:
+            batch_op.create_foreign_key(constraint_name, referent_table, local_cols, remote_cols, ondelete=ondelete)
+        return
+    local = ", ".join(f'"{col}"' for col in local_cols)
+    remote = ", ".join(f'"{col}"' for col in remote_cols)
+    on_delete = f" ON DELETE {ondelete}" if ondelete else ""
+    run_with_lock_retry(
+        f'ALTER TABLE "{source_table}" ADD CONSTRAINT "{constraint_name}" '
+        f'FOREIGN KEY ({local}) REFERENCES "{referent_table}" ({remote}){on_delete} NOT VALID'
+    )
+    run_with_lock_retry(f'ALTER TABLE "{source_table}" VALIDATE CONSTRAINT "{constraint_name}"')
+
+
+def set_not_null(table_name, column_name):
+    """
+    SET NOT NULL without the full-table scan under an exclusive lock:
+    a validated CHECK (column IS NOT NULL) lets Postgres (12+) skip it.
+    """
+    if not _is_postgres():
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.alter_column(column_name, nullable=False)
+        return
+    check = f"ck_{table_name}_{column_name}_not_null"
+    add_check_constraint(check, table_name, f'"{column_name}" IS NOT NULL')
+    run_with_lock_retry(f'ALTER TABLE "{table_name}" ALTER COLUMN "{column_name}" SET NOT NULL')
+    run_with_lock_retry(f'ALTER TABLE "{table_name}" DROP CONSTRAINT "{check}"')
+
+
+def add_column_with_backfill(table_name, column, value_sql, not_null=False, **backfill_kw):
+    """
+    Add ``column`` (an sa.Column, added nullable and without a default),
+    backfill it with ``value_sql`` and, with ``not_null``, enforce NOT NULL
+    afterwards. New rows need a value from the application (or a server
+    default added separately) while the backfill runs.
+    """
+    column.nullable = True
+    if _is_postgres():
+        run_with_lock_retry(lambda connection: op.add_column(table_name, column), description=f"ADD COLUMN {column.name}")
+    else:
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.add_column(column)
+    backfill(table_name, column.name, value_sql, **backfill_kw)
+    if not_null:
+        set_not_null(table_name, column.name)
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+from dateutil.rrule import rrulestr
+from functools import lru_cache
+
+SHORTHANDS = {
+    "daily": "FREQ=DAILY",
+    "weekly": "FREQ=WEEKLY",
+    "monthly": "FREQ=MONTHLY",
+    "yearly": "FREQ=YEARLY",
+}
+MAX_RULE_LENGTH = 255  # task_manager.recurrence is String(255)
+
+
+def normalize_rule(value, start):
+    """
+    Stored form of a recurrence rule: ``daily``/``weekly``/``monthly``/
+    ``yearly`` or an RFC 5545 RRULE (``FREQ=WEEKLY;BYDAY=MO,TH``, with or
+    without the ``RRULE:`` prefix), anchored at ``start`` with a DTSTART
+    line so cadences like "every 2 weeks" are counted from the task's start.
+
+    Returns None for an empty value; raises ValueError for an invalid rule
+    or one whose stored form is longer than MAX_RULE_LENGTH.
+    """
+    if value is None or not value.strip():
+        return None
+    value = value.strip()
+    if value.upper().startswith("DTSTART"):
+        rule = value
+    else:
+        body = SHORTHANDS.get(value.lower(), value)
+        if body.upper().startswith("RRULE:"):
+            body = body[len("RRULE:"):]
+        rule = f"DTSTART:{start:%Y%m%d}\nRRULE:{body.upper()}"
+    if len(rule) > MAX_RULE_LENGTH:
+        raise ValueError(f"Recurrence rule is too long ({len(rule)} characters stored, max {MAX_RULE_LENGTH})")
+    try:
+        rrulestr(rule)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid recurrence rule: {e}") from None
+    return rule
+
+
+@lru_cache(maxsize=4096)
+def next_occurrence(rule, after, inclusive=False):
+    """
+    First date the stored ``rule`` falls on after ``after`` (on or after
+    with ``inclusive``), or None once the rule has ended (COUNT/UNTIL).
+    Cached because most tasks share a handful of rules.
+    """
+    if rule is None:
+        return after if inclusive else after + timedelta(days=1)
+    found = rrulestr(rule).after(datetime.combine(after, datetime.min.time()), inc=inclusive)
+    return found.date() if found else None
+
+
+def first_due(rule, start, today=None):
+    """next_due for a task created (or re-scheduled) with ``rule``."""
+    today = today or datetime.utcnow().date()
+    return next_occurrence(rule, max(start or today, today), inclusive=True)
@@ -0,0 +1,166 @@
+from app.extensions import redis_client, redis_listener_client
+import hashlib
+import logging
+import math
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings, sized for ``capacity`` items at
+    ``error_rate`` false positives. The k bit positions are derived from
+    one blake2b digest by double hashing.
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity = max(capacity, 1)
+        self.size = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class TokenRevocation:
+    """
+    Revoked JWT ids (``jti``).
+
+    Redis is the source of truth: ``revoked:<jti>`` lives until the token
+    would have expired anyway, and a sorted set of jtis by expiry lets
+    workers rebuild their view. Each worker process keeps a Bloom filter
+    of the unexpired jtis, so a token that was never revoked is accepted
+    without a Redis call; only filter hits (revoked tokens and false
+    positives) are confirmed with EXISTS.
+
+    The filter is loaded on first use, updated from a pub/sub channel as
+    tokens are revoked by any worker, and rebuilt every
+    ``refresh_interval`` seconds to drop expired jtis and catch up on
+    messages missed while the subscriber was reconnecting.
+
+    The first check in a process needs Redis to load the filter, and a
+    filter hit needs it to confirm; both raise redis' ConnectionError
+    while Redis is down (jwt_required answers 503).
+    """
+
+    def __init__(self, redis, channel="auth:revoked", capacity=100000, error_rate=0.001, refresh_interval=60.0,
+                 listener_redis=None):
+        self.redis = redis
+        self.listener_redis = listener_redis or redis
+        self.channel = channel
+        self.index_key = "revoked:index"
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.refresh_interval = refresh_interval
+        self._filter = None
+        self._lock = threading.Lock()
+        self._listener_pid = None
+        self._counters = {"checks": 0, "filter_hits": 0, "revoked": 0, "false_positives": 0}
+
+    def init_app(self, app):
+        self.channel = app.config["REVOCATION_CHANNEL"]
+        self.capacity = app.config["REVOCATION_BLOOM_CAPACITY"]
+        self.error_rate = app.config["REVOCATION_BLOOM_ERROR_RATE"]
+        self.refresh_interval = app.config["REVOCATION_REFRESH_INTERVAL"]
+
+    @staticmethod
+    def key(jti):
+        return f"revoked:{jti}"
+
+    def revoke(self, jti, exp):
+        """Revoke ``jti`` until ``exp`` (epoch seconds). False if the token has already expired."""
+        ttl = math.ceil(exp - time.time())
+        if ttl <= 0:
+            return False
+        pipe = self.redis.pipeline()
+        pipe.set(self.key(jti), 1, ex=ttl)
+        pipe.zadd(self.index_key, {jti: exp})
+        pipe.zremrangebyscore(self.index_key, "-inf", time.time())
+        pipe.publish(self.channel, jti)
+        pipe.execute()
+        self._ensure_listener()
+        self._filter.add(jti)
+        return True
+
+    def is_revoked(self, jti):
+        if not jti:
+            return False  # issued before tokens carried a jti
+        self._ensure_listener()
+        with self._lock:
+            self._counters["checks"] += 1
+        if jti not in self._filter:
+            return False
+        revoked = bool(self.redis.exists(self.key(jti)))
+        with self._lock:
+            self._counters["filter_hits"] += 1
+            self._counters["revoked" if revoked else "false_positives"] += 1
+        return revoked
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+        bloom = self._filter
+        return {
+            **counters,
+            "filter_hit_ratio": counters["filter_hits"] / counters["checks"] if counters["checks"] else None,
+            "filter_size_bits": bloom.size if bloom else None,
+            "filter_hashes": bloom.hashes if bloom else None,
+            "filter_capacity": bloom.capacity if bloom else None,
+        }
+
+    def _load(self):
+        jtis = self.redis.zrangebyscore(self.index_key, time.time(), "+inf")
+        bloom = BloomFilter(max(self.capacity, 2 * len(jtis)), self.error_rate)
+        for jti in jtis:
+            bloom.add(jti.decode("utf-8"))
+        return bloom
+
+    def _ensure_listener(self):
+        # Per pid like the cache listener: forked workers build their own
+        # filter and thread. The first load is synchronous so no request is
+        # ever checked against an empty filter.
+        pid = os.getpid()
+        if self._listener_pid == pid:
+            return
+        with self._lock:
+            if self._listener_pid == pid:
+                return
+            self._filter = self._load()
+            self._listener_pid = pid
+        threading.Thread(target=self._listen, name="token-revocation", daemon=True).start()
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self.listener_redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                # Revocations may have been missed while (re)connecting
+                self._filter = self._load()
+                next_refresh = time.monotonic() + self.refresh_interval
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message:
+                        self._filter.add(message["data"].decode("utf-8"))
+                    if time.monotonic() >= next_refresh:
+                        self._filter = self._load()
+                        next_refresh = time.monotonic() + self.refresh_interval
+            except Exception:
+                logger.exception("Token revocation listener failed; reconnecting")
+                time.sleep(1)
+
+
+token_revocation = TokenRevocation(redis_client, listener_redis=redis_listener_client)
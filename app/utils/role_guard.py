@@ -1,6 +1,8 @@
 from functools import wraps
 from flask import request, jsonify
 from app.utils.jwt_utils import decode_jwt
+from app.utils.revocation import token_revocation
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
 
 def jwt_required(roles=[]):
     def decorator(f):
@@ -19,6 +21,14 @@ def jwt_required(roles=[]):
             if "error" in decoded:
                 return jsonify(decoded), 401
 
+            try:
+                revoked = token_revocation.is_revoked(decoded.get("jti"))
+            except (RedisConnectionError, RedisTimeoutError):
+                # Fail closed: a revoked token must not get in while Redis is down
+                return jsonify({"error": "Token revocation check unavailable"}), 503
+            if revoked:
+                return jsonify({"error": "Token revoked"}), 401
+
             if roles and decoded.get("role") not in roles:
                 return jsonify({"error": "Forbidden"}), 403
 
@@ -1,12 +1,60 @@
-def serialize_task(task_logger):
-    return {
-        "id": task_logger.id,
-        "task_id": task_logger.task_id,
-        "date_logged": task_logger.date_logged.isoformat(),
-        "status": task_logger.status,
-        "task": {
-            "task_name": task_logger.task.task_name,
-            "description": task_logger.task.description,
-            # Add more fields as needed
-        }
-    }
+from app.utils.fieldsets import FieldSet
+
+# Response schemas for ?fields= (see FieldSet)
+TASK_LOG_FIELDS = {
+    "id": None,
+    "task_id": None,
+    "date_logged": None,
+    "status": None,
+    "task": ("task_name", "description"),
+}
+TASK_LOG_DETAIL_FIELDS = {
+    "log_id": None,
+    "date_logged": None,
+    "status": None,
+    "task": ("id", "task_name", "description", "priority", "created_at", "assigned_user"),
+}
+ACTIVE_TASK_FIELDS = {"id": None, "task_name": None}
+
+
+def _date(value):
+    return value.strftime("%Y-%m-%d") if value else None
+
+
+# Only the selected fields are read, so columns left out of the query are
+# never lazy-loaded.
+_LOG_VALUES = {
+    "id": lambda log: log.id,
+    "log_id": lambda log: log.id,
+    "task_id": lambda log: log.task_id,
+    "date_logged": lambda log: log.date_logged.isoformat(),
+    "status": lambda log: log.status,
+}
+_TASK_VALUES = {
+    "id": lambda task: task.id,
+    "task_name": lambda task: task.task_name,
+    "description": lambda task: task.description,
+    "priority": lambda task: task.priority,
+    "created_at": lambda task: _date(task.created_at),
+    "assigned_user": lambda task: task.user.username if task.user else None,
+}
+
+
+def _serialize_log(task_logger, fields):
+    data = {name: _LOG_VALUES[name](task_logger) for name in fields if name != "task"}
+    if "task" in fields:
+        task = task_logger.task
+        data["task"] = {name: _TASK_VALUES[name](task) for name in fields.sub("task")} if task else None
+    return data
+
+
+def serialize_task(task_logger, fields=None):
+    return _serialize_log(task_logger, fields or FieldSet(TASK_LOG_FIELDS))
+
+
+def serialize_task_log_detail(task_logger, fields=None):
+    return _serialize_log(task_logger, fields or FieldSet(TASK_LOG_DETAIL_FIELDS))
+
+
+def serialize_active_task(task, fields=None):
+    return {name: _TASK_VALUES[name](task) for name in fields or ACTIVE_TASK_FIELDS}
@@ -0,0 +1,113 @@
+from app.extensions import redis_client
+import json
+import statistics
+import time
+
+# kombu's Redis transport keeps a queue's messages in a list named after the
+# queue, plus one list per priority step (0 shares the queue's own list)
+_PRIORITY_SEPARATOR = "\x06\x16"
+_PRIORITY_STEPS = (3, 6, 9)
+
+
+def _percentile(values, fraction):
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+class TaskMetrics:
+    """
+    Celery task durations and queue depths, kept in Redis so the web
+    process can report what the workers saw.
+
+    Workers record each finished task (run time, time spent queued since
+    it was published, failure) into a capped list per task name
+    (``celery:metrics:<task>``, last ``window`` runs) plus running totals;
+    see app.tasks.signals. Queue depth is read straight from the broker's
+    lists.
+    """
+
+    def __init__(self, redis, window=1000):
+        self.redis = redis
+        self.window = window
+        self.names_key = "celery:metrics:tasks"
+
+    def init_app(self, app):
+        self.window = app.config["CELERY_METRICS_WINDOW"]
+
+    @staticmethod
+    def key(task_name):
+        return f"celery:metrics:{task_name}"
+
+    def record(self, task_name, queue, runtime, wait, failed):
+        sample = json.dumps({"queue": queue, "runtime": runtime, "wait": wait, "failed": failed, "at": time.time()})
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.sadd(self.names_key, task_name)
+        pipe.lpush(self.key(task_name), sample)
+        pipe.ltrim(self.key(task_name), 0, self.window - 1)
+        pipe.hincrby(f"{self.key(task_name)}:totals", "failed" if failed else "succeeded", 1)
+        pipe.execute()
+
+    def task_stats(self):
+        names = sorted(name.decode("utf-8") for name in self.redis.smembers(self.names_key))
+        pipe = self.redis.pipeline(transaction=False)
+        for name in names:
+            pipe.lrange(self.key(name), 0, -1)
+            pipe.hgetall(f"{self.key(name)}:totals")
+        results = pipe.execute()
+
+        stats = {}
+        for name, samples, totals in zip(names, results[::2], results[1::2]):
+            samples = [json.loads(sample) for sample in samples]
+            runtimes = sorted(sample["runtime"] for sample in samples)
+            waits = sorted(sample["wait"] for sample in samples if sample["wait"] is not None)
+            stats[name] = {
+                "queue": samples[0]["queue"] if samples else None,
+                "succeeded": int(totals.get(b"succeeded", 0)),
+                "failed": int(totals.get(b"failed", 0)),
+                "window": len(samples),
+                "runtime_p50": statistics.median(runtimes) if runtimes else None,
+                "runtime_p95": _percentile(runtimes, 0.95) if runtimes else None,
+                "runtime_max": runtimes[-1] if runtimes else None,
+                "wait_p50": statistics.median(waits) if waits else None,
+                "wait_p95": _percentile(waits, 0.95) if waits else None,
+                "wait_max": waits[-1] if waits else None,
+                "last_finished_at": samples[0]["at"] if samples else None,
+            }
+        return stats
+
+    def queue_depths(self, queues):
+        """{queue: {"depth", "oldest_seconds"}} for a Redis broker; unacked messages aren't counted."""
+        pipe = self.redis.pipeline(transaction=False)
+        for queue in queues:
+            for key in self._queue_keys(queue):
+                pipe.llen(key)
+                pipe.lindex(key, -1)  # consumers pop from the right: the oldest message
+        results = iter(pipe.execute())
+
+        now = time.time()
+        depths = {}
+        for queue in queues:
+            depth, oldest = 0, None
+            for _ in self._queue_keys(queue):
+                length, message = next(results), next(results)
+                depth += length
+                published = self._published_at(message)
+                if published is not None:
+                    oldest = published if oldest is None else min(oldest, published)
+            depths[queue] = {"depth": depth, "oldest_seconds": round(now - oldest, 3) if oldest else None}
+        return depths
+
+    @staticmethod
+    def _queue_keys(queue):
+        return [queue] + [f"{queue}{_PRIORITY_SEPARATOR}{step}" for step in _PRIORITY_STEPS]
+
+    @staticmethod
+    def _published_at(message):
+        if message is None:
+            return None
+        try:
+            return json.loads(message)["headers"].get("published_at")
+        except (ValueError, KeyError, AttributeError):
+            return None
+
+
+task_metrics = TaskMetrics(redis_client)
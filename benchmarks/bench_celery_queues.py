@@ -0,0 +1,179 @@
+"""
+Benchmark: how late scheduled jobs start while a backlog of bulk jobs is
+queued, with every task on one shared queue vs. the dedicated scheduled
+and bulk queues of celery_worker.py.
+
+Each mode queues --bulk-jobs jobs that sleep --bulk-seconds, then publishes
+one scheduled job every --interval seconds for --duration seconds (as Beat
+would) and records how long after publishing each one started. Workers
+are real `celery worker` subprocesses (thread pool):
+
+- shared: one worker on one queue, with as many slots as the dedicated
+  workers have together and Celery's default prefetch;
+- dedicated: one worker per queue with its WORKER_PROFILES settings.
+
+The broker is an in-process fakeredis server unless --redis-url is given
+(use a database you can flush: the benchmark empties it between modes).
+
+Usage:
+    python benchmarks/bench_celery_queues.py --bulk-jobs 40 --bulk-seconds 2 --duration 20
+    python benchmarks/bench_celery_queues.py --redis-url redis://localhost:6379/15
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from celery import Celery
+from dotenv import load_dotenv
+import redis
+
+load_dotenv()
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+LAGS_KEY = "bench:celery:lags"
+
+bench_app = Celery("bench_celery_queues")
+
+
+@bench_app.task(name="bench.bulk_job")
+def bulk_job(seconds):
+    time.sleep(seconds)
+
+
+@bench_app.task(name="bench.scheduled_job")
+def scheduled_job(published_at):
+    redis.Redis.from_url(bench_app.conf.broker_url).rpush(LAGS_KEY, time.time() - published_at)
+
+
+def configure(broker_url, dedicated):
+    bench_app.conf.update(
+        broker_url=broker_url,
+        task_ignore_result=True,
+        task_default_queue="shared",
+        task_routes={"bench.bulk_job": {"queue": "bulk"}, "bench.scheduled_job": {"queue": "scheduled"}} if dedicated else {},
+        broker_connection_retry_on_startup=True,
+    )
+
+
+def run_worker(args):
+    configure(args.broker, dedicated=args.queue != "shared")
+    bench_app.conf.update(worker_prefetch_multiplier=args.prefetch, task_acks_late=args.acks_late)
+    bench_app.worker_main([
+        "--quiet", "worker", "-Q", args.queue, "-n", f"{args.queue}@bench", "-c", str(args.concurrency),
+        "--pool", "threads", "--loglevel", "warning", "--without-mingle", "--without-gossip", "--without-heartbeat",
+    ])
+
+
+def start_worker(broker_url, queue, concurrency, prefetch, acks_late):
+    command = [
+        sys.executable, os.path.abspath(__file__), "--worker", "--broker", broker_url, "--queue", queue,
+        "--concurrency", str(concurrency), "--prefetch", str(prefetch),
+    ]
+    return subprocess.Popen(command + (["--acks-late"] if acks_late else []))
+
+
+def run_mode(mode, args, broker_url):
+    from celery_worker import WORKER_PROFILES
+
+    client = redis.Redis.from_url(broker_url)
+    client.flushdb()
+    configure(broker_url, dedicated=mode == "dedicated")
+
+    if mode == "dedicated":
+        workers = [
+            start_worker(broker_url, queue, WORKER_PROFILES[queue]["concurrency"],
+                         WORKER_PROFILES[queue]["prefetch_multiplier"], WORKER_PROFILES[queue]["acks_late"])
+            for queue in ("scheduled", "bulk")
+        ]
+    else:
+        slots = WORKER_PROFILES["scheduled"]["concurrency"] + WORKER_PROFILES["bulk"]["concurrency"]
+        workers = [start_worker(broker_url, "shared", slots, 4, False)]
+
+    try:
+        # Don't count worker start-up: wait until a first scheduled job has run
+        scheduled_job.delay(time.time())
+        ready = time.time() + 30
+        while not client.llen(LAGS_KEY) and time.time() < ready:
+            time.sleep(0.1)
+        client.delete(LAGS_KEY)
+
+        for _ in range(args.bulk_jobs):
+            bulk_job.delay(args.bulk_seconds)
+        published = 0
+        deadline = time.time() + args.duration
+        while time.time() < deadline:
+            scheduled_job.delay(time.time())
+            published += 1
+            time.sleep(args.interval)
+
+        # Wait for the scheduled jobs to run (in shared mode, behind the backlog)
+        give_up = time.time() + args.bulk_jobs * args.bulk_seconds + 30
+        while client.llen(LAGS_KEY) < published and time.time() < give_up:
+            time.sleep(0.2)
+        lags = sorted(float(lag) for lag in client.lrange(LAGS_KEY, 0, -1))
+    finally:
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.wait()
+
+    if not lags:
+        return {"mode": mode, "published": published, "started": 0}
+    return {
+        "mode": mode,
+        "published": published,
+        "started": len(lags),
+        "p50": statistics.median(lags),
+        "p95": lags[min(int(len(lags) * 0.95), len(lags) - 1)],
+        "max": lags[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redis-url", help="Redis to use as the broker (default: an in-process fakeredis server)")
+    parser.add_argument("--bulk-jobs", type=int, default=40)
+    parser.add_argument("--bulk-seconds", type=float, default=2.0)
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between scheduled jobs")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds to publish scheduled jobs for")
+    parser.add_argument("--modes", default="shared,dedicated")
+    # Internal: run one worker process
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--broker", help=argparse.SUPPRESS)
+    parser.add_argument("--queue", help=argparse.SUPPRESS)
+    parser.add_argument("--concurrency", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--prefetch", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--acks-late", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+        return
+
+    broker_url = args.redis_url
+    if broker_url is None:
+        from fakeredis import TcpFakeServer
+
+        server = TcpFakeServer(("127.0.0.1", 0), server_type="redis")
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        broker_url = f"redis://127.0.0.1:{server.server_address[1]}/0"
+
+    print(f"{args.bulk_jobs} bulk jobs x {args.bulk_seconds}s queued, then 1 scheduled job every {args.interval}s for {args.duration}s")
+    print(f"{'mode':<11}{'published':>10}{'started':>9}{'lag p50':>9}{'lag p95':>9}{'lag max':>9}")
+    for mode in args.modes.split(","):
+        result = run_mode(mode, args, broker_url)
+        if not result["started"]:
+            print(f"{mode:<11}{result['published']:>10}{0:>9}        -        -        -")
+            continue
+        print(f"{mode:<11}{result['published']:>10}{result['started']:>9}"
+              f"{result['p50']:>8.2f}s{result['p95']:>8.2f}s{result['max']:>8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 from celery import Celery
 from celery.schedules import crontab
+from kombu import Queue
 import os
 from dotenv import load_dotenv
 
@@ -13,6 +14,52 @@ celery_app = Celery(
 
 celery_app.autodiscover_tasks(['app.tasks'])
 
+# Queues: short periodic jobs that must start on time, long bulk jobs, and
+# small jobs triggered by requests. Each queue gets its own workers
+# (celery worker -Q <queue>, see docker-compose.yml), so a long import or
+# report can't hold up the midnight snapshot.
+QUEUES = ("scheduled", "bulk", "interactive")
+
+TASK_ROUTES = {
+    'app.tasks.log_task.log_tasks_daily': {'queue': 'scheduled'},
+    'app.tasks.tasklogger_tasks.flush_task_log_stream': {'queue': 'scheduled'},
+    'app.tasks.summary_tasks.reconcile_summary_counters': {'queue': 'scheduled'},
+    'app.tasks.archive_tasks.archive_old_task_logs': {'queue': 'bulk'},
+    'app.tasks.report_tasks.build_weekly_user_reports': {'queue': 'bulk'},
+    'app.tasks.tasklogger_tasks.log_active_tasks_to_logger': {'queue': 'bulk'},
+    'app.tasks.cache_tasks.warm_caches': {'queue': 'interactive'},
+}
+
+# Worker settings per queue, picked with CELERY_WORKER_PROFILE:
+# - scheduled: few slots, no prefetch, acked after running (the jobs are
+#   safe to repeat) so a job lost with its worker runs again
+# - bulk: one job reserved per slot so queued work stays with idle
+#   workers, acked late for the same reason
+# - interactive: more slots and prefetch for many short jobs, acked early
+WORKER_PROFILES = {
+    "scheduled": {"concurrency": 2, "prefetch_multiplier": 1, "acks_late": True},
+    "bulk": {"concurrency": 2, "prefetch_multiplier": 1, "acks_late": True},
+    "interactive": {"concurrency": 8, "prefetch_multiplier": 4, "acks_late": False},
+}
+worker_profile = WORKER_PROFILES.get(os.getenv("CELERY_WORKER_PROFILE"), {})
+
+celery_app.conf.update(
+    task_queues=[Queue(name) for name in QUEUES],
+    task_default_queue="interactive",
+    task_routes=TASK_ROUTES,
+    # Nothing reads task results: don't write them to Redis. A task that
+    # needs its result stored opts in with @celery_app.task(ignore_result=False).
+    task_ignore_result=True,
+    result_expires=3600,
+    worker_concurrency=int(os.getenv("CELERY_CONCURRENCY", worker_profile.get("concurrency", os.cpu_count() or 1))),
+    worker_prefetch_multiplier=worker_profile.get("prefetch_multiplier", 4),
+    task_acks_late=worker_profile.get("acks_late", False),
+    task_reject_on_worker_lost=worker_profile.get("acks_late", False),
+    # Unacked (acks_late) jobs are redelivered after this long, so it must
+    # exceed the longest bulk job
+    broker_transport_options={"visibility_timeout": int(os.getenv("CELERY_VISIBILITY_TIMEOUT", 21600))},
+)
+
 # Celery Beat configuration for periodic tasks
 # This task will run daily at midnight UTC
 celery_app.conf.beat_schedule = {
@@ -20,6 +67,26 @@ celery_app.conf.beat_schedule = {
         'task': 'app.tasks.log_task.log_tasks_daily',
         'schedule': crontab(hour=0, minute=0),
     },
+    # Move task_logger rows past the retention horizon to cold storage
+    'archive-task-logs': {
+        'task': 'app.tasks.archive_tasks.archive_old_task_logs',
+        'schedule': crontab(hour=2, minute=30),
+    },
+    # Per-user activity report for the previous week, Mondays 03:00 UTC
+    'weekly-user-reports': {
+        'task': 'app.tasks.report_tasks.build_weekly_user_reports',
+        'schedule': crontab(hour=3, minute=0, day_of_week='mon'),
+    },
+    # Correct drift of the live /summary counters against the database
+    'reconcile-summary-counters': {
+        'task': 'app.tasks.summary_tasks.reconcile_summary_counters',
+        'schedule': float(os.getenv("SUMMARY_RECONCILE_INTERVAL", 3600)),
+    },
+    # Drain write-behind status changes into task_logger (TASK_LOG_WRITE_BEHIND)
+    'flush-task-log-stream': {
+        'task': 'app.tasks.tasklogger_tasks.flush_task_log_stream',
+        'schedule': float(os.getenv("TASK_LOG_FLUSH_INTERVAL", 5)),
+    },
 }
 
 celery_app.conf.timezone = 'UTC'
@@ -0,0 +1,85 @@
+"""
+Production gunicorn profile.
+
+    gunicorn -c gunicorn.conf.py main:app
+
+GUNICORN_WORKER_CLASS selects the profile:
+
+- ``gthread`` (default): WEB_CONCURRENCY processes x GUNICORN_THREADS threads.
+- ``gevent``: WEB_CONCURRENCY processes x GUNICORN_WORKER_CONNECTIONS greenlets.
+  Needs gevent and psycogreen installed.
+- ``sync``: the old one-request-per-process behaviour, for comparison.
+
+The app is preloaded in the master and forked, so DB and Redis pools are
+sized per process from the worker's concurrency and the inherited
+engine is disposed in every child. Set DB_PGBOUNCER=true when DATABASE_URL
+points at PgBouncer in transaction mode.
+"""
+import multiprocessing
+import os
+
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+if worker_class == "gevent":
+    # Patch before the preloaded app imports socket/threading/redis
+    from gevent import monkey
+    monkey.patch_all()
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv("GUNICORN_THREADS", 4)) if worker_class == "gthread" else 1
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", 100))
+preload_app = True
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 10000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 1000))
+accesslog = os.getenv("GUNICORN_ACCESSLOG", "-")
+
+# Requests one worker process can have in flight at once
+if worker_class == "gevent":
+    concurrency = worker_connections
+else:
+    concurrency = threads
+
+# Greenlets outnumber what Postgres should see, so cap the DB pool; extra
+# greenlets wait up to DB_POOL_TIMEOUT for a connection.
+db_pool_size = min(concurrency, int(os.getenv("GUNICORN_DB_POOL_CAP", 20)))
+pgbouncer = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+
+# Sized before the app is preloaded, which is when Config reads them.
+# Explicit environment values win.
+os.environ.setdefault("DB_POOL_SIZE", str(1 if pgbouncer else db_pool_size))
+os.environ.setdefault("DB_MAX_OVERFLOW", str(db_pool_size - 1 if pgbouncer else 0))
+# One connection per in-flight request. The pub/sub listeners (cache
+# invalidation, task events, token revocation) each hold a connection from
+# a separate pool (redis_listener_client), so they can't starve request
+# threads.
+os.environ.setdefault("REDIS_MAX_CONNECTIONS", str(concurrency))
+REDIS_LISTENERS = 3  # listener connections per worker, for the log line below
+
+
+def when_ready(server):
+    per_worker = int(os.environ["DB_POOL_SIZE"]) + int(os.environ["DB_MAX_OVERFLOW"])
+    server.log.info(
+        "profile=%s workers=%s concurrency/worker=%s db connections<=%s redis connections<=%s",
+        worker_class, workers, concurrency,
+        workers * per_worker, workers * (int(os.environ["REDIS_MAX_CONNECTIONS"]) + REDIS_LISTENERS),
+    )
+
+
+def post_fork(server, worker):
+    if worker_class == "gevent":
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+
+    from app.extensions import db, redis_client, redis_listener_client
+
+    # Sockets opened in the master (create_app's connection check) must not
+    # be shared with the children: drop them without closing them for the
+    # parent, and let each worker open its own.
+    app = worker.app.wsgi()
+    with app.app_context():
+        db.engine.dispose(close=False)
+    redis_client.connection_pool.reset()
+    redis_listener_client.connection_pool.reset()
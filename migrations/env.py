@@ -42,6 +42,7 @@ target_db = current_app.extensions['migrate'].db
 from app.models.task_manager import TaskManager
 from app.models.task_logger import TaskLogger
 from app.models.user import User
+from app.utils.online_migrations import configure_session
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -98,9 +99,15 @@ def run_migrations_online():
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
 
+    # One transaction per revision, so a revision that leaves it for
+    # concurrent index builds or batched backfills (app.utils.online_migrations)
+    # only commits its own earlier steps
+    conf_args.setdefault("transaction_per_migration", True)
+
     connectable = get_engine()
 
     with connectable.connect() as connection:
+        configure_session(connection)
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
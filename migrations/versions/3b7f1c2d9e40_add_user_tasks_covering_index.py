@@ -0,0 +1,31 @@
+"""add covering index for per-user task listing
+
+Revision ID: 3b7f1c2d9e40
+Revises: dfa418a8c6b2
+Create Date: 2026-10-19 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7f1c2d9e40'
+down_revision = 'dfa418a8c6b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('task_manager', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_task_manager_user_status_priority_id',
+            ['user_id', 'status', 'priority', 'id'],
+            unique=False,
+            postgresql_include=['task_name', 'created_at']
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('task_manager', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_manager_user_status_priority_id')
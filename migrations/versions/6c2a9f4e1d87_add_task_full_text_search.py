@@ -0,0 +1,77 @@
+"""add full-text search over task_name and description
+
+Revision ID: 6c2a9f4e1d87
+Revises: 3b7f1c2d9e40
+Create Date: 2026-10-19 10:03:27.551920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6c2a9f4e1d87'
+down_revision = '3b7f1c2d9e40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.execute("""
+            ALTER TABLE task_manager ADD COLUMN search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(task_name, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(description, '')), 'B')
+            ) STORED
+        """)
+        op.create_index(
+            'ix_task_manager_search_vector',
+            'task_manager',
+            ['search_vector'],
+            postgresql_using='gin'
+        )
+
+    elif dialect == 'sqlite':
+        op.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS task_manager_fts USING fts5(
+                task_name, description, content='task_manager', content_rowid='id'
+            )
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS task_manager_fts_ai AFTER INSERT ON task_manager BEGIN
+                INSERT INTO task_manager_fts(rowid, task_name, description)
+                VALUES (new.id, new.task_name, new.description);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS task_manager_fts_ad AFTER DELETE ON task_manager BEGIN
+                INSERT INTO task_manager_fts(task_manager_fts, rowid, task_name, description)
+                VALUES ('delete', old.id, old.task_name, old.description);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS task_manager_fts_au AFTER UPDATE ON task_manager BEGIN
+                INSERT INTO task_manager_fts(task_manager_fts, rowid, task_name, description)
+                VALUES ('delete', old.id, old.task_name, old.description);
+                INSERT INTO task_manager_fts(rowid, task_name, description)
+                VALUES (new.id, new.task_name, new.description);
+            END
+        """)
+        op.execute("INSERT INTO task_manager_fts(task_manager_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.drop_index('ix_task_manager_search_vector', table_name='task_manager')
+        op.drop_column('task_manager', 'search_vector')
+
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS task_manager_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS task_manager_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS task_manager_fts_ai")
+        op.execute("DROP TABLE IF EXISTS task_manager_fts")
@@ -0,0 +1,26 @@
+"""add (task_id, date_logged) index for per-task history
+
+Revision ID: 8e41d0b7a2c5
+Revises: 6c2a9f4e1d87
+Create Date: 2026-10-19 11:26:05.904117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e41d0b7a2c5'
+down_revision = '6c2a9f4e1d87'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('task_logger', schema=None) as batch_op:
+        batch_op.create_index('ix_task_logger_task_id_date_logged', ['task_id', 'date_logged'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('task_logger', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_logger_task_id_date_logged')
@@ -0,0 +1,36 @@
+"""add task_log_bitmap compact storage table
+
+Revision ID: b4d7e9a13f62
+Revises: 8e41d0b7a2c5
+Create Date: 2026-10-19 13:40:51.276930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4d7e9a13f62'
+down_revision = '8e41d0b7a2c5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('task_log_bitmap',
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('present', sa.Integer(), nullable=False),
+    sa.Column('status', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['task_id'], ['task_manager.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('task_id', 'month')
+    )
+    with op.batch_alter_table('task_log_bitmap', schema=None) as batch_op:
+        batch_op.create_index('ix_task_log_bitmap_month', ['month'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('task_log_bitmap', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_log_bitmap_month')
+
+    op.drop_table('task_log_bitmap')
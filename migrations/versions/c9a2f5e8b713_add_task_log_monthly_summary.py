@@ -0,0 +1,31 @@
+"""add task_log_monthly_summary rollup table
+
+Revision ID: c9a2f5e8b713
+Revises: b4d7e9a13f62
+Create Date: 2026-10-19 15:02:13.730448
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9a2f5e8b713'
+down_revision = 'b4d7e9a13f62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('task_log_monthly_summary',
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('days_logged', sa.Integer(), nullable=False),
+    sa.Column('days_active', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['task_id'], ['task_manager.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('task_id', 'month')
+    )
+
+
+def downgrade():
+    op.drop_table('task_log_monthly_summary')
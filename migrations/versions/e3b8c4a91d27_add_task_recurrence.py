@@ -0,0 +1,38 @@
+"""add recurrence rule and next_due to task_manager
+
+Revision ID: e3b8c4a91d27
+Revises: c9a2f5e8b713
+Create Date: 2026-10-19 17:41:22.518093
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.utils.online_migrations import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3b8c4a91d27'
+down_revision = 'c9a2f5e8b713'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing tasks have no rule: they are due every day, starting today.
+    # The server default fills them without rewriting the table (a stable
+    # default is metadata-only on Postgres 11+) and covers non-ORM inserts.
+    # SQLite can't ADD COLUMN with a CURRENT_DATE default, so it copies the
+    # table instead.
+    recreate = "always" if op.get_context().dialect.name == "sqlite" else "auto"
+    with op.batch_alter_table('task_manager', schema=None, recreate=recreate) as batch_op:
+        batch_op.add_column(sa.Column('recurrence', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('next_due', sa.Date(), server_default=sa.text('CURRENT_DATE'), nullable=True))
+
+    create_index_concurrently('ix_task_manager_status_next_due', 'task_manager', ['status', 'next_due'])
+
+
+def downgrade():
+    drop_index_concurrently('ix_task_manager_status_next_due', 'task_manager')
+    with op.batch_alter_table('task_manager', schema=None) as batch_op:
+        batch_op.drop_column('next_due')
+        batch_op.drop_column('recurrence')
@@ -0,0 +1,25 @@
+"""add (user_id, created_at) index for import duplicate checks
+
+Revision ID: f4c1d8e2a6b9
+Revises: e3b8c4a91d27
+Create Date: 2026-10-19 18:02:11.407385
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.utils.online_migrations import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4c1d8e2a6b9'
+down_revision = 'e3b8c4a91d27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    create_index_concurrently('ix_task_manager_user_created_at', 'task_manager', ['user_id', 'created_at'])
+
+
+def downgrade():
+    drop_index_concurrently('ix_task_manager_user_created_at', 'task_manager')